@@ -48,7 +48,7 @@ async def scrape_opened_page_with_pagination():
             url=page.url,
             container_selector=".next-table-body tr.next-table-row",
             next_button_selector=".next-btn.next-pagination-item.next-next",  # 下一页按钮
-            delay=3.0,  # 每页等待3秒
+            delay=3.0,  # 数据项出现即开始抓取，最多等待3秒
             max_pages=2,  # 抓取2页
             fields={
                 "标题": ".yunxiao-projex-workitem-title",
@@ -66,7 +66,7 @@ async def scrape_opened_page_with_pagination():
                 url=page.url,
                 container_selector=".next-table-body tr.next-table-row",
                 next_button_selector=".next-btn.next-pagination-item.next-next",  # 下一页按钮
-                delay=4.0,  # 每页等待3秒
+                delay=4.0,  # 数据项出现即开始抓取，最多等待4秒
                 max_pages=2,  # 抓取2页
                 fields={
                     "标题": ".yunxiao-projex-workitem-title",
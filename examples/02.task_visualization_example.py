@@ -6,8 +6,8 @@
 import sys
 from pathlib import Path
 import json
-from collections import defaultdict
-from datetime import datetime
+from datetime import date, datetime
+import numpy as np
 
 # 将 lib 目录添加到 Python 路径，以便导入 visualization 模块
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
@@ -28,6 +28,33 @@ TASK_TYPE_MAPPING = {
     'I': "跟测",
 }
 
+# 任务标题中类型键与标题正文之间的分隔符，例如 "B.需求梳理"、"C、技术开发"
+_TASK_TYPE_SEPARATORS = ('.', '、')
+
+# 绘图方法名 -> 图表名称（批量生成后按此输出每张图表的生成信息）
+_CHART_NAMES = {
+    'bar_chart': '柱状图',
+    'line_chart': '折线图',
+    'pie_chart': '饼图',
+    'stacked_bar_chart': '堆积柱状图',
+    'horizontal_bar_chart': '横向柱状图',
+    'heatmap': '热力图',
+    'multi_chart_dashboard': '仪表盘',
+}
+
+
+def _category_codes(values):
+    """
+    把标签序列编码为整数类别。
+    
+    Returns:
+        tuple: (编码数组, 标签列表)，标签按首次出现顺序编号。
+    """
+    index = {}
+    codes = np.fromiter((index.setdefault(v, len(index)) for v in values), dtype=np.intp)
+    return codes, list(index)
+
+
 class DataProcessor:
     """
     数据处理器
@@ -46,12 +73,14 @@ class DataProcessor:
         """
         self.data_file = data_file or DATA_FILE
         self.raw_data = { "data": [] }
+        self._aggregates = None
         self.load_data()
     
     def load_data(self):
         """从 JSON 文件中加载原始数据。"""
         with open(self.data_file, 'r', encoding='utf-8') as f:
             self.raw_data = json.load(f)
+        self._aggregates = None
         return self.raw_data
     
     @staticmethod
@@ -83,30 +112,113 @@ class DataProcessor:
         Returns:
             str: 提取的任务类型，如果无法匹配则返回 "其他"。
         """
-        if not title:
-            return "其他"
-        
-        for key, value in TASK_TYPE_MAPPING.items():
-            if title.startswith(f'{key}.') or title.startswith(f'{key}、'):
-                return value
+        # 类型键都是单个字符，直接按首字符查表，第二个字符必须是分隔符
+        if title and len(title) > 1 and title[1] in _TASK_TYPE_SEPARATORS:
+            return TASK_TYPE_MAPPING.get(title[0], "其他")
         return "其他"
     
-    def get_project_workdays(self):
+    @staticmethod
+    def parse_month(start_time):
         """
-        获取每个项目的人天总数统计。
+        从开始时间中解析月份。
+        
+        Args:
+            start_time (str or None): 原始开始时间，格式 'YYYY-MM-DD'。
+            
+        Returns:
+            str or None: 月份（格式 'YYYY-MM'），缺失或无法解析时返回 None。
+        """
+        if not start_time or start_time == '--':
+            return None
+        try:
+            # 标准的 'YYYY-MM-DD' 用 C 实现的 fromisoformat 校验后直接截取前缀，
+            # 其他写法（如未补零的 '2025-1-5'）仍交给 strptime
+            if len(start_time) == 10 and start_time[4] == '-' and start_time[7] == '-':
+                date.fromisoformat(start_time)
+                return start_time[:7]
+            return datetime.strptime(start_time, '%Y-%m-%d').strftime('%Y-%m')
+        except ValueError:
+            return None
+    
+    def _aggregate(self):
+        """
+        向量化计算所有维度的聚合结果。
+        
+        每条数据的人天、项目、任务类型、月份只解析一次：人天放入 float64 数组，
+        项目/任务类型/月份编码为整数类别，再用 np.bincount 一次完成各维度
+        （以及 项目×任务类型、月份×任务类型）的分组求和。
+        结果缓存在 self._aggregates，重新调用 load_data() 时失效。
         
         Returns:
-            dict: 一个字典，键是项目名，值是该项目的人天总数。
+            dict: 各维度的聚合结果。
         """
-        project_workdays = defaultdict(float)
+        if self._aggregates is not None:
+            return self._aggregates
         
         assert self.raw_data is not None, "数据未加载，请先调用 load_data() 方法。"
-        for item in self.raw_data['data']:
-            project = item.get('项目', '未知项目')
-            workdays = self.parse_workdays(item.get('人天'))
-            project_workdays[project] += workdays
+        items = self.raw_data['data']
+        titles = [item.get('标题', '') for item in items]
+        workdays = np.fromiter(
+            (self.parse_workdays(item.get('人天')) for item in items),
+            dtype=np.float64, count=len(items)
+        )
+        project_codes, projects = _category_codes(item.get('项目', '未知项目') for item in items)
+        type_codes, task_types = _category_codes(self.extract_task_type(title) for title in titles)
+        month_keys = [self.parse_month(item.get('开始时间', '')) for item in items]
+        has_month = np.fromiter((m is not None for m in month_keys), dtype=bool, count=len(items))
+        month_codes, months = _category_codes(m for m in month_keys if m is not None)
+        n_types = len(task_types)
+        
+        project_sums = np.bincount(project_codes, weights=workdays, minlength=len(projects))
+        type_sums = np.bincount(type_codes, weights=workdays, minlength=n_types)
+        month_sums = np.bincount(month_codes, weights=workdays[has_month], minlength=len(months))
+        
+        # 项目×任务类型：只保留实际出现过的组合
+        shape = (len(projects), n_types)
+        pair_codes = project_codes * n_types + type_codes
+        project_type_sums = np.bincount(pair_codes, weights=workdays, minlength=shape[0] * shape[1]).reshape(shape)
+        project_type_seen = np.bincount(pair_codes, minlength=shape[0] * shape[1]).reshape(shape) > 0
+        project_task_data = {
+            project: {task_types[j]: project_type_sums[i, j].item() for j in np.flatnonzero(project_type_seen[i])}
+            for i, project in enumerate(projects)
+        }
+        
+        # 月份×任务类型矩阵：行为有开始时间的任务类型，行列均按标签排序
+        shape = (len(months), n_types)
+        pair_codes = month_codes * n_types + type_codes[has_month]
+        month_type_sums = np.bincount(pair_codes, weights=workdays[has_month], minlength=shape[0] * shape[1]).reshape(shape)
+        month_type_seen = np.bincount(type_codes[has_month], minlength=n_types) > 0
+        row_types = sorted(task_types[j] for j in np.flatnonzero(month_type_seen))
+        col_months = sorted(months)
+        type_index = {t: j for j, t in enumerate(task_types)}
+        month_index = {m: i for i, m in enumerate(months)}
+        month_task_matrix = month_type_sums[
+            np.ix_([month_index[m] for m in col_months], [type_index[t] for t in row_types])
+        ].T
+        
+        # Top 任务：稳定排序，人天相同时保持原有顺序
+        positive = np.flatnonzero(workdays > 0)
+        order = positive[np.argsort(-workdays[positive], kind='stable')]
+        
+        self._aggregates = {
+            'project_workdays': dict(zip(projects, project_sums.tolist())),
+            'monthly_workdays': dict(zip(months, month_sums.tolist())),
+            'task_type_workdays': dict(zip(task_types, type_sums.tolist())),
+            'project_task_data': project_task_data,
+            'month_task_matrix': (month_task_matrix, row_types, col_months),
+            'task_workdays': [(titles[i], workdays[i].item()) for i in order],
+            'total_workdays': float(workdays.sum()),
+        }
+        return self._aggregates
+    
+    def get_project_workdays(self):
+        """
+        获取每个项目的人天总数统计。
         
-        return dict(project_workdays)
+        Returns:
+            dict: 一个字典，键是项目名，值是该项目的人天总数。
+        """
+        return dict(self._aggregate()['project_workdays'])
     
     def get_monthly_workdays(self):
         """
@@ -115,22 +227,7 @@ class DataProcessor:
         Returns:
             dict: 一个字典，键是月份（格式 'YYYY-MM'），值是该月的人天总数。
         """
-        monthly_workdays = defaultdict(float)
-        
-        for item in self.raw_data['data']:
-            start_time = item.get('开始时间', '')
-            if not start_time or start_time == '--':
-                continue
-            
-            try:
-                date = datetime.strptime(start_time, '%Y-%m-%d')
-                month_key = date.strftime('%Y-%m')
-                workdays = self.parse_workdays(item.get('人天'))
-                monthly_workdays[month_key] += workdays
-            except ValueError:
-                continue
-        
-        return dict(monthly_workdays)
+        return dict(self._aggregate()['monthly_workdays'])
     
     def get_task_type_workdays(self):
         """
@@ -140,16 +237,8 @@ class DataProcessor:
             dict: 一个字典，键是任务类型，值是该类型的人天总数。
                   只包含人天数大于0的类型。
         """
-        task_type_workdays = defaultdict(float)
-        
-        for item in self.raw_data['data']:
-            title = item.get('标题', '')
-            task_type = self.extract_task_type(title)
-            workdays = self.parse_workdays(item.get('人天'))
-            task_type_workdays[task_type] += workdays
-        
         # 过滤掉人天为0的任务类型
-        return {k: v for k, v in task_type_workdays.items() if v > 0}
+        return {k: v for k, v in self._aggregate()['task_type_workdays'].items() if v > 0}
     
     def get_project_task_distribution(self):
         """
@@ -158,15 +247,7 @@ class DataProcessor:
         Returns:
             dict: 一个嵌套字典，格式为 {项目: {任务类型: 人天数}}。
         """
-        project_task_data = defaultdict(lambda: defaultdict(float))
-        
-        for item in self.raw_data['data']:
-            project = item.get('项目', '未知项目')
-            task_type = self.extract_task_type(item.get('标题', ''))
-            workdays = self.parse_workdays(item.get('人天'))
-            project_task_data[project][task_type] += workdays
-        
-        return {k: dict(v) for k, v in project_task_data.items()}
+        return {k: dict(v) for k, v in self._aggregate()['project_task_data'].items()}
     
     def get_top_tasks(self, top_n=15):
         """
@@ -178,16 +259,7 @@ class DataProcessor:
         Returns:
             list: 一个列表，包含元组 (任务标题, 人天数)，按人天数降序排列。
         """
-        task_workdays = []
-        
-        for item in self.raw_data['data']:
-            title = item.get('标题', '')
-            workdays = self.parse_workdays(item.get('人天'))
-            if workdays > 0:
-                task_workdays.append((title, workdays))
-        
-        task_workdays.sort(key=lambda x: x[1], reverse=True)
-        return task_workdays[:top_n]
+        return self._aggregate()['task_workdays'][:top_n]
     
     def get_month_task_matrix(self):
         """
@@ -199,35 +271,8 @@ class DataProcessor:
                 - row_labels (list): 任务类型列表（行标签）。
                 - col_labels (list): 月份列表（列标签）。
         """
-        month_task_data = defaultdict(lambda: defaultdict(float))
-        
-        for item in self.raw_data['data']:
-            start_time = item.get('开始时间', '')
-            if not start_time or start_time == '--':
-                continue
-            
-            try:
-                date = datetime.strptime(start_time, '%Y-%m-%d')
-                month_key = date.strftime('%Y-%m')
-                task_type = self.extract_task_type(item.get('标题', ''))
-                workdays = self.parse_workdays(item.get('人天'))
-                month_task_data[month_key][task_type] += workdays
-            except ValueError:
-                continue
-        
-        # 准备行和列的标签
-        months = sorted(month_task_data.keys())
-        task_types = sorted(set(
-            task for tasks in month_task_data.values() for task in tasks.keys()
-        ))
-        
-        # 构建数据矩阵
-        matrix = []
-        for task_type in task_types:
-            row = [month_task_data[month].get(task_type, 0) for month in months]
-            matrix.append(row)
-        
-        return matrix, task_types, months
+        matrix, task_types, months = self._aggregate()['month_task_matrix']
+        return matrix.tolist(), list(task_types), list(months)
     
     def get_statistics(self):
         """
@@ -236,16 +281,12 @@ class DataProcessor:
         Returns:
             dict: 包含各种统计数据的字典，例如总人天、任务总数等。
         """
-        total_workdays = sum(
-            self.parse_workdays(item.get('人天')) for item in self.raw_data['data']
-        )
-        total_tasks = len([
-            item for item in self.raw_data['data'] 
-            if self.parse_workdays(item.get('人天')) > 0
-        ])
+        aggregates = self._aggregate()
+        total_workdays = aggregates['total_workdays']
+        total_tasks = len(aggregates['task_workdays'])
         avg_workdays = total_workdays / total_tasks if total_tasks > 0 else 0
         
-        project_count = len(self.get_project_workdays())
+        project_count = len(aggregates['project_workdays'])
         task_type_count = len(self.get_task_type_workdays())
         
         return {
@@ -292,72 +333,72 @@ class TaskVisualization:
         self.processor = DataProcessor(data_file)
         self.visualizer = Visualizer(output_dir)
     
-    def generate_project_chart(self):
-        """生成并保存项目人天统计图（柱状图）。"""
-        data = self.processor.get_project_workdays()
-        return self.visualizer.bar_chart(
-            data=data,
+    def _render(self, job):
+        """在当前进程中生成一张图表。"""
+        method_name, args, kwargs = job
+        return getattr(self.visualizer, method_name)(*args, **kwargs)
+    
+    def _project_chart_job(self):
+        """项目人天统计图（柱状图）的绘制任务。"""
+        return ('bar_chart', (), dict(
+            data=self.processor.get_project_workdays(),
             title='各项目人天统计',
             xlabel='项目',
             ylabel='人天',
             filename='项目人天统计_柱状图.png'
-        )
+        ))
     
-    def generate_monthly_trend_chart(self):
-        """生成并保存月度人天趋势图（折线图）。"""
-        data = self.processor.get_monthly_workdays()
-        return self.visualizer.line_chart(
-            data=data,
+    def _monthly_trend_chart_job(self):
+        """月度人天趋势图（折线图）的绘制任务。"""
+        return ('line_chart', (), dict(
+            data=self.processor.get_monthly_workdays(),
             title='月度人天趋势',
             xlabel='月份',
             ylabel='人天',
             filename='月度人天趋势_折线图.png'
-        )
+        ))
     
-    def generate_task_type_chart(self):
-        """生成并保存任务类型人天占比图（饼图）。"""
-        data = self.processor.get_task_type_workdays()
-        return self.visualizer.pie_chart(
-            data=data,
+    def _task_type_chart_job(self):
+        """任务类型人天占比图（饼图）的绘制任务。"""
+        return ('pie_chart', (), dict(
+            data=self.processor.get_task_type_workdays(),
             title='任务类型人天占比',
             filename='任务类型占比_饼图.png'
-        )
+        ))
     
-    def generate_project_task_distribution(self):
-        """生成并保存项目任务类型分布图（堆积柱状图）。"""
-        data = self.processor.get_project_task_distribution()
-        return self.visualizer.stacked_bar_chart(
-            data=data,
+    def _project_task_distribution_job(self):
+        """项目任务类型分布图（堆积柱状图）的绘制任务。"""
+        return ('stacked_bar_chart', (), dict(
+            data=self.processor.get_project_task_distribution(),
             title='各项目任务类型分布',
             xlabel='项目',
             ylabel='人天',
             filename='项目任务分布_堆积柱状图.png'
-        )
+        ))
     
-    def generate_top_tasks_chart(self, top_n=15):
-        """生成并保存人天数排名前N的任务图（横向柱状图）。"""
-        data = dict(self.processor.get_top_tasks(top_n))
-        return self.visualizer.horizontal_bar_chart(
-            data=data,
+    def _top_tasks_chart_job(self, top_n=15):
+        """人天数排名前N的任务图（横向柱状图）的绘制任务。"""
+        return ('horizontal_bar_chart', (), dict(
+            data=dict(self.processor.get_top_tasks(top_n)),
             title=f'Top {top_n} 任务人天排名',
             xlabel='人天',
             filename='任务人天排名_横向柱状图.png',
             top_n=top_n
-        )
+        ))
     
-    def generate_heatmap(self):
-        """生成并保存月份-任务类型人天热力图。"""
+    def _heatmap_job(self):
+        """月份-任务类型人天热力图的绘制任务。"""
         matrix, row_labels, col_labels = self.processor.get_month_task_matrix()
-        return self.visualizer.heatmap(
+        return ('heatmap', (), dict(
             data=matrix,
             row_labels=row_labels,
             col_labels=col_labels,
             title='月份×任务类型 人天热力图',
             filename='月份任务类型_热力图.png'
-        )
+        ))
     
-    def generate_dashboard(self):
-        """生成并保存一个包含多个图表的综合仪表盘。"""
+    def _dashboard_job(self):
+        """综合仪表盘的绘制任务。"""
         dashboard_data = self.processor.get_dashboard_data()
         stats = dashboard_data['statistics']
         
@@ -388,22 +429,77 @@ class TaskVisualization:
             (313, 'text', stats_text, {'fontsize': 11}),
         ]
         
-        return self.visualizer.multi_chart_dashboard(
+        return ('multi_chart_dashboard', (), dict(
             charts_config=charts_config,
             title='云效任务统计综合仪表盘',
             filename='综合统计仪表盘.png'
-        )
+        ))
+    
+    def _basic_chart_jobs(self):
+        """基础图表（项目、月度趋势、任务类型）的绘制任务列表。"""
+        return [
+            self._project_chart_job(),
+            self._monthly_trend_chart_job(),
+            self._task_type_chart_job(),
+        ]
+    
+    def _advanced_chart_jobs(self):
+        """高级图表（分布、Top 任务、热力图、仪表盘）的绘制任务列表。"""
+        return [
+            self._project_task_distribution_job(),
+            self._top_tasks_chart_job(15),
+            self._heatmap_job(),
+            self._dashboard_job(),
+        ]
+    
+    def _batch_render(self, jobs):
+        """
+        多进程并行绘制一批任务，并逐张输出生成信息。
+        
+        工作进程中的 Visualizer 不打印（避免争用标准输出），
+        由主进程按任务顺序输出与单张生成时相同的提示。
+        """
+        filepaths = self.visualizer.batch_render(jobs)
+        for (method_name, _, _), filepath in zip(jobs, filepaths):
+            print(f"✓ {_CHART_NAMES[method_name]}已生成: {filepath}")
+        return filepaths
+    
+    def generate_project_chart(self):
+        """生成并保存项目人天统计图（柱状图）。"""
+        return self._render(self._project_chart_job())
+    
+    def generate_monthly_trend_chart(self):
+        """生成并保存月度人天趋势图（折线图）。"""
+        return self._render(self._monthly_trend_chart_job())
+    
+    def generate_task_type_chart(self):
+        """生成并保存任务类型人天占比图（饼图）。"""
+        return self._render(self._task_type_chart_job())
+    
+    def generate_project_task_distribution(self):
+        """生成并保存项目任务类型分布图（堆积柱状图）。"""
+        return self._render(self._project_task_distribution_job())
+    
+    def generate_top_tasks_chart(self, top_n=15):
+        """生成并保存人天数排名前N的任务图（横向柱状图）。"""
+        return self._render(self._top_tasks_chart_job(top_n))
+    
+    def generate_heatmap(self):
+        """生成并保存月份-任务类型人天热力图。"""
+        return self._render(self._heatmap_job())
+    
+    def generate_dashboard(self):
+        """生成并保存一个包含多个图表的综合仪表盘。"""
+        return self._render(self._dashboard_job())
     
     def generate_basic_charts(self):
-        """生成所有基础图表（柱状图、折线图、饼图）。"""
+        """生成所有基础图表（柱状图、折线图、饼图），多进程并行绘制。"""
         print("=" * 60)
         print("开始生成基础图表...")
         print("=" * 60)
         print()
         
-        self.generate_project_chart()
-        self.generate_monthly_trend_chart()
-        self.generate_task_type_chart()
+        self._batch_render(self._basic_chart_jobs())
         
         print()
         print("=" * 60)
@@ -411,16 +507,13 @@ class TaskVisualization:
         print("=" * 60)
     
     def generate_advanced_charts(self):
-        """生成所有高级图表（堆积图、热力图、仪表盘等）。"""
+        """生成所有高级图表（堆积图、热力图、仪表盘等），多进程并行绘制。"""
         print("=" * 60)
         print("开始生成高级图表...")
         print("=" * 60)
         print()
         
-        self.generate_project_task_distribution()
-        self.generate_top_tasks_chart(15)
-        self.generate_heatmap()
-        self.generate_dashboard()
+        self._batch_render(self._advanced_chart_jobs())
         
         print()
         print("=" * 60)
@@ -428,15 +521,18 @@ class TaskVisualization:
         print("=" * 60)
     
     def generate_all_charts(self):
-        """生成所有定义的图表。"""
+        """
+        生成所有定义的图表。
+        
+        七张图表相互独立，合并为一批交给 Visualizer.batch_render 在进程池中并行绘制
+        （Matplotlib 绘制大部分时间持有 GIL，线程池无法并行）。
+        """
         print("=" * 60)
         print("云效任务数据可视化")
         print("=" * 60)
         print()
         
-        self.generate_basic_charts()
-        print()
-        self.generate_advanced_charts()
+        self._batch_render(self._basic_chart_jobs() + self._advanced_chart_jobs())
         
         print()
         print("=" * 60)
@@ -5,29 +5,68 @@ import os
 import sys
 from pathlib import Path
 import asyncio
+from typing import Optional, TYPE_CHECKING
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
-from langchain_core.messages import HumanMessage
 
 # 添加 lib 到 Python 路径
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
-from browser import BrowserManager
-from custom_agent import create_custom_agent, add
-from puppeteer import get_browser_tools
+# browser / custom_agent / puppeteer 会加载 Playwright、LangChain 等重量级依赖，
+# 在各示例中按需导入，菜单无需等待
+if TYPE_CHECKING:
+    from browser import BrowserManager
 
 load_dotenv()
 cdp_url = os.getenv("CDP_URL")
 
+# 用户选择示例期间预先启动的浏览器，由第一个需要新浏览器的示例取用
+_warm_browser: Optional[asyncio.Task] = None
+
+
+async def _start_browser() -> "BrowserManager":
+    """启动新的 Chromium 浏览器"""
+    from browser import BrowserManager
+    
+    bm = BrowserManager(cdp_url=cdp_url, mode="launch", headless=False)
+    await bm.start()
+    return bm
+
+
+@asynccontextmanager
+async def launch_browser():
+    """获取新启动的浏览器（优先使用预热好的实例），退出时关闭"""
+    global _warm_browser
+    warm, _warm_browser = _warm_browser, None
+    
+    bm = None
+    if warm is not None:
+        try:
+            bm = await warm
+        except Exception as e:
+            print(f"⚠️  Browser warm-up failed, launching again: {e}")
+    if bm is None:
+        bm = await _start_browser()
+    
+    try:
+        yield bm
+    finally:
+        await bm.close()
+
 # ==========================================
 # 示例 1: 启动新浏览器
 # ==========================================
 
 async def example_launch_browser():
     """示例：启动新的 Chromium 浏览器"""
+    from langchain_core.messages import HumanMessage
+    from custom_agent import create_custom_agent
+    from puppeteer import get_browser_tools
+    
     print("\n" + "="*60)
     print("📌 Example 1: Launch New Browser")
     print("="*60 + "\n")
     
-    async with BrowserManager(cdp_url=cdp_url, mode="launch", headless=False) as bm:
+    async with launch_browser() as bm:
         browser = bm.get_browser()
         tools = get_browser_tools(browser)
         agent = create_custom_agent(tools=tools)
@@ -44,6 +83,11 @@ async def example_launch_browser():
 
 async def example_connect_chrome():
     """示例：连接到已有的 Chrome 实例"""
+    from langchain_core.messages import HumanMessage
+    from browser import BrowserManager
+    from custom_agent import create_custom_agent
+    from puppeteer import get_browser_tools
+    
     print("\n" + "="*60)
     print("📌 Example 2: Connect to Existing Chrome")
     print("="*60 + "\n")
@@ -71,6 +115,8 @@ async def example_connect_chrome():
 
 async def example_custom_cdp():
     """示例：使用自定义 CDP URL"""
+    from browser import BrowserManager
+    
     print("\n" + "="*60)
     print("📌 Example 3: Custom CDP URL")
     print("="*60 + "\n")
@@ -90,27 +136,46 @@ async def example_custom_cdp():
 # 示例 4: 多任务执行
 # ==========================================
 
-async def example_multiple_tasks():
-    """示例：在同一个浏览器会话中执行多个任务"""
-    print("\n" + "="*60)
-    print("📌 Example 4: Multiple Tasks")
-    print("="*60 + "\n")
+async def _run_browser_task(task: str) -> str:
+    """在独立的浏览器中执行一个任务（浏览器工具总是操作 contexts[0]，并发任务不能共用一个浏览器）"""
+    from langchain_core.messages import HumanMessage
+    from custom_agent import create_custom_agent
+    from puppeteer import get_browser_tools
     
-    async with BrowserManager(cdp_url=cdp_url, mode="launch", headless=False) as bm:
+    async with launch_browser() as bm:
         browser = bm.get_browser()
         tools = get_browser_tools(browser)
         agent = create_custom_agent(tools=tools)
         
-        tasks = [
-            "Go to https://github.com and extract the main heading",
-            "Navigate to https://stackoverflow.com and get the page title",
-            "Take a screenshot named 'final.png'"
-        ]
-        
-        for i, task in enumerate(tasks, 1):
-            print(f"\n📝 Task {i}: {task}")
-            result = await agent.ainvoke({"messages": [HumanMessage(content=task)]})
-            print(f"✅ {result['messages'][-1].content}")
+        result = await agent.ainvoke({"messages": [HumanMessage(content=task)]})
+        return result['messages'][-1].content
+
+
+async def example_multiple_tasks():
+    """示例：并发执行多个互不依赖的任务，总耗时约等于最慢的一个"""
+    print("\n" + "="*60)
+    print("📌 Example 4: Multiple Tasks")
+    print("="*60 + "\n")
+    
+    tasks = [
+        "Go to https://github.com and extract the main heading",
+        "Navigate to https://stackoverflow.com and get the page title",
+        "Go to https://example.com and take a screenshot named 'final.png'"
+    ]
+    
+    for i, task in enumerate(tasks, 1):
+        print(f"📝 Task {i}: {task}")
+    
+    results = await asyncio.gather(
+        *(_run_browser_task(task) for task in tasks),
+        return_exceptions=True
+    )
+    
+    for i, result in enumerate(results, 1):
+        if isinstance(result, Exception):
+            print(f"\n❌ Task {i} failed: {result}")
+        else:
+            print(f"\n✅ Task {i}: {result}")
 
 
 # ==========================================
@@ -123,6 +188,7 @@ async def example_browser_info():
     print("📌 Example 5: Browser Information")
     print("="*60 + "\n")
     
+    from browser import BrowserManager
     from browser.detector import get_chrome_pages
     
     async with BrowserManager(cdp_url=cdp_url, mode="connect") as bm:
@@ -150,6 +216,8 @@ async def example_browser_info():
 
 async def example_error_handling():
     """示例：优雅的错误处理"""
+    from browser import BrowserManager
+    
     print("\n" + "="*60)
     print("📌 Example 6: Error Handling")
     print("="*60 + "\n")
@@ -181,6 +249,9 @@ async def example_custom_tools():
     print("="*60 + "\n")
     
     from langchain_core.tools import tool
+    from langchain_core.messages import HumanMessage
+    from custom_agent import create_custom_agent, add
+    from puppeteer import get_browser_tools
     
     @tool
     def calculate_percentage(value: float, total: float) -> str:
@@ -190,7 +261,7 @@ async def example_custom_tools():
         percentage = (value / total) * 100
         return f"{percentage:.2f}%"
     
-    async with BrowserManager(cdp_url=cdp_url, mode="launch", headless=False) as bm:
+    async with launch_browser() as bm:
         browser = bm.get_browser()
         browser_tools = get_browser_tools(browser)
         
@@ -209,6 +280,19 @@ async def example_custom_tools():
 # 主函数 - 运行所有示例
 # ==========================================
 
+# 'all' 模式下同时运行的示例数
+_MAX_CONCURRENT_EXAMPLES = 3
+
+
+async def _run_guarded(sem: asyncio.Semaphore, name: str, func):
+    """在并发上限内运行一个示例，异常只影响该示例"""
+    async with sem:
+        try:
+            await func()
+        except Exception as e:
+            print(f"\n❌ Example '{name}' failed: {e}")
+
+
 async def main():
     """运行所有示例"""
     examples = [
@@ -228,17 +312,29 @@ async def main():
     for i, (name, _) in enumerate(examples, 1):
         print(f"   {i}. {name}")
     
-    choice = input("\nSelect example (1-7, or 'all'): ").strip()
+    # 等待输入的同时启动浏览器，Chromium 冷启动耗时被用户选择的时间掩盖
+    global _warm_browser
+    _warm_browser = asyncio.create_task(_start_browser())
+    choice = (await asyncio.to_thread(input, "\nSelect example (1-7, or 'all'): ")).strip()
     
-    if choice.lower() == 'all':
-        for name, func in examples:
+    try:
+        if choice.lower() == 'all':
+            # 各示例使用独立的浏览器/连接，互不依赖，限制并发数后同时运行
+            sem = asyncio.Semaphore(_MAX_CONCURRENT_EXAMPLES)
+            await asyncio.gather(*(_run_guarded(sem, name, func) for name, func in examples))
+        elif choice.isdigit() and 1 <= int(choice) <= len(examples):
+            name, func = examples[int(choice) - 1]
             await func()
-            await asyncio.sleep(1)
-    elif choice.isdigit() and 1 <= int(choice) <= len(examples):
-        name, func = examples[int(choice) - 1]
-        await func()
-    else:
-        print("❌ Invalid choice")
+        else:
+            print("❌ Invalid choice")
+    finally:
+        # 所选示例没有用到预热的浏览器时将其关闭
+        warm, _warm_browser = _warm_browser, None
+        if warm is not None:
+            try:
+                await (await warm).close()
+            except Exception:
+                pass
 
 
 if __name__ == "__main__":
@@ -3,11 +3,14 @@ Browser management package
 """
 
 from .manager import BrowserManager
-from .detector import find_chrome_cdp_url, check_cdp_connection, get_chrome_pages
+from .detector import find_chrome_cdp_url, check_cdp_connection, get_chrome_pages, get_browser_ws_url
+from .runner import run_async
 
 __all__ = [
     'BrowserManager',
     'find_chrome_cdp_url',
     'check_cdp_connection',
-    'get_chrome_pages'
+    'get_chrome_pages',
+    'get_browser_ws_url',
+    'run_async'
 ]
\ No newline at end of file
@@ -118,4 +118,39 @@ async def get_chrome_pages(cdp_url: str) -> list[dict]:
     except:
         pass
     
-    return []
\ No newline at end of file
+    return []
+
+async def get_browser_ws_url(cdp_url: str) -> Optional[str]:
+    """
+    获取浏览器级 CDP WebSocket 地址（/devtools/browser/...）
+    
+    Args:
+        cdp_url: CDP URL（http://host:port；已是 ws:// 地址时原样返回）
+        
+    Returns:
+        str: WebSocket 地址
+        None: 获取失败
+    """
+    if cdp_url.startswith(("ws://", "wss://")):
+        return cdp_url
+    
+    try:
+        import aiohttp
+    except ImportError:
+        return None
+    
+    version_url = f"{cdp_url.rstrip('/')}/json/version"
+    
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(
+                version_url,
+                timeout=aiohttp.ClientTimeout(total=3)
+            ) as resp:
+                if resp.status == 200:
+                    data = await resp.json()
+                    return data.get("webSocketDebuggerUrl") or None
+    except:
+        pass
+    
+    return None
@@ -15,6 +15,14 @@ from .detector import find_chrome_cdp_url
 
 load_dotenv()
 
+# 启动 Chromium 时追加的参数。Playwright 默认已带 --no-sandbox、--disable-extensions、
+# --disable-background-networking、--disable-dev-shm-usage、--no-first-run 及
+# --disable-features=Translate,...（再传 --disable-features 会覆盖其默认列表），这里只补充缺少的
+_DEFAULT_LAUNCH_ARGS = ["--disable-sync"]
+
+# 无头模式不需要 GPU 进程
+_HEADLESS_LAUNCH_ARGS = ["--disable-gpu"]
+
 class BrowserManager:
     """浏览器管理器"""
     
@@ -23,7 +31,9 @@ class BrowserManager:
         mode: Literal["launch", "connect"] = "launch",
         headless: bool = False,
         cdp_url: Optional[str] = None,
-        cdp_ports: list[int] = [9222, 9223, 9224]
+        cdp_ports: list[int] = [9222, 9223, 9224],
+        user_data_dir: Optional[str] = None,
+        launch_args: Optional[list[str]] = None
     ):
         """
         初始化浏览器管理器
@@ -35,13 +45,23 @@ class BrowserManager:
             headless: 是否无头模式（仅在 launch 模式下有效）
             cdp_url: CDP 连接地址（connect 模式下使用）
             cdp_ports: 自动检测的 CDP 端口列表
+            user_data_dir: 用户数据目录（仅在 launch 模式下有效）
+                - 指定后使用持久化上下文启动，cookies/缓存/登录态在多次运行间复用
+            launch_args: Chromium 启动参数（仅在 launch 模式下有效）
+                - 为空时使用默认参数（关闭同步，无头模式下关闭 GPU）
         """
         self.mode = mode
         self.headless = headless
         self.cdp_url = cdp_url = os.getenv("CDP_URL") or cdp_url
         self.cdp_ports = cdp_ports
+        self.user_data_dir = os.path.expanduser(user_data_dir) if user_data_dir else None
+        if launch_args is None:
+            launch_args = _DEFAULT_LAUNCH_ARGS + (_HEADLESS_LAUNCH_ARGS if headless else [])
+        self.launch_args = launch_args
         
         self.browser: Optional[Browser] = None
+        # 持久化上下文（user_data_dir 模式下没有 Browser 对象）
+        self.persistent_context: Optional[BrowserContext] = None
         self.playwright: Optional["Playwright"] = None
         self._is_external_browser = False
     
@@ -54,11 +74,16 @@ class BrowserManager:
         """异步上下文管理器退出"""
         await self.close()
     
-    async def start(self) -> Browser:
-        """启动或连接浏览器"""
+    async def start(self) -> Optional[Browser]:
+        """启动或连接浏览器（持久化上下文模式下返回 None）"""
         self.playwright = await async_playwright().start()
         
-        if self.mode == "launch":
+        if self.mode == "launch" and self.user_data_dir:
+            self.persistent_context = await self._launch_persistent_context()
+            self._is_external_browser = False
+            print(f"✅ Launched Chromium with user data dir: {self.user_data_dir} (headless={self.headless})")
+        
+        elif self.mode == "launch":
             self.browser = await self._launch_browser()
             self._is_external_browser = False
             print(f"✅ Launched new Chromium instance (headless={self.headless})")
@@ -76,7 +101,30 @@ class BrowserManager:
     async def _launch_browser(self) -> Browser:
         """启动新的 Chromium 实例"""
         assert self.playwright is not None, "Playwright not initialized"
-        return await self.playwright.chromium.launch(headless=self.headless)
+        return await self.playwright.chromium.launch(
+            headless=self.headless,
+            args=self.launch_args
+        )
+    
+    async def _launch_persistent_context(self) -> BrowserContext:
+        """使用用户数据目录启动 Chromium（复用配置文件、缓存和 cookies）"""
+        assert self.playwright is not None, "Playwright not initialized"
+        os.makedirs(self.user_data_dir, exist_ok=True)
+        return await self.playwright.chromium.launch_persistent_context(
+            self.user_data_dir,
+            headless=self.headless,
+            args=self.launch_args
+        )
+    
+    def _is_started(self) -> bool:
+        """浏览器或持久化上下文是否已就绪"""
+        return self.browser is not None or self.persistent_context is not None
+    
+    def _contexts(self) -> list[BrowserContext]:
+        """当前所有浏览器上下文"""
+        if self.persistent_context is not None:
+            return [self.persistent_context]
+        return self.browser.contexts if self.browser else []
     
     async def _connect_to_chrome(self) -> Browser:
         """连接到已有的 Chrome 实例"""
@@ -120,7 +168,7 @@ class BrowserManager:
         Returns:
             Page: Playwright 页面对象
         """
-        if not self.browser:
+        if not self._is_started():
             raise RuntimeError("Browser not started. Call start() first.")
         
         # 如果指定了目标URL，尝试查找对应的标签页
@@ -133,7 +181,7 @@ class BrowserManager:
                 print(f"⚠️ No tab found for: {target_url}")
         
         # 获取所有上下文
-        contexts = self.browser.contexts
+        contexts = self._contexts()
         
         # 如果没有上下文，创建一个新的
         if not contexts:
@@ -172,14 +220,14 @@ class BrowserManager:
         Returns:
             Page: 找到的页面对象，如果没找到返回None
         """
-        if not self.browser:
+        if not self._is_started():
             return None
         
         # 规范化目标URL
         target_url_normalized = target_url.lower().strip()
         
         # 遍历所有上下文和页面
-        for context in self.browser.contexts:
+        for context in self._contexts():
             for page in context.pages:
                 try:
                     page_url = page.url.lower()
@@ -204,12 +252,12 @@ class BrowserManager:
         Returns:
             包含所有页面信息的列表
         """
-        if not self.browser:
+        if not self._is_started():
             return []
         
         pages_info = []
         
-        for ctx_idx, context in enumerate(self.browser.contexts):
+        for ctx_idx, context in enumerate(self._contexts()):
             for page_idx, page in enumerate(context.pages):
                 try:
                     pages_info.append({
@@ -232,10 +280,10 @@ class BrowserManager:
     
     async def get_context(self) -> BrowserContext:
         """获取浏览器上下文"""
-        if not self.browser:
+        if not self._is_started():
             raise RuntimeError("Browser not started.")
         
-        contexts = self.browser.contexts
+        contexts = self._contexts()
         if not contexts:
             return await self.browser.new_context()
         
@@ -244,7 +292,10 @@ class BrowserManager:
     def get_browser(self) -> Browser:
         """获取浏览器实例"""
         if not self.browser:
-            raise RuntimeError("Browser not started.")
+            raise RuntimeError(
+                "Browser not started." if not self.persistent_context
+                else "Persistent context has no Browser instance. Use get_context() instead."
+            )
         return self.browser
     
     async def close(self):
@@ -252,6 +303,10 @@ class BrowserManager:
         # 如果是外部 Chrome，不关闭浏览器
         if self._is_external_browser:
             print("🔗 External Chrome remains open (not closed by manager)")
+        elif self.persistent_context:
+            # 关闭时会把 cookies 等会话数据落盘到 user_data_dir
+            await self.persistent_context.close()
+            print("🚪 Browser closed (profile saved)")
         elif self.browser:
             await self.browser.close()
             print("🚪 Browser closed")
@@ -262,10 +317,10 @@ class BrowserManager:
     
     def get_info(self) -> dict:
         """获取浏览器信息"""
-        if not self.browser:
+        if not self._is_started():
             return {"status": "not_started"}
         
-        contexts = self.browser.contexts
+        contexts = self._contexts()
         total_pages = sum(len(ctx.pages) for ctx in contexts)
         
         return {
@@ -274,5 +329,6 @@ class BrowserManager:
             "is_external": self._is_external_browser,
             "contexts": len(contexts),
             "total_pages": total_pages,
-            "cdp_url": self.cdp_url if self.mode == "connect" else None
+            "cdp_url": self.cdp_url if self.mode == "connect" else None,
+            "user_data_dir": self.user_data_dir if self.persistent_context else None
         }
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""
+异步入口运行模块
+"""
+
+import asyncio
+from typing import Any, Coroutine, TypeVar
+
+_T = TypeVar("_T")
+
+
+def run_async(main: Coroutine[Any, Any, _T]) -> _T:
+    """
+    运行异步入口协程
+    
+    安装了 uvloop（非 Windows）时改用 libuv 事件循环，否则使用 asyncio.run
+    
+    Args:
+        main: 入口协程，例如 main()
+    Returns:
+        协程的返回值
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+    return uvloop.run(main)
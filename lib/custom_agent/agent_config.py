@@ -4,7 +4,11 @@ Agent 配置模块
 """
 
 import os
+import httpx
+import importlib.util
+from functools import lru_cache
 from typing import List
+from openai import DefaultAsyncHttpxClient
 from pydantic import SecretStr
 from langchain_openai import ChatOpenAI
 from langchain.agents import create_agent
@@ -34,6 +38,9 @@ def create_llm(
     """
     创建 LLM 实例
     
+    相同 (api_key, base_url, model, temperature) 复用同一个实例（及其 HTTP 连接池），
+    多次创建 Agent 时不再重复初始化客户端。
+    
     Args:
         api_key: API 密钥（默认从环境变量获取）
         base_url: API 端点（默认从环境变量获取）
@@ -55,11 +62,31 @@ def create_llm(
     if not base_url:
         raise ValueError("Base URL is required. Set ALIBABA_API_URL environment variable.")
     
+    return _cached_llm(api_key, base_url, model, temperature)
+
+
+@lru_cache(maxsize=1)
+def _shared_http_client() -> httpx.AsyncClient:
+    """
+    所有 LLM 实例共用的异步 HTTP 客户端（长连接复用，避免每次请求重新 TLS 握手）
+    
+    安装了 h2 时启用 HTTP/2。基于 openai 的 DefaultAsyncHttpxClient，保留 SDK 默认的超时设置。
+    """
+    return DefaultAsyncHttpxClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60)
+    )
+
+
+@lru_cache(maxsize=8)
+def _cached_llm(api_key: str, base_url: str, model: str, temperature: float) -> ChatOpenAI:
+    """按已解析的参数缓存 ChatOpenAI 实例"""
     return ChatOpenAI(
         api_key=SecretStr(api_key),
         base_url=base_url,
         model=model,
         temperature=temperature,
+        http_async_client=_shared_http_client(),
     )
 
 
@@ -4,8 +4,9 @@
 """
 
 import os
-import json
+import orjson
 import asyncio
+import threading
 from typing import Literal, cast
 from dotenv import load_dotenv
 from langchain_core.messages import HumanMessage, messages_to_dict
@@ -48,11 +49,12 @@ async def run_agent_task(agent, task: str, save_log: bool = True):
         # 保存日志
         if save_log:
             messages_dict = messages_to_dict(result["messages"])
-            json_str = json.dumps(messages_dict, indent=2, ensure_ascii=False)
+            # orjson 直接输出 UTF-8 字节（等价于 ensure_ascii=False），无需再经文本模式编码
+            json_bytes = orjson.dumps(messages_dict, option=orjson.OPT_INDENT_2)
             
             log_file = "agent_log.json"
-            with open(log_file, "w", encoding="utf-8") as f:
-                f.write(json_str)
+            with open(log_file, "wb") as f:
+                f.write(json_bytes)
             print(f"💾 Log saved to {log_file}")
         
         return result
@@ -155,6 +157,36 @@ async def main():
     print("="*60)
 
 
+async def read_input(prompt: str) -> str:
+    """
+    在后台守护线程中读取一行输入
+    
+    用户输入期间事件循环保持运行，浏览器连接上的事件和网络数据可以继续处理；
+    守护线程不会在退出时阻塞解释器。
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def settle(result=None, error=None):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    
+    def read():
+        try:
+            line = input(prompt)
+        except BaseException as e:
+            loop.call_soon_threadsafe(settle, None, e)
+        else:
+            loop.call_soon_threadsafe(settle, line)
+    
+    threading.Thread(target=read, daemon=True).start()
+    return await future
+
+
 async def interactive_mode():
     """
     交互模式 - 持续接收用户输入
@@ -174,7 +206,7 @@ async def interactive_mode():
         
         while True:
             try:
-                task = input("\n💬 Your task: ").strip()
+                task = (await read_input("\n💬 Your task: ")).strip()
                 
                 if task.lower() in ['quit', 'exit', 'q']:
                     print("👋 Goodbye!")
@@ -185,9 +217,12 @@ async def interactive_mode():
                 
                 await run_agent_task(agent, task, save_log=False)
                 
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, asyncio.CancelledError):
                 print("\n\n👋 Interrupted by user")
                 break
+            except EOFError:
+                print("\n👋 Goodbye!")
+                break
             except Exception as e:
                 print(f"❌ Error: {e}")
 
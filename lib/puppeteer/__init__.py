@@ -4,7 +4,9 @@ Provides browser automation capabilities to the agent.
 """
 
 from .puppeteer_tools import get_browser_tools
-from .table_scraper.table_scraper import TableScraper, TableData, PaginationConfig
+from .table_scraper.table_scraper import TableScraper, TableData, PaginationConfig, StreamingTableWriter
+from .table_scraper.cdp_scraper import CDPTableScraper
+from .table_scraper.autoscale import AutoscaledConcurrency
 from .table_scraper.table_tools import get_table_scraping_tools
 from .universal_scraper import (
     UniversalScraper,
@@ -37,8 +39,11 @@ __all__ = [
     'get_table_scraping_tools',
     'get_universal_scraping_tools',
     'TableScraper',
+    'CDPTableScraper',
+    'AutoscaledConcurrency',
     'TableData',
     'PaginationConfig',
+    'StreamingTableWriter',
     'UniversalScraper',
     'ScraperConfig',
     'FieldConfig',
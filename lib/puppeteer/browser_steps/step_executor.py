@@ -11,6 +11,12 @@ from playwright.async_api import Page
 from enum import Enum
 
 
+def _write_json(filename: str, data: Any):
+    """以 UTF-8、缩进 2 写出 JSON 文件"""
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
 class StepType(str, Enum):
     """步骤类型"""
     NAVIGATE = "navigate"           # 打开URL
@@ -151,8 +157,13 @@ class BrowserStepExecutor:
             raise ValueError("导航步骤需要提供URL")
         
         print(f"   🌐 访问: {url}")
-        await self.page.goto(url)
-        await asyncio.sleep(step.wait_time)
+        if step.selector:
+            # 指定了就绪选择器：DOM 就绪后等到目标元素出现即继续，不再固定休眠
+            await self.page.goto(url, wait_until="domcontentloaded")
+            await self.page.wait_for_selector(step.selector, timeout=10000)
+        else:
+            await self.page.goto(url)
+            await asyncio.sleep(step.wait_time)
         
         return {"success": True, "url": url}
     
@@ -279,8 +290,8 @@ class BrowserStepExecutor:
         
         # 保存数据
         output_file = step.output_file or "output.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # 在线程中写文件，避免阻塞事件循环上的其他浏览器任务
+        await asyncio.to_thread(_write_json, output_file, data)
         
         print(f"   ✓ 保存到: {output_file}")
         
@@ -292,17 +303,18 @@ class BrowserStepExecutor:
     
     def save_log(self, filename: str = "execution_log.json"):
         """保存执行日志"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.execution_log, f, ensure_ascii=False, indent=2)
+        _write_json(filename, self.execution_log)
         print(f"💾 执行日志已保存到: {filename}")
 
 
 # 便捷函数
 
-def create_navigate_step(url: str, wait_time: float = 1.0, description: str = "") -> StepConfig:
-    """创建导航步骤"""
+def create_navigate_step(url: str, wait_time: float = 1.0, description: str = "",
+                         wait_selector: Optional[str] = None) -> StepConfig:
+    """创建导航步骤（提供 wait_selector 时等待该元素出现，代替固定等待 wait_time 秒）"""
     return StepConfig(
         type=StepType.NAVIGATE,
+        selector=wait_selector,
         value=url,
         wait_time=wait_time,
         description=description or f"打开 {url}"
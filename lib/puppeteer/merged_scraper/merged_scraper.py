@@ -17,6 +17,12 @@ from puppeteer.universal_scraper import UniversalScraper, FieldConfig
 from .config import MergedScraperConfig, NavigationMode
 
 
+# 在浏览器端一次性取值：evaluate_all 不会等待元素出现，无匹配时返回空列表，
+# 因此一次往返即可同时完成"是否存在"判断和取值
+_FIRST_VALUE_JS = "(els, attr) => els.length ? (attr ? els[0].getAttribute(attr) : els[0].textContent) : null"
+_ALL_VALUES_JS = "(els, attr) => els.map(el => attr ? el.getAttribute(attr) : el.textContent)"
+
+
 class MergedScraper:
     """
     列表页与详情页合并抓取器
@@ -138,28 +144,15 @@ class MergedScraper:
         """
         locator = self.page.locator(field.selector)
         
-        # 检查元素是否存在
-        count = await locator.count()
-        if count == 0:
-            return None
-        
         # 提取多个值
         if field.multiple:
-            elements = await locator.all()
-            values = []
-            for elem in elements:
-                if field.attribute:
-                    val = await elem.get_attribute(field.attribute)
-                else:
-                    val = await elem.text_content()
-                values.append(val.strip() if val else None)
-            return values
+            values = await locator.evaluate_all(_ALL_VALUES_JS, field.attribute)
+            if not values:
+                return None
+            return [val.strip() if val else None for val in values]
         
-        # 提取单个值
-        if field.attribute:
-            value = await locator.first.get_attribute(field.attribute)
-        else:
-            value = await locator.first.text_content()
+        # 提取单个值（元素不存在时返回None）
+        value = await locator.evaluate_all(_FIRST_VALUE_JS, field.attribute)
         
         return value.strip() if value else None
     
@@ -198,7 +191,8 @@ class MergedScraper:
         self,
         list_item: Dict[str, Any],
         item_index: int,
-        page_num: int
+        page_num: int,
+        scraped_at: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         抓取单个列表项及其详情页数据（核心方法）
@@ -209,9 +203,11 @@ class MergedScraper:
         3. 原子性合并数据
         
         Args:
-            list_item: 列表项数据
+            list_item: 列表项数据（直接引用，不做拷贝；调用方不应再修改）
             item_index: 项在当前列表页的索引
             page_num: 列表页码
+            scraped_at: 抓取时间戳（ISO格式），默认取当前时间；
+                批量抓取时由调用方按列表页统一传入，避免逐项格式化
             
         Returns:
             合并后的数据记录
@@ -220,7 +216,7 @@ class MergedScraper:
         
         # 初始化合并记录
         merged_item = {
-            "list_data": list_item.copy(),  # 列表页数据
+            "list_data": list_item,  # 列表页数据
             "detail_data": {},  # 详情页数据（待填充）
             "metadata": {
                 "list_page": page_num,
@@ -228,7 +224,7 @@ class MergedScraper:
                 "detail_url": None,
                 "scrape_status": "pending",
                 "error_message": None,
-                "scraped_at": datetime.now().isoformat()
+                "scraped_at": scraped_at or datetime.now().isoformat()
             }
         }
         
@@ -301,7 +297,7 @@ class MergedScraper:
             page_num: 当前页码
             
         Returns:
-            当前页所有合并后的数据
+            当前页所有合并后的数据（同时已逐条追加到 self.merged_data）
         """
         print(f"\n📄 抓取列表页第 {page_num} 页...")
         
@@ -315,19 +311,24 @@ class MergedScraper:
         print(f"   找到 {len(list_items)} 个列表项")
         self.stats["total_list_items"] += len(list_items)
         
-        page_merged_data = []
+        page_merged_data: List[Any] = [None] * len(list_items)
+        
+        # 同一列表页的记录共用一个时间戳（秒级精度已足够）
+        scraped_at = datetime.now().isoformat(timespec="seconds")
         
         # 顺序处理每个列表项
         for index, list_item in enumerate(list_items):
             merged_item = await self.scrape_list_item_with_detail(
                 list_item=list_item,
                 item_index=index,
-                page_num=page_num
+                page_num=page_num,
+                scraped_at=scraped_at
             )
-            page_merged_data.append(merged_item)
+            page_merged_data[index] = merged_item
+            self.merged_data.append(merged_item)
             
             # 部分保存（可选）
-            if self.config.save_partial_results and len(page_merged_data) % 5 == 0:
+            if self.config.save_partial_results and (index + 1) % 5 == 0:
                 self._save_partial_results()
         
         return page_merged_data
@@ -359,8 +360,7 @@ class MergedScraper:
             
             # 抓取当前列表页及其详情
             try:
-                page_data = await self.scrape_current_list_page_with_details(current_page)
-                self.merged_data.extend(page_data)
+                await self.scrape_current_list_page_with_details(current_page)
                 
             except Exception as e:
                 print(f"\n❌ 列表页 {current_page} 抓取失败: {e}")
@@ -9,6 +9,24 @@ from langchain_community.agent_toolkits import PlayWrightBrowserToolkit
 from playwright.async_api import Browser
 
 
+# 每个项目返回 [名称, 链接, 描述, 语言, 今日星数, 总星数]，缺失字段为 null；
+# 总星数取星标图标的下一个兄弟元素
+_TRENDING_ROWS_JS = """(articles, limit) => articles.slice(0, limit).map(a => {
+    const text = sel => { const el = a.querySelector(sel); return el ? el.textContent : null; };
+    const link = a.querySelector("h2 a");
+    const star = a.querySelector("svg.octicon-star");
+    const total = star && star.nextElementSibling;
+    return [
+        link ? link.textContent : null,
+        link ? link.getAttribute("href") : null,
+        text("p.col-9"),
+        text("span[itemprop='programmingLanguage']"),
+        text("span.d-inline-block.float-sm-right"),
+        total ? total.textContent : null
+    ];
+})"""
+
+
 def get_browser_tools(browser: Browser) -> List[BaseTool]:
     """
     基于传入的 Browser 实例，创建并返回一系列浏览器工具。
@@ -23,6 +41,7 @@ def get_browser_tools(browser: Browser) -> List[BaseTool]:
         """
         Take a screenshot of the current page and save it to a file.
         Useful when the user asks to capture the screen or see the page.
+        The image format follows the file extension (.png or .jpg/.jpeg).
         """
         try:
             if not browser.contexts:
@@ -40,7 +59,10 @@ def get_browser_tools(browser: Browser) -> List[BaseTool]:
         func=None,
         coroutine=take_screenshot_func,
         name="take_screenshot",
-        description="Take a screenshot of the current page. Input should be a filename (e.g., 'home.png').",
+        description=(
+            "Take a screenshot of the current page. Input should be a filename (e.g., 'home.png'). "
+            "Use a .jpg filename for a much smaller file when lossless quality is not needed."
+        ),
     )
 
     # 3. 定义 GitHub Trending 专用工具
@@ -60,51 +82,25 @@ def get_browser_tools(browser: Browser) -> List[BaseTool]:
             # 等待页面加载
             await page.wait_for_selector("article.Box-row", timeout=10000)
             
-            # 提取所有项目
-            articles = await page.locator("article.Box-row").all()
+            # 提取所有项目：一次 evaluate_all 取回所有字段，每行打包为数组而非逐字段往返
+            rows = await page.locator("article.Box-row").evaluate_all(
+                _TRENDING_ROWS_JS, limit
+            )
             
             data = []
-            for i, article in enumerate(articles[:limit], 1):
-                try:
-                    # 项目名
-                    repo_elem = article.locator("h2 a")
-                    repo_name = await repo_elem.text_content() if await repo_elem.count() > 0 else "N/A"
-                    repo_name = repo_name.strip().replace("\n", "").replace("  ", "") if repo_name else "N/A"
-                    
-                    repo_url = await repo_elem.get_attribute("href") if await repo_elem.count() > 0 else "N/A"
-                    
-                    # 描述
-                    desc_elem = article.locator("p.col-9")
-                    description = await desc_elem.text_content() if await desc_elem.count() > 0 else "N/A"
-                    description = description.strip() if description else "N/A"
-                    
-                    # 语言
-                    lang_elem = article.locator("span[itemprop='programmingLanguage']")
-                    language = await lang_elem.text_content() if await lang_elem.count() > 0 else "N/A"
-                    
-                    # 今日星数
-                    stars_elem = article.locator("span.d-inline-block.float-sm-right")
-                    stars_today = await stars_elem.text_content() if await stars_elem.count() > 0 else "N/A"
-                    stars_today = stars_today.strip() if stars_today else "N/A"
-                    
-                    # 总星数
-                    total_stars_elem = article.locator("svg.octicon-star").locator("xpath=following-sibling::*[1]")
-                    total_stars = await total_stars_elem.text_content() if await total_stars_elem.count() > 0 else "N/A"
-                    total_stars = total_stars.strip() if total_stars else "N/A"
-                    
-                    data.append({
-                        "rank": i,
-                        "repository": repo_name,
-                        "url": f"https://github.com{repo_url}" if repo_url and not repo_url.startswith("http") else repo_url,
-                        "description": description,
-                        "language": language,
-                        "total_stars": total_stars,
-                        "stars_today": stars_today
-                    })
-                    
-                except Exception as e:
-                    print(f"⚠️ Skip item {i}: {e}")
-                    continue
+            for i, (repo_name, repo_url, description, language, stars_today, total_stars) in enumerate(rows, 1):
+                repo_name = repo_name.strip().replace("\n", "").replace("  ", "") if repo_name else "N/A"
+                repo_url = repo_url or "N/A"
+                
+                data.append({
+                    "rank": i,
+                    "repository": repo_name,
+                    "url": f"https://github.com{repo_url}" if repo_url and not repo_url.startswith("http") else repo_url,
+                    "description": description.strip() if description else "N/A",
+                    "language": language or "N/A",
+                    "total_stars": total_stars.strip() if total_stars else "N/A",
+                    "stars_today": stars_today.strip() if stars_today else "N/A"
+                })
             
             # 保存到 JSON
             output = {
@@ -0,0 +1,72 @@
+"""
+URL 分页抓取的自适应并发控制
+按目标站点的限流响应（429/503）和本机负载动态调整同时加载的页面数
+"""
+
+import os
+import time
+from typing import Optional
+
+
+def _system_load() -> Optional[float]:
+    """每个 CPU 的 1 分钟平均负载（不支持 getloadavg 的平台返回 None）"""
+    if not hasattr(os, "getloadavg"):
+        return None
+    return os.getloadavg()[0] / (os.cpu_count() or 1)
+
+
+class AutoscaledConcurrency:
+    """
+    自适应并发度（加性增、乘性减）
+    
+    - 页面成功加载且距上次调整超过 interval 秒：本机负载低于 target_load 时并发 +1，
+      高于时 -1
+    - 页面被限流（HTTP 429/503）：并发立即减半
+    
+    用法:
+        autoscale = AutoscaledConcurrency(min_concurrency=2, max_concurrency=20)
+        await scraper.scrape_with_url_params(url, "table", autoscale=autoscale)
+    """
+    
+    def __init__(
+        self,
+        min_concurrency: int = 2,
+        max_concurrency: int = 20,
+        target_load: float = 0.7,
+        interval: float = 2.0
+    ):
+        """
+        Args:
+            min_concurrency: 最小并发页数（也是初始并发）
+            max_concurrency: 最大并发页数
+            target_load: 每个 CPU 的目标平均负载
+            interval: 两次扩缩容之间的最短间隔（秒）
+        """
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.target_load = target_load
+        self.interval = interval
+        self.limit = self.min_concurrency
+        self._last_adjust = time.monotonic()
+    
+    def _set_limit(self, limit: int):
+        limit = min(self.max_concurrency, max(self.min_concurrency, limit))
+        self._last_adjust = time.monotonic()
+        if limit != self.limit:
+            print(f"   {'📈' if limit > self.limit else '📉'} 并发页数调整为 {limit}")
+            self.limit = limit
+    
+    def record_success(self):
+        """页面加载成功，按本机负载尝试调整并发"""
+        if time.monotonic() - self._last_adjust < self.interval:
+            return
+        
+        load = _system_load()
+        if load is not None and load > self.target_load:
+            self._set_limit(self.limit - 1)
+        else:
+            self._set_limit(self.limit + 1)
+    
+    def record_throttled(self):
+        """目标站点限流，并发减半"""
+        self._set_limit(self.limit // 2)
@@ -0,0 +1,432 @@
+"""
+基于原生 CDP（Chrome DevTools Protocol）的表格抓取
+直接通过一条 WebSocket 连接驱动 Chrome，绕过 Playwright 的跨浏览器协议适配层，
+适合仅需 导航 + 提取 HTML 的大批量 URL 分页抓取
+"""
+
+import os
+import orjson
+import asyncio
+import aiohttp
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Any, Tuple, Callable
+from playwright.async_api import TimeoutError as PlaywrightTimeout
+
+from browser.detector import find_chrome_cdp_url, get_browser_ws_url
+from .table_scraper import TableScraper, TableData, StreamingTableWriter, _BLOCKED_RESOURCE_TYPES
+
+
+# 等待表格出现并可见：MutationObserver 回调不受后台标签页定时器节流影响，
+# 超时后再检查一次
+_WAIT_TABLE_JS = """
+(sel, timeout) => new Promise(resolve => {
+    const check = () => {
+        const table = document.querySelector(sel);
+        if (!table) return false;
+        const rect = table.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 &&
+               getComputedStyle(table).visibility !== "hidden";
+    };
+    if (check()) return resolve(true);
+    const observer = new MutationObserver(() => {
+        if (check()) { observer.disconnect(); clearTimeout(timer); resolve(true); }
+    });
+    const timer = setTimeout(() => { observer.disconnect(); resolve(check()); }, timeout);
+    observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+})
+"""
+
+# Fetch 域按资源类型拦截的请求模式（CDP 资源类型名首字母大写）
+_BLOCKED_REQUEST_PATTERNS = [
+    {"resourceType": resource_type.capitalize(), "requestStage": "Request"}
+    for resource_type in sorted(_BLOCKED_RESOURCE_TYPES)
+]
+
+
+class CDPClient:
+    """浏览器级 CDP 连接（flatten 模式，所有标签页会话共用一条 WebSocket）"""
+    
+    def __init__(self, ws_url: str):
+        """
+        Args:
+            ws_url: 浏览器 WebSocket 地址（ws://host:port/devtools/browser/...）
+        """
+        self.ws_url = ws_url
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._next_id = 0
+        # 消息 id -> 等待响应的 future
+        self._pending: Dict[int, asyncio.Future] = {}
+        # (sessionId, 事件名) -> 等待该事件的 future
+        self._waiters: Dict[Tuple[Optional[str], str], List[asyncio.Future]] = {}
+        # (sessionId, 事件名) -> 回调(params, sessionId)；sessionId 为 None 时接收所有会话的事件
+        self._handlers: Dict[Tuple[Optional[str], str], Callable[[Dict[str, Any], Optional[str]], None]] = {}
+    
+    async def connect(self):
+        """建立 WebSocket 连接并启动消息读取任务"""
+        self._http = aiohttp.ClientSession()
+        # 整页 HTML 可能超过默认 4MB 的消息上限
+        self._ws = await self._http.ws_connect(self.ws_url, max_msg_size=0)
+        self._reader = asyncio.create_task(self._read_loop())
+    
+    async def send(
+        self,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """发送 CDP 命令并等待结果"""
+        if self._ws is None or self._ws.closed:
+            raise ConnectionError("CDP connection is closed")
+        
+        self._next_id += 1
+        message: Dict[str, Any] = {"id": self._next_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending[self._next_id] = future
+        await self._ws.send_str(orjson.dumps(message).decode())
+        return await future
+    
+    def wait_for_event(self, method: str, session_id: Optional[str] = None) -> asyncio.Future:
+        """返回在下一次收到该事件时完成的 future（须在触发操作之前调用）"""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault((session_id, method), []).append(future)
+        return future
+    
+    def on(
+        self,
+        method: str,
+        handler: Callable[[Dict[str, Any], Optional[str]], None],
+        session_id: Optional[str] = None
+    ):
+        """注册事件回调（指定 session_id 时只接收该会话的事件，优先于全局回调）"""
+        self._handlers[(session_id, method)] = handler
+    
+    def off(self, method: str, session_id: Optional[str] = None):
+        """移除事件回调"""
+        self._handlers.pop((session_id, method), None)
+    
+    async def _read_loop(self):
+        """分发命令响应和事件"""
+        assert self._ws is not None
+        try:
+            async for msg in self._ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                data = orjson.loads(msg.data)
+                
+                if "id" in data:
+                    future = self._pending.pop(data["id"], None)
+                    if future is None or future.done():
+                        continue
+                    if "error" in data:
+                        future.set_exception(RuntimeError(f"CDP error: {data['error'].get('message')}"))
+                    else:
+                        future.set_result(data.get("result", {}))
+                    continue
+                
+                method = data.get("method")
+                session_id = data.get("sessionId")
+                params = data.get("params", {})
+                for future in self._waiters.pop((session_id, method), ()):
+                    if not future.done():
+                        future.set_result(params)
+                handler = self._handlers.get((session_id, method)) or self._handlers.get((None, method))
+                if handler:
+                    handler(params, session_id)
+        finally:
+            # 连接断开：让仍在等待的命令和事件立即失败
+            error = ConnectionError("CDP connection closed")
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            for futures in self._waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+            self._pending.clear()
+            self._waiters.clear()
+    
+    async def close(self):
+        """关闭连接"""
+        if self._ws is not None:
+            await self._ws.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+        if self._http is not None:
+            await self._http.close()
+
+
+@dataclass(slots=True)
+class CDPResponse:
+    """主文档响应（与 Playwright Response 的 status/headers 对应，头名称为小写）"""
+    status: int
+    headers: Dict[str, str]
+
+
+class CDPPage:
+    """
+    CDP 标签页会话
+    
+    goto/wait_for_selector/content/is_closed 与 Playwright Page 的同名方法行为一致，
+    可直接交给 TableScraper 的 URL 分页流程使用（goto 返回主文档响应，可据此识别限流）。
+    """
+    
+    def __init__(self, client: CDPClient, target_id: str, session_id: str):
+        self.client = client
+        self.target_id = target_id
+        self.session_id = session_id
+        self._closed = False
+        # loaderId -> 主框架文档响应（每次 goto 后清空）
+        self._document_responses: Dict[str, CDPResponse] = {}
+    
+    @classmethod
+    async def create(cls, client: CDPClient) -> "CDPPage":
+        """新建空白标签页并附加会话"""
+        target = await client.send("Target.createTarget", {"url": "about:blank"})
+        target_id = target["targetId"]
+        attached = await client.send(
+            "Target.attachToTarget", {"targetId": target_id, "flatten": True}
+        )
+        page = cls(client, target_id, attached["sessionId"])
+        client.on("Network.responseReceived", page._on_response_received, page.session_id)
+        await page.send("Page.enable")
+        await page.send("Network.enable")
+        return page
+    
+    def _on_response_received(self, params: Dict[str, Any], session_id: Optional[str]):
+        """记录主框架（frameId 与 targetId 相同）的文档响应"""
+        if params.get("type") != "Document" or params.get("frameId") != self.target_id:
+            return
+        response = params["response"]
+        self._document_responses[params["loaderId"]] = CDPResponse(
+            status=response["status"],
+            headers={k.lower(): v for k, v in response.get("headers", {}).items()}
+        )
+    
+    async def send(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """在当前会话上发送 CDP 命令"""
+        return await self.client.send(method, params, self.session_id)
+    
+    async def goto(
+        self,
+        url: str,
+        wait_until: str = "domcontentloaded",
+        timeout: float = 30000
+    ) -> Optional[CDPResponse]:
+        """
+        导航并等待 DOMContentLoaded（wait_until="load" 时等待 load 事件）
+        
+        Returns:
+            主文档响应；页内跳转等没有文档请求的导航返回 None
+        """
+        event = "Page.loadEventFired" if wait_until == "load" else "Page.domContentEventFired"
+        loaded = self.client.wait_for_event(event, self.session_id)
+        self._document_responses.clear()
+        result = await self.send("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            loaded.cancel()
+            raise RuntimeError(f"Navigation to {url} failed: {result['errorText']}")
+        try:
+            await asyncio.wait_for(loaded, timeout / 1000)
+        except asyncio.TimeoutError:
+            raise PlaywrightTimeout(f"Timeout {timeout}ms exceeded navigating to {url}")
+        response = self._document_responses.get(result.get("loaderId"))
+        self._document_responses.clear()
+        return response
+    
+    async def evaluate(self, expression: str, await_promise: bool = False) -> Any:
+        """执行表达式并返回其 JSON 值"""
+        result = await self.send("Runtime.evaluate", {
+            "expression": expression,
+            "returnByValue": True,
+            "awaitPromise": await_promise
+        })
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            raise RuntimeError(details.get("exception", {}).get("description") or details.get("text"))
+        return result["result"].get("value")
+    
+    async def wait_for_selector(self, selector: str, state: str = "visible", timeout: float = 30000):
+        """等待元素可见，超时抛出 PlaywrightTimeout（仅支持 state="visible"）"""
+        args = orjson.dumps([selector, timeout]).decode()[1:-1]
+        if not await self.evaluate(f"({_WAIT_TABLE_JS})({args})", await_promise=True):
+            raise PlaywrightTimeout(f"Timeout {timeout}ms exceeded waiting for {selector}")
+    
+    async def content(self) -> str:
+        """获取页面完整 HTML"""
+        return await self.evaluate("document.documentElement.outerHTML")
+    
+    def is_closed(self) -> bool:
+        return self._closed
+    
+    async def close(self):
+        """关闭标签页"""
+        if self._closed:
+            return
+        self._closed = True
+        self.client.off("Network.responseReceived", self.session_id)
+        try:
+            await self.client.send("Target.closeTarget", {"targetId": self.target_id})
+        except (ConnectionError, RuntimeError):
+            pass
+
+
+class CDPTableScraper(TableScraper):
+    """
+    原生 CDP 表格提取器
+    
+    连接已开启远程调试的 Chrome（CDP_URL 环境变量或自动检测端口），
+    支持单页提取（scrape_page）和 URL 参数分页（scrape_with_url_params，含并发）。
+    按钮分页等需要元素交互的场景请使用 TableScraper。
+    
+    用法:
+        async with CDPTableScraper() as scraper:
+            await scraper.scrape_with_url_params(base_url, "table")
+            scraper.save_to_csv("data.csv")
+    """
+    
+    def __init__(
+        self,
+        cdp_url: Optional[str] = None,
+        cdp_ports: list[int] = [9222, 9223, 9224],
+        cache_ttl: float = 300.0,
+        block_assets: bool = True,
+        deduplicate: bool = True,
+        writer: Optional[StreamingTableWriter] = None
+    ):
+        """
+        初始化 CDP 表格提取器
+        
+        Args:
+            cdp_url: CDP 地址（http://host:port 或浏览器 ws:// 地址），为空时自动检测
+            cdp_ports: 自动检测的 CDP 端口列表
+            cache_ttl: URL 分页页面 HTML 缓存有效期（秒），0 表示不缓存
+            block_assets: 是否通过 Fetch 域拦截图片、字体、音视频请求
+            deduplicate: 合并/保存时是否去掉跨页重复的行
+            writer: 流式写入器，设置后每页数据立即写盘
+        """
+        # 静态资源内存缓存依赖 Playwright route，CDP 引擎不启用
+        super().__init__(
+            page=None,
+            cache_ttl=cache_ttl,
+            cache_assets=False,
+            block_assets=block_assets,
+            deduplicate=deduplicate,
+            writer=writer
+        )
+        self.cdp_url = os.getenv("CDP_URL") or cdp_url
+        self.cdp_ports = cdp_ports
+        self.client: Optional[CDPClient] = None
+    
+    async def __aenter__(self):
+        await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+    
+    async def start(self):
+        """连接 Chrome 并打开工作标签页"""
+        if not self.cdp_url:
+            print("🔍 Auto-detecting Chrome CDP endpoint...")
+            self.cdp_url = await find_chrome_cdp_url(self.cdp_ports)
+            if not self.cdp_url:
+                raise ConnectionError(
+                    "❌ No Chrome instance found with remote debugging enabled.\n"
+                    "💡 Start Chrome with: chrome.exe --remote-debugging-port=9222\n"
+                    f"   Tried ports: {self.cdp_ports}"
+                )
+        
+        ws_url = await get_browser_ws_url(self.cdp_url)
+        if not ws_url:
+            raise ConnectionError(f"Failed to get browser WebSocket URL from {self.cdp_url}")
+        
+        self.client = CDPClient(ws_url)
+        await self.client.connect()
+        self.client.on("Fetch.requestPaused", self._handle_request_paused)
+        self.page = await CDPPage.create(self.client)
+        print(f"✅ Connected to Chrome via CDP: {ws_url}")
+    
+    async def close(self):
+        """关闭工作标签页和 CDP 连接（不关闭 Chrome）"""
+        if self.page is not None:
+            await self.page.close()
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+    
+    def _handle_request_paused(self, params: Dict[str, Any], session_id: Optional[str]):
+        """被 Fetch 拦截的请求（只匹配被屏蔽的资源类型）直接判定失败"""
+        asyncio.create_task(self._fail_request(params["requestId"], session_id))
+    
+    async def _fail_request(self, request_id: str, session_id: Optional[str]):
+        try:
+            await self.client.send(
+                "Fetch.failRequest",
+                {"requestId": request_id, "errorReason": "BlockedByClient"},
+                session_id
+            )
+        except (ConnectionError, RuntimeError):
+            # 标签页已关闭或连接已断开
+            pass
+    
+    @asynccontextmanager
+    async def _routed(self, page: CDPPage):
+        """抓取期间为标签页启用 Fetch 拦截，结束后关闭"""
+        if not self.block_assets or page in self._routed_pages:
+            yield page
+            return
+        
+        await page.send("Fetch.enable", {"patterns": _BLOCKED_REQUEST_PATTERNS})
+        self._routed_pages.add(page)
+        try:
+            yield page
+        finally:
+            self._routed_pages.discard(page)
+            if not page.is_closed():
+                await page.send("Fetch.disable")
+    
+    async def _fetch_in_new_page(
+        self,
+        url: str,
+        table_selector: str,
+        wait_time: float,
+        force_rescrape: bool
+    ) -> Optional[str]:
+        """在新标签页中获取 HTML，用完即关"""
+        page = await CDPPage.create(self.client)
+        try:
+            async with self._routed(page):
+                return await self._fetch_table_html(page, url, table_selector, wait_time, force_rescrape)
+        finally:
+            await page.close()
+    
+    async def scrape_page(
+        self,
+        url: str,
+        table_selector: str = "table",
+        wait_time: float = 0.0
+    ) -> Optional[TableData]:
+        """
+        抓取单个页面的表格
+        
+        Returns:
+            TableData；表格不存在时返回 None
+        """
+        print(f"🌐 访问: {url}")
+        async with self._routed(self.page):
+            html = await self._fetch_table_html(self.page, url, table_selector, wait_time, False)
+        
+        if html is None:
+            print(f"❌ 表格不存在: {table_selector}")
+            return None
+        
+        data = self._table_data_from_html(html, table_selector)
+        self.add_page(data)
+        print(f"   ✓ 提取 {data.total_rows} 行数据")
+        return data
@@ -37,8 +37,7 @@ async def example_button_pagination():
         await scraper.scrape_with_button_pagination(
             table_selector="table.product-list",  # 表格选择器
             next_button_selector="button.next-page",  # 下一页按钮
-            max_pages=5,  # 最多抓取 5 页
-            wait_time=2.0  # 每页等待 2 秒
+            max_pages=5  # 最多抓取 5 页（翻页后自动等待表格内容更新）
         )
         
         # 3. 保存数据
@@ -72,8 +71,7 @@ async def example_number_pagination():
         await scraper.scrape_with_page_numbers(
             table_selector="table#articles",
             page_number_selector="a[data-page='{page}']",  # {page} 会被替换
-            max_pages=10,
-            wait_time=1.5
+            max_pages=10
         )
         
         # 3. 保存数据
@@ -180,19 +178,17 @@ async def example_github_trending():
                 repo_name = await article.locator("h2 a").text_content()
                 repo_name = repo_name.strip().replace("\n", "").replace("  ", "")
                 
-                # 提取描述
-                desc_elem = article.locator("p")
-                description = await desc_elem.text_content() if await desc_elem.count() > 0 else "N/A"
+                # 提取描述（evaluate_all 不等待元素，一次往返代替 count() + text_content()）
+                first_text = "els => els.length ? els[0].textContent : null"
+                description = await article.locator("p").evaluate_all(first_text)
                 description = description.strip() if description else "N/A"
                 
                 # 提取语言
-                lang_elem = article.locator("span[itemprop='programmingLanguage']")
-                language = await lang_elem.text_content() if await lang_elem.count() > 0 else "N/A"
+                language = await article.locator("span[itemprop='programmingLanguage']").evaluate_all(first_text) or "N/A"
                 
                 # 提取今日星数
-                stars_elem = article.locator("span.float-sm-right")
-                stars = await stars_elem.text_content() if await stars_elem.count() > 0 else "N/A"
-                stars = stars.strip()
+                stars = await article.locator("span.float-sm-right").evaluate_all(first_text)
+                stars = stars.strip() if stars else "N/A"
                 
                 rows.append([str(i), repo_name, description, language, stars])
                 
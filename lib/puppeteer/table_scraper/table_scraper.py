@@ -3,16 +3,150 @@
 支持多种分页方式和表格格式
 """
 
-import json
+import re
 import csv
-from typing import List, Dict, Optional, Any
+import orjson
+import time
+import xxhash
+from itertools import chain
+from collections import deque, OrderedDict
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from typing import List, Dict, Optional, Any, Tuple, Iterable, Iterator, Callable, Awaitable, Deque
 from dataclasses import dataclass, asdict
-from playwright.async_api import Page, Locator
-from bs4 import BeautifulSoup
+from playwright.async_api import Page, Locator, Route, TimeoutError as PlaywrightTimeout
+from bs4 import BeautifulSoup, SoupStrainer
 import asyncio
 
+from .autoscale import AutoscaledConcurrency
 
-@dataclass
+
+# 在所有匹配的表格元素内提取表头与单元格文本（textContent，与 all_text_contents 一致）。
+# 表头和表体分属不同 <table> 的固定表头表格（Element、Ant Design 等）按文档顺序合并；
+# 去空白、过滤空表头和空行都在浏览器端完成，Python 侧无需再遍历
+_EXTRACT_TABLE_JS = """
+(tables, sel) => {
+    const text = el => (el.textContent || "").trim();
+    const within = selector => Array.from(document.querySelectorAll(selector))
+        .filter(el => tables.some(table => table.contains(el)));
+    return {
+        headers: within(sel.headers).map(text).filter(Boolean),
+        rows: within(sel.rows)
+            .map(row => Array.from(row.querySelectorAll(sel.cells), text))
+            .filter(cells => cells.length)
+    };
+}
+"""
+
+# 结果文件写入缓冲区大小
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# csv.writer 默认的行结束符，以及（除分隔符外）需要加引号转义的字符
+_CSV_LINE_TERMINATOR = "\r\n"
+_CSV_SPECIAL_RE = re.compile(r'["\r\n]')
+
+# 抓表格用不到的资源类型（不含 stylesheet：翻页按钮的可见/可用判断依赖 CSS）
+_BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# 可在会话内复用的静态资源类型（启用 route 后浏览器 HTTP 缓存失效，由内存缓存代替）
+_CACHEABLE_RESOURCE_TYPES = {"script", "stylesheet", "image", "font"}
+
+# 静态资源内存缓存的总字节上限，超出后按最近最少使用淘汰
+_ASSET_CACHE_MAX_BYTES = 64 << 20
+
+# 翻页前在页面内记录所有匹配表格的文本快照（保存在 window 上，不回传 Python）；
+# 固定表头表格翻页时只有表体所在的 <table> 变化，因此不能只看第一个
+_SNAPSHOT_TABLE_JS = """
+(sel) => {
+    const tables = document.querySelectorAll(sel);
+    window.__tableScraperSnapshot = tables.length
+        ? Array.from(tables, table => table.textContent).join("\\u0000")
+        : null;
+}
+"""
+
+# 表格存在且文本与快照不同，视为新一页已渲染
+_TABLE_CHANGED_JS = """
+(sel) => {
+    const tables = document.querySelectorAll(sel);
+    return tables.length > 0 &&
+           Array.from(tables, table => table.textContent).join("\\u0000") !== window.__tableScraperSnapshot;
+}
+"""
+
+# 一次往返取得翻页元素的可见/可用状态（evaluate_all 不等待，元素不存在时均为 false）
+_ELEMENT_STATE_JS = """
+(els) => {
+    const el = els[0];
+    if (!el) return {visible: false, enabled: false};
+    const rect = el.getBoundingClientRect();
+    const visible = rect.width > 0 && rect.height > 0 &&
+                    getComputedStyle(el).visibility !== "hidden";
+    const enabled = !el.matches(":disabled") && el.getAttribute("aria-disabled") !== "true";
+    return {visible, enabled};
+}
+"""
+
+# 目标站点限流的响应状态码，以及被限流页面的最大重试次数
+_THROTTLE_STATUSES = {429, 503}
+_MAX_THROTTLE_RETRIES = 3
+
+# 简单选择器：可选标签名 + 可选 #id + 任意个 .class（如 "table#data.list"）
+_SIMPLE_SELECTOR_RE = re.compile(r"^([a-zA-Z][\w-]*)?(?:#([\w-]+))?((?:\.[\w-]+)*)$")
+
+
+def _build_table_strainer(table_selector: str) -> Optional[SoupStrainer]:
+    """
+    根据表格选择器构造 SoupStrainer，只解析目标表格子树
+    
+    复合/后代选择器无法用 SoupStrainer 表达，返回 None（解析整页）。
+    strainer 只做粗筛，最终仍由 select(table_selector) 精确匹配。
+    """
+    match = _SIMPLE_SELECTOR_RE.match(table_selector.strip())
+    if not match or not any(match.groups()):
+        return None
+    
+    tag, element_id, classes = match.groups()
+    attrs = {}
+    if element_id:
+        attrs["id"] = element_id
+    if classes:
+        attrs["class"] = classes.split(".")[1]
+    
+    return SoupStrainer(name=tag.lower() if tag else None, attrs=attrs)
+
+
+def _canonicalize_url(url: str) -> str:
+    """
+    规范化 URL 作为缓存键：查询参数排序
+    
+    保留锚点：hash 路由的页面（如 https://x.com/app#/list?page=2）页码参数在锚点里，
+    去掉锚点会让所有页共用同一个缓存键
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, parts.fragment))
+
+
+class PageThrottled(Exception):
+    """页面请求被目标站点限流（HTTP 429/503）"""
+    
+    def __init__(self, url: str, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status}: {url}")
+        self.url = url
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 响应头（只支持秒数形式）"""
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+@dataclass(slots=True)
 class TableData:
     """表格数据结构"""
     headers: List[str]
@@ -21,7 +155,152 @@ class TableData:
     total_rows: int
 
 
-@dataclass
+class StreamingTableWriter:
+    """
+    边抓取边写盘的表格写入器（按文件扩展名选择 CSV / JSON / Parquet）
+    
+    每页数据到达后立即写入文件，内存占用与总页数无关。
+    JSON 格式与 save_to_json 相同，但 metadata 放在 data 之后（写完才知道总行数）。
+    Parquet 每页写一个 RecordBatch（所有列为字符串），需要安装 pyarrow。
+    
+    用法:
+        with StreamingTableWriter("data.csv") as writer:
+            scraper = TableScraper(page, writer=writer)
+            await scraper.scrape_with_url_params(...)
+    """
+    
+    def __init__(self, filename: str, deduplicate: bool = True):
+        """
+        Args:
+            filename: 输出文件名（.json 写 JSON，.parquet 写 Parquet，其余写 CSV）
+            deduplicate: 是否跳过跨页重复的行（只保存行哈希）
+        """
+        self.filename = filename
+        self.format = (
+            "json" if filename.endswith(".json")
+            else "parquet" if filename.endswith(".parquet")
+            else "csv"
+        )
+        self.deduplicate = deduplicate
+        self.headers: Optional[List[str]] = None
+        self.total_pages = 0
+        self.total_rows = 0
+        self._seen: set = set()
+        self._closed = False
+        
+        if self.format == "json":
+            self._file = open(filename, 'wb', buffering=_WRITE_BUFFER_SIZE)
+            self._file.write(b'{\n  "data": [')
+        elif self.format == "parquet":
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("Writing Parquet requires pyarrow. Install with: pip install pyarrow")
+            self._pa, self._pq = pa, pq
+            # 表头在第一页到达后才确定，届时再创建 ParquetWriter
+            self._parquet_writer = None
+        else:
+            self._file = open(filename, 'w', newline='', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE)
+            self._csv = csv.writer(self._file)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def write_page(self, data: TableData):
+        """写入一页数据（表头以第一页为准）"""
+        if self.headers is None:
+            self.headers = data.headers
+            if self.format == "csv":
+                self._csv.writerow(self.headers)
+        self.total_pages += 1
+        
+        rows: Iterable[List[str]] = data.rows
+        if self.deduplicate:
+            rows = self._unseen_rows(rows)
+        
+        if self.format == "json":
+            headers = self.headers
+            write = self._file.write
+            for row in rows:
+                write(b',\n    ' if self.total_rows else b'\n    ')
+                write(orjson.dumps(dict(zip(headers, row))))
+                self.total_rows += 1
+        elif self.format == "parquet":
+            rows = list(rows)
+            if rows:
+                self._write_record_batch(rows)
+            self.total_rows += len(rows)
+        else:
+            rows = list(rows)
+            self._csv.writerows(rows)
+            self.total_rows += len(rows)
+    
+    def _write_record_batch(self, rows: List[List[str]]):
+        """按列构造一页的 RecordBatch 并写入（行比表头短时补 null，多出的单元格丢弃）"""
+        pa = self._pa
+        if self._parquet_writer is None:
+            # 没有表头时按第一行的列数生成列名
+            names = self.headers or [f"column_{i + 1}" for i in range(len(rows[0]))]
+            schema = pa.schema([(name, pa.string()) for name in names])
+            self._parquet_writer = self._pq.ParquetWriter(self.filename, schema)
+        
+        schema = self._parquet_writer.schema
+        width = len(schema.names)
+        if all(len(row) == width for row in rows):
+            columns = [list(column) for column in zip(*rows)]
+        else:
+            columns = [[row[i] if i < len(row) else None for row in rows] for i in range(width)]
+        
+        arrays = [pa.array(column, type=pa.string()) for column in columns]
+        self._parquet_writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+    
+    def _unseen_rows(self, rows: Iterable[List[str]]) -> Iterator[List[str]]:
+        """过滤已写入过的行（按行内容哈希判断，与 TableScraper 去重一致）"""
+        seen = self._seen
+        for row in rows:
+            key = xxhash.xxh3_64_intdigest("\x1f".join(row))
+            if key in seen:
+                continue
+            seen.add(key)
+            yield row
+    
+    def close(self):
+        """写入结尾（JSON 的 metadata）并关闭文件"""
+        if self._closed:
+            return
+        self._closed = True
+        
+        if self.format == "json":
+            metadata = {
+                "total_pages": self.total_pages,
+                "total_rows": self.total_rows,
+                "headers": self.headers or []
+            }
+            self._file.write(b'\n  ],\n  "metadata": ' if self.total_rows else b'],\n  "metadata": ')
+            self._file.write(orjson.dumps(metadata))
+            self._file.write(b'\n}\n')
+            self._file.close()
+        elif self.format == "parquet":
+            if self._parquet_writer is not None:
+                self._parquet_writer.close()
+            else:
+                # 没有任何数据行时仍写出只有表头的空文件
+                pa = self._pa
+                schema = pa.schema([(name, pa.string()) for name in self.headers or []])
+                self._pq.write_table(schema.empty_table(), self.filename)
+        else:
+            self._file.close()
+        
+        print(f"💾 数据已保存到: {self.filename}")
+        print(f"   总页数: {self.total_pages}")
+        print(f"   总行数: {self.total_rows}")
+
+
+@dataclass(slots=True)
 class PaginationConfig:
     """分页配置"""
     # 分页类型: "button" | "number" | "infinite_scroll" | "url_param"
@@ -46,52 +325,114 @@ class PaginationConfig:
 class TableScraper:
     """表格数据提取器"""
     
-    def __init__(self, page: Page):
+    def __init__(
+        self,
+        page: Page,
+        cache_ttl: float = 300.0,
+        cache_assets: bool = True,
+        block_assets: bool = True,
+        deduplicate: bool = True,
+        writer: Optional[StreamingTableWriter] = None
+    ):
         """
         初始化表格提取器
         
         Args:
             page: Playwright 页面对象
+            cache_ttl: URL 分页页面 HTML 缓存有效期（秒），0 表示不缓存
+            cache_assets: 分页抓取期间是否在内存中缓存静态资源（JS/CSS/图片/字体），
+                包括 404 响应，翻页时不再重复请求（总大小有上限，按最近最少使用淘汰）
+            block_assets: 分页抓取期间是否拦截图片、字体、音视频请求
+            deduplicate: 合并/保存时是否去掉跨页重复的行（翻页边界常出现重复数据）
+            writer: 流式写入器。设置后每页数据提取后立即写盘，all_data 只保留
+                各页的表头和行数（不含行数据），无需再调用 save_to_csv/save_to_json
         """
         self.page = page
         self.all_data: List[TableData] = []
+        self.cache_ttl = cache_ttl
+        self.cache_assets = cache_assets
+        self.block_assets = block_assets
+        self.deduplicate = deduplicate
+        self.writer = writer
+        # 规范化 URL -> (缓存时间, HTML)
+        self._html_cache: Dict[str, Tuple[float, str]] = {}
+        # 资源 URL -> route.fulfill 参数（按最近使用排序，总大小不超过 _ASSET_CACHE_MAX_BYTES）
+        self._asset_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._asset_cache_bytes = 0
+        # 已安装请求拦截的页面（嵌套使用时不重复安装）
+        self._routed_pages: set = set()
     
     async def extract_table(
         self,
         table_selector: str = "table",
         headers_selector: str = "thead th",
         rows_selector: str = "tbody tr",
-        cells_selector: str = "td"
+        cells_selector: str = "td",
+        use_lxml: bool = False,
+        ajax_url_pattern: Optional[str] = None,
+        trigger: Optional[Callable[[], Awaitable[Any]]] = None
     ) -> TableData:
         """
         提取当前页表格数据
         
         Args:
             table_selector: 表格选择器
-            headers_selector: 表头选择器
-            rows_selector: 行选择器
-            cells_selector: 单元格选择器
+            headers_selector: 表头选择器（在表格内查找）
+            rows_selector: 行选择器（在表格内查找）
+            cells_selector: 单元格选择器（在行内查找）
+            use_lxml: 是否改为获取一次页面 HTML 快照，在本地用 lxml 解析
+                （适合静态大表格；单元格依赖 JS 渲染时保持默认 False）
+            ajax_url_pattern: 表格数据接口 URL 片段。设置后不再等待/解析 DOM，
+                而是等待匹配的 XHR/fetch 响应，直接从其 JSON 构造表格
+            trigger: 触发数据请求的操作（如点击下一页），仅在设置
+                ajax_url_pattern 时使用；为空时等待下一个匹配的响应
             
         Returns:
             TableData: 表格数据对象
         """
-        # 等待表格加载
-        await self.page.wait_for_selector(table_selector, timeout=10000)
+        if ajax_url_pattern:
+            # 事件驱动：先注册响应监听再执行触发操作，避免错过响应
+            async with self.page.expect_response(
+                lambda response: ajax_url_pattern in response.url, timeout=10000
+            ) as response_info:
+                if trigger:
+                    await trigger()
+            response = await response_info.value
+            return self._table_data_from_json(await response.json())
         
-        # 提取表头
-        headers = await self.page.locator(headers_selector).all_text_contents()
-        headers = [h.strip() for h in headers if h.strip()]
+        if trigger:
+            await trigger()
         
-        # 提取行数据
-        rows = []
-        row_elements = await self.page.locator(rows_selector).all()
+        # 等待表格加载
+        await self.page.wait_for_selector(table_selector, timeout=10000)
         
-        for row_element in row_elements:
-            cells = await row_element.locator(cells_selector).all_text_contents()
-            cells = [c.strip() for c in cells]
-            if cells:  # 跳过空行
-                rows.append(cells)
+        if use_lxml:
+            html = await self.page.content()
+            return self._table_data_from_html(
+                html, table_selector, headers_selector, rows_selector, cells_selector
+            )
         
+        # 在浏览器端一次性提取所有匹配表格的表头和行（单次往返，替代逐行 await）
+        result = await self.page.locator(table_selector).evaluate_all(
+            _EXTRACT_TABLE_JS,
+            {"headers": headers_selector, "rows": rows_selector, "cells": cells_selector}
+        )
+        return self._make_table_data(result["headers"], result["rows"])
+    
+    def add_page(self, data: TableData):
+        """记录一页数据（设置了 writer 时写盘并丢弃行数据）"""
+        if self.writer is not None:
+            self.writer.write_page(data)
+            data = TableData(
+                headers=data.headers,
+                rows=[],
+                page_number=data.page_number,
+                total_rows=data.total_rows
+            )
+        self.all_data.append(data)
+    
+    def _make_table_data(self, headers: List[str], rows: List[List[str]]) -> TableData:
+        """构造 TableData（headers/rows 须已过滤空表头和空行）"""
         return TableData(
             headers=headers,
             rows=rows,
@@ -99,130 +440,398 @@ class TableScraper:
             total_rows=len(rows)
         )
     
+    def _table_data_from_json(self, payload: Any) -> TableData:
+        """
+        从接口 JSON 构造 TableData
+        
+        支持记录数组（[{...}, ...] 或 [[...], ...]），
+        以及把记录数组放在某个字段中的对象（如 {"data": [...], "total": 100}）。
+        对象记录以首条记录的键作为表头。
+        """
+        records = payload
+        if isinstance(payload, dict):
+            records = next((value for value in payload.values() if isinstance(value, list)), [])
+        
+        if not records:
+            return self._make_table_data([], [])
+        
+        def cell(value: Any) -> str:
+            return "" if value is None else str(value).strip()
+        
+        if isinstance(records[0], dict):
+            headers = list(records[0])
+            rows = [[cell(record.get(key)) for key in headers] for record in records]
+        else:
+            headers = []
+            rows = [[cell(value) for value in record] for record in records]
+        
+        return self._make_table_data(headers, rows)
+    
+    def _table_data_from_html(
+        self,
+        html: str,
+        table_selector: str,
+        headers_selector: str = "thead th",
+        rows_selector: str = "tbody tr",
+        cells_selector: str = "td"
+    ) -> TableData:
+        """从 HTML 快照构造 TableData"""
+        headers, rows = self._parse_table_html(
+            html, table_selector, headers_selector, rows_selector, cells_selector
+        )
+        return self._make_table_data(headers, rows)
+    
+    def _get_cached_html(self, url: str) -> Optional[str]:
+        """读取未过期的 HTML 缓存"""
+        entry = self._html_cache.get(_canonicalize_url(url))
+        if entry is None:
+            return None
+        cached_at, html = entry
+        if time.monotonic() - cached_at > self.cache_ttl:
+            return None
+        return html
+    
+    def _cache_html(self, url: str, html: str):
+        """写入 HTML 缓存"""
+        if self.cache_ttl > 0:
+            self._html_cache[_canonicalize_url(url)] = (time.monotonic(), html)
+    
+    def clear_cache(self):
+        """清空 HTML 缓存和静态资源缓存"""
+        self._html_cache.clear()
+        self._asset_cache.clear()
+        self._asset_cache_bytes = 0
+    
+    def _cache_asset(self, url: str, entry: Dict[str, Any]):
+        """写入静态资源缓存，超出字节上限时淘汰最久未使用的资源"""
+        size = len(entry["body"])
+        if size > _ASSET_CACHE_MAX_BYTES:
+            return
+        old = self._asset_cache.pop(url, None)
+        if old is not None:
+            self._asset_cache_bytes -= len(old["body"])
+        self._asset_cache[url] = entry
+        self._asset_cache_bytes += size
+        while self._asset_cache_bytes > _ASSET_CACHE_MAX_BYTES:
+            _, evicted = self._asset_cache.popitem(last=False)
+            self._asset_cache_bytes -= len(evicted["body"])
+    
+    async def _handle_route(self, route: Route):
+        """拦截请求：无用资源直接中止；静态资源命中缓存直接返回，未命中则请求后写入缓存"""
+        request = route.request
+        if self.block_assets and request.resource_type in _BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+            return
+        
+        if not self.cache_assets or request.method != "GET" or request.resource_type not in _CACHEABLE_RESOURCE_TYPES:
+            await route.continue_()
+            return
+        
+        cached = self._asset_cache.get(request.url)
+        if cached is not None:
+            self._asset_cache.move_to_end(request.url)
+            await route.fulfill(**cached)
+            return
+        
+        try:
+            response = await route.fetch()
+            body = await response.body()
+        except Exception:
+            # 请求失败（DNS、拒绝连接、超时等）交还浏览器处理，避免请求一直挂起
+            await route.continue_()
+            return
+        cache_control = response.headers.get("cache-control", "")
+        # 成功响应和 404（负缓存）都缓存，no-store 除外
+        if response.status in (200, 404) and "no-store" not in cache_control:
+            # body 已解码，去掉编码/长度头以免回放时浏览器重复解码
+            headers = {
+                k: v for k, v in response.headers.items()
+                if k.lower() not in ("content-encoding", "content-length")
+            }
+            self._cache_asset(request.url, {
+                "status": response.status,
+                "headers": headers,
+                "body": body
+            })
+        await route.fulfill(response=response, body=body)
+    
+    @asynccontextmanager
+    async def _routed(self, page: Page):
+        """在抓取期间为页面安装请求拦截，结束后移除（已安装时直接复用）"""
+        if not (self.cache_assets or self.block_assets) or page in self._routed_pages:
+            yield page
+            return
+        
+        await page.route("**/*", self._handle_route)
+        self._routed_pages.add(page)
+        try:
+            yield page
+        finally:
+            self._routed_pages.discard(page)
+            if not page.is_closed():
+                await page.unroute("**/*", self._handle_route)
+    
+    def intercept_requests(self, page: Optional[Page] = None):
+        """
+        在 async with 块内为页面启用请求拦截（按 block_assets/cache_assets 配置）
+        
+        分页抓取方法会自动启用；首次导航等在抓取方法之外的请求可用它包裹，
+        例如：async with scraper.intercept_requests(): await page.goto(url)
+        """
+        return self._routed(page or self.page)
+    
+    @staticmethod
+    def _parse_table_html(
+        html: str,
+        table_selector: str,
+        headers_selector: str,
+        rows_selector: str,
+        cells_selector: str
+    ) -> Tuple[List[str], List[List[str]]]:
+        """
+        用 lxml 解析 HTML 快照，提取表头和行数据
+        
+        Returns:
+            (表头列表, 行数据列表)，已过滤空表头和空行；找不到表格时均为空。
+            有多个匹配表格时（如表头和表体分属不同 <table> 的固定表头表格）按文档顺序合并
+        """
+        soup = BeautifulSoup(html, "lxml", parse_only=_build_table_strainer(table_selector))
+        tables = soup.select(table_selector)
+        
+        def within(selector: str) -> List[Any]:
+            # 嵌套表格同时匹配时，同一元素只取一次
+            seen = set()
+            elements = []
+            for table in tables:
+                for el in table.select(selector):
+                    if id(el) not in seen:
+                        seen.add(id(el))
+                        elements.append(el)
+            return elements
+        
+        headers = [text for th in within(headers_selector) if (text := th.get_text().strip())]
+        rows = [
+            cells for row in within(rows_selector)
+            if (cells := [cell.get_text().strip() for cell in row.select(cells_selector)])
+        ]  # 跳过空行
+        return headers, rows
+    
+    async def _click_and_wait_for_table(
+        self,
+        target: Locator,
+        table_selector: str,
+        wait_time: float,
+        timeout: float = 10000
+    ) -> bool:
+        """
+        点击翻页元素，并等待表格内容发生变化
+        
+        Args:
+            target: 要点击的按钮/页码
+            table_selector: 表格选择器
+            wait_time: 内容变化后的额外等待时间（秒）
+            timeout: 等待内容变化的超时时间（毫秒）
+            
+        Returns:
+            表格是否已更新（超时未变化返回 False）
+        """
+        await self.page.evaluate(_SNAPSHOT_TABLE_JS, table_selector)
+        await target.click()
+        
+        try:
+            await self.page.wait_for_function(_TABLE_CHANGED_JS, arg=table_selector, timeout=timeout)
+        except PlaywrightTimeout:
+            return False
+        
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+        return True
+    
     async def scrape_with_button_pagination(
         self,
         table_selector: str,
         next_button_selector: str,
         max_pages: int = 0,
-        wait_time: float = 2.0
+        wait_time: float = 0.0
     ) -> List[TableData]:
         """
         使用"下一页"按钮分页抓取
         
+        点击后等待表格内容变化即提取，不再固定休眠或等待 networkidle。
+        
         Args:
             table_selector: 表格选择器
             next_button_selector: 下一页按钮选择器
             max_pages: 最大页数（0 表示无限制）
-            wait_time: 每页等待时间
+            wait_time: 表格更新后的额外等待时间（秒）
             
         Returns:
             List[TableData]: 所有页面的数据
         """
-        page_count = 0
-        
-        while True:
-            # 检查是否达到最大页数
-            if max_pages > 0 and page_count >= max_pages:
-                print(f"✅ 达到最大页数限制: {max_pages}")
-                break
+        async with self._routed(self.page):
+            page_count = 0
             
-            # 提取当前页数据
-            print(f"📄 提取第 {page_count + 1} 页...")
-            data = await self.extract_table(table_selector)
-            self.all_data.append(data)
-            page_count += 1
-            
-            print(f"   ✓ 提取 {data.total_rows} 行数据")
-            
-            # 检查是否有下一页按钮
+            # 定位器是惰性的，每次操作都会重新查询，可在循环外创建一次复用
             next_button = self.page.locator(next_button_selector)
             
-            try:
-                # 检查按钮是否存在且可点击
-                is_visible = await next_button.is_visible()
-                is_enabled = await next_button.is_enabled()
-                
-                if not is_visible or not is_enabled:
-                    print("✅ 已到达最后一页（按钮不可用）")
+            while True:
+                # 检查是否达到最大页数
+                if max_pages > 0 and page_count >= max_pages:
+                    print(f"✅ 达到最大页数限制: {max_pages}")
                     break
                 
-                # 点击下一页
-                await next_button.click()
-                
-                # 等待页面加载
-                await asyncio.sleep(wait_time)
+                # 提取当前页数据
+                print(f"📄 提取第 {page_count + 1} 页...")
+                data = await self.extract_table(table_selector)
+                self.add_page(data)
+                page_count += 1
                 
-                # 等待表格更新（可选：检查表格变化）
-                await self.page.wait_for_load_state("networkidle")
+                print(f"   ✓ 提取 {data.total_rows} 行数据")
                 
-            except Exception as e:
-                print(f"✅ 已到达最后一页: {str(e)}")
-                break
-        
-        return self.all_data
+                # 检查是否有下一页按钮
+                try:
+                    # 检查按钮是否存在且可点击
+                    state = await next_button.evaluate_all(_ELEMENT_STATE_JS)
+                    
+                    if not state["visible"] or not state["enabled"]:
+                        print("✅ 已到达最后一页（按钮不可用）")
+                        break
+                    
+                    # 点击下一页并等待表格更新
+                    if not await self._click_and_wait_for_table(next_button, table_selector, wait_time):
+                        print("✅ 已到达最后一页（表格内容未变化）")
+                        break
+                    
+                except Exception as e:
+                    print(f"✅ 已到达最后一页: {str(e)}")
+                    break
+            
+            return self.all_data
     
     async def scrape_with_page_numbers(
         self,
         table_selector: str,
         page_number_selector: str,
         max_pages: int = 0,
-        wait_time: float = 2.0
+        wait_time: float = 0.0
     ) -> List[TableData]:
         """
         使用页码分页抓取（1, 2, 3, ...）
         
+        点击页码后等待表格内容变化即提取，不再固定休眠或等待 networkidle。
+        
         Args:
             table_selector: 表格选择器
             page_number_selector: 页码链接选择器模板（例如：'a.page-{page}'）
             max_pages: 最大页数
-            wait_time: 每页等待时间
+            wait_time: 表格更新后的额外等待时间（秒）
             
         Returns:
             List[TableData]: 所有页面的数据
         """
-        page_count = 1
-        
-        # 提取第一页
-        print(f"📄 提取第 {page_count} 页...")
-        data = await self.extract_table(table_selector)
-        self.all_data.append(data)
-        print(f"   ✓ 提取 {data.total_rows} 行数据")
-        
-        # 循环提取后续页面
-        while True:
-            page_count += 1
+        async with self._routed(self.page):
+            page_count = 1
             
-            if max_pages > 0 and page_count > max_pages:
-                print(f"✅ 达到最大页数限制: {max_pages}")
-                break
+            # 预先拆分选择器模板，循环内只需 join 页码
+            selector_parts = page_number_selector.split("{page}")
             
-            # 构造页码选择器
-            selector = page_number_selector.replace("{page}", str(page_count))
-            page_link = self.page.locator(selector)
+            # 提取第一页
+            print(f"📄 提取第 {page_count} 页...")
+            data = await self.extract_table(table_selector)
+            self.add_page(data)
+            print(f"   ✓ 提取 {data.total_rows} 行数据")
             
-            try:
-                is_visible = await page_link.is_visible()
-                if not is_visible:
-                    print(f"✅ 已到达最后一页（页码 {page_count} 不存在）")
-                    break
+            # 循环提取后续页面
+            while True:
+                page_count += 1
                 
-                print(f"📄 提取第 {page_count} 页...")
+                if max_pages > 0 and page_count > max_pages:
+                    print(f"✅ 达到最大页数限制: {max_pages}")
+                    break
                 
-                # 点击页码
-                await page_link.click()
-                await asyncio.sleep(wait_time)
-                await self.page.wait_for_load_state("networkidle")
+                # 构造页码选择器
+                selector = str(page_count).join(selector_parts)
+                page_link = self.page.locator(selector)
                 
-                # 提取数据
-                data = await self.extract_table(table_selector)
-                self.all_data.append(data)
-                print(f"   ✓ 提取 {data.total_rows} 行数据")
-                
-            except Exception as e:
-                print(f"✅ 已到达最后一页: {str(e)}")
-                break
+                try:
+                    state = await page_link.evaluate_all(_ELEMENT_STATE_JS)
+                    if not state["visible"]:
+                        print(f"✅ 已到达最后一页（页码 {page_count} 不存在）")
+                        break
+                    
+                    print(f"📄 提取第 {page_count} 页...")
+                    
+                    # 点击页码并等待表格更新
+                    if not await self._click_and_wait_for_table(page_link, table_selector, wait_time):
+                        print(f"✅ 已到达最后一页（页码 {page_count} 内容未变化）")
+                        break
+                    
+                    # 提取数据
+                    data = await self.extract_table(table_selector)
+                    self.add_page(data)
+                    print(f"   ✓ 提取 {data.total_rows} 行数据")
+                    
+                except Exception as e:
+                    print(f"✅ 已到达最后一页: {str(e)}")
+                    break
+            
+            return self.all_data
+    
+    async def _fetch_table_html(
+        self,
+        page: Page,
+        url: str,
+        table_selector: str,
+        wait_time: float,
+        force_rescrape: bool
+    ) -> Optional[str]:
+        """
+        获取 URL 对应页面的 HTML（优先读缓存）
+        
+        DOM 就绪即开始等待表格出现，不等待 load/networkidle（广告、统计脚本等），
+        也不再固定休眠。
+        
+        Returns:
+            页面 HTML；表格不存在（超时未出现）时返回 None
+        
+        Raises:
+            PageThrottled: 目标站点返回 429/503
+        """
+        html = None if force_rescrape else self._get_cached_html(url)
+        if html is not None:
+            print(f"   ⚡ 命中缓存: {url}")
+            return html
+        
+        # 导航到页面，等待表格可见
+        response = await page.goto(url, wait_until="domcontentloaded")
+        if response is not None and response.status in _THROTTLE_STATUSES:
+            raise PageThrottled(url, response.status, _parse_retry_after(response.headers.get("retry-after")))
+        try:
+            await page.wait_for_selector(table_selector, state="visible", timeout=10000)
+        except PlaywrightTimeout:
+            return None
         
-        return self.all_data
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+        
+        html = await page.content()
+        self._cache_html(url, html)
+        return html
+    
+    async def _fetch_in_new_page(
+        self,
+        url: str,
+        table_selector: str,
+        wait_time: float,
+        force_rescrape: bool
+    ) -> Optional[str]:
+        """在同一上下文的新标签页中获取 HTML，用完即关"""
+        page = await self.page.context.new_page()
+        try:
+            async with self._routed(page):
+                return await self._fetch_table_html(page, url, table_selector, wait_time, force_rescrape)
+        finally:
+            await page.close()
     
     async def scrape_with_url_params(
         self,
@@ -231,67 +840,168 @@ class TableScraper:
         page_param: str = "page",
         start_page: int = 1,
         max_pages: int = 0,
-        wait_time: float = 2.0
+        wait_time: float = 0.0,
+        force_rescrape: bool = False,
+        concurrency: int = 1,
+        autoscale: Optional[AutoscaledConcurrency] = None
     ) -> List[TableData]:
         """
         使用 URL 参数分页抓取（例如：?page=1, ?page=2）
         
+        已抓取过的 URL 会缓存页面 HTML（有效期 cache_ttl），重复抓取时直接解析缓存，
+        不再导航。
+        
         Args:
             base_url: 基础 URL
             table_selector: 表格选择器
             page_param: 页码参数名
             start_page: 起始页码
             max_pages: 最大页数
-            wait_time: 每页等待时间
+            wait_time: 表格出现后的额外等待时间（秒）
+            force_rescrape: 是否忽略缓存，强制重新访问页面
+            concurrency: 并发页数。大于 1 时在同一上下文中始终保持 concurrency 个
+                新标签页并行加载（滑动窗口），结果仍按页码顺序处理
+            autoscale: 自适应并发控制。设置后忽略 concurrency，窗口大小随限流响应
+                和本机负载动态调整
+            
+            被限流（429/503）的页面按 Retry-After 等待后重试，最多重试 3 次。
             
         Returns:
             List[TableData]: 所有页面的数据
         """
-        page_count = start_page
-        
-        while True:
-            if max_pages > 0 and (page_count - start_page + 1) > max_pages:
+        async with self._routed(self.page):
+            separator = "&" if "?" in base_url else "?"
+            end_page = start_page + max_pages if max_pages > 0 else None
+            
+            def page_url(num: int) -> str:
+                return f"{base_url}{separator}{page_param}={num}"
+            
+            if autoscale is None and concurrency <= 1:
+                num = start_page
+                while end_page is None or num < end_page:
+                    url = page_url(num)
+                    print(f"📄 提取第 {num} 页...")
+                    print(f"   URL: {url}")
+                    for attempt in range(_MAX_THROTTLE_RETRIES + 1):
+                        try:
+                            html = await self._fetch_table_html(
+                                self.page, url, table_selector, wait_time, force_rescrape
+                            )
+                        except PageThrottled as e:
+                            html = e
+                            if attempt < _MAX_THROTTLE_RETRIES:
+                                await self._wait_throttled(num, e, attempt)
+                                continue
+                        except Exception as e:
+                            html = e
+                        break
+                    if not self._accept_url_page(num, html, table_selector):
+                        return self.all_data
+                    num += 1
                 print(f"✅ 达到最大页数限制: {max_pages}")
-                break
+                return self.all_data
             
-            # 构造 URL
-            separator = "&" if "?" in base_url else "?"
-            url = f"{base_url}{separator}{page_param}={page_count}"
+            # 滑动窗口：始终保持 concurrency 个页面在加载，最早的一页完成即处理并补上下一页，
+            # 不必像分批那样等待整批中最慢的页面
+            pending: Deque[Tuple[int, asyncio.Task]] = deque()
+            next_num = start_page
+            retries: Dict[int, int] = {}
             
-            print(f"📄 提取第 {page_count} 页...")
-            print(f"   URL: {url}")
+            def fetch(num: int) -> asyncio.Task:
+                return asyncio.create_task(self._fetch_in_new_page(
+                    page_url(num), table_selector, wait_time, force_rescrape
+                ))
             
             try:
-                # 导航到页面
-                await self.page.goto(url)
-                await asyncio.sleep(wait_time)
-                
-                # 检查表格是否存在
-                table = self.page.locator(table_selector)
-                is_visible = await table.is_visible()
-                
-                if not is_visible:
-                    print(f"✅ 已到达最后一页（表格不存在）")
-                    break
-                
-                # 提取数据
-                data = await self.extract_table(table_selector)
-                
-                # 检查是否有数据
-                if data.total_rows == 0:
-                    print(f"✅ 已到达最后一页（无数据）")
-                    break
-                
-                self.all_data.append(data)
-                print(f"   ✓ 提取 {data.total_rows} 行数据")
-                
-                page_count += 1
-                
-            except Exception as e:
-                print(f"✅ 已到达最后一页: {str(e)}")
-                break
+                while True:
+                    limit = autoscale.limit if autoscale else concurrency
+                    while len(pending) < limit and (end_page is None or next_num < end_page):
+                        pending.append((next_num, fetch(next_num)))
+                        next_num += 1
+                    
+                    if not pending:
+                        print(f"✅ 达到最大页数限制: {max_pages}")
+                        break
+                    
+                    # 按页码顺序处理，遇到异常或空页即停止
+                    num, task = pending.popleft()
+                    if num not in retries:
+                        print(f"📄 提取第 {num} 页...")
+                    try:
+                        html = await task
+                    except PageThrottled as e:
+                        html = e
+                        if autoscale:
+                            autoscale.record_throttled()
+                        attempt = retries.get(num, 0)
+                        if attempt < _MAX_THROTTLE_RETRIES:
+                            retries[num] = attempt + 1
+                            await self._wait_throttled(num, e, attempt)
+                            pending.appendleft((num, fetch(num)))
+                            continue
+                    except Exception as e:
+                        html = e
+                    else:
+                        if autoscale:
+                            autoscale.record_success()
+                    if not self._accept_url_page(num, html, table_selector):
+                        break
+            finally:
+                # 停止后取消仍在加载的页面（_fetch_in_new_page 会关闭各自的标签页）
+                for _, task in pending:
+                    task.cancel()
+                await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+            
+            return self.all_data
+    
+    @staticmethod
+    async def _wait_throttled(num: int, error: PageThrottled, attempt: int):
+        """被限流后等待（优先使用 Retry-After，否则指数退避，最长 30 秒）"""
+        delay = min(error.retry_after if error.retry_after is not None else 2.0 ** attempt, 30.0)
+        print(f"   ⏳ 第 {num} 页被限流 (HTTP {error.status})，{delay:.1f} 秒后重试")
+        await asyncio.sleep(delay)
+    
+    def _accept_url_page(self, num: int, html: Any, table_selector: str) -> bool:
+        """
+        处理 URL 分页的一页结果
+        
+        Returns:
+            是否继续抓取下一页（异常、表格不存在或无数据时返回 False）
+        """
+        if isinstance(html, BaseException):
+            print(f"✅ 已到达最后一页: {str(html)}")
+            return False
         
-        return self.all_data
+        if html is None:
+            print(f"✅ 已到达最后一页（第 {num} 页表格不存在）")
+            return False
+        
+        # 提取数据
+        data = self._table_data_from_html(html, table_selector)
+        
+        # 检查是否有数据
+        if data.total_rows == 0:
+            print(f"✅ 已到达最后一页（第 {num} 页无数据）")
+            return False
+        
+        self.add_page(data)
+        print(f"   ✓ 第 {num} 页提取 {data.total_rows} 行数据")
+        return True
+    
+    def _iter_rows(self) -> Iterator[List[str]]:
+        """按页顺序遍历所有行；开启 deduplicate 时跳过重复行（按行内容哈希判断）"""
+        rows = chain.from_iterable(page_data.rows for page_data in self.all_data)
+        if not self.deduplicate:
+            yield from rows
+            return
+        
+        seen = set()
+        for row in rows:
+            key = xxhash.xxh3_64_intdigest("\x1f".join(row))
+            if key in seen:
+                continue
+            seen.add(key)
+            yield row
     
     def merge_all_data(self) -> Dict[str, Any]:
         """
@@ -307,9 +1017,7 @@ class TableScraper:
         headers = self.all_data[0].headers
         
         # 合并所有行
-        all_rows = []
-        for page_data in self.all_data:
-            all_rows.extend(page_data.rows)
+        all_rows = list(self._iter_rows())
         
         return {
             "headers": headers,
@@ -318,42 +1026,91 @@ class TableScraper:
             "total_rows": len(all_rows)
         }
     
+    @staticmethod
+    def _join_plain_csv_lines(headers: List[str], rows: List[List[str]]) -> Optional[List[str]]:
+        """
+        尝试把表头和数据行直接拼接为 CSV 行
+        
+        所有行列数与表头一致且没有需要转义的字符时返回拼接好的行；
+        否则返回 None，由调用方回退到 csv.writer。
+        """
+        width = len(headers)
+        # 单列时空字段会被 csv.writer 写成 ""，交给 csv 模块处理
+        if width < 2:
+            return None
+        
+        separators = width - 1
+        lines = []
+        for row in chain((headers,), rows):
+            if len(row) != width:
+                return None
+            line = ",".join(row)
+            # 逗号数量多于分隔符说明字段内含逗号，需要转义
+            if line.count(",") != separators or _CSV_SPECIAL_RE.search(line):
+                return None
+            lines.append(line)
+        return lines
+    
     def save_to_csv(self, filename: str = "table_data.csv"):
         """保存为 CSV 文件"""
         merged = self.merge_all_data()
         
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(merged["headers"])
-            writer.writerows(merged["rows"])
+        lines = self._join_plain_csv_lines(merged["headers"], merged["rows"])
+        
+        # 大表格写入时使用 1MB 缓冲，减少系统调用次数
+        with open(filename, 'w', newline='', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+            if lines is not None:
+                # 快速路径：无需转义，直接拼接字符串写入（输出与 csv.writer 一致）
+                f.write(_CSV_LINE_TERMINATOR.join(lines))
+                f.write(_CSV_LINE_TERMINATOR)
+            else:
+                writer = csv.writer(f)
+                writer.writerow(merged["headers"])
+                writer.writerows(merged["rows"])
         
         print(f"💾 数据已保存到: {filename}")
         print(f"   总页数: {merged['total_pages']}")
         print(f"   总行数: {merged['total_rows']}")
     
+    def save_to_parquet(self, filename: str = "table_data.parquet"):
+        """保存为 Parquet 文件（每页一个 RecordBatch，需要安装 pyarrow）"""
+        with StreamingTableWriter(filename, deduplicate=self.deduplicate) as writer:
+            for page_data in self.all_data:
+                writer.write_page(page_data)
+    
     def save_to_json(self, filename: str = "table_data.json"):
-        """保存为 JSON 文件"""
-        merged = self.merge_all_data()
+        """
+        保存为 JSON 文件
+        
+        逐行序列化写入，不在内存中构造完整的合并行列表和字典列表。
+        """
+        headers = self.all_data[0].headers if self.all_data else []
+        total_pages = len(self.all_data)
+        
+        rows: Iterable[List[str]] = self._iter_rows()
+        if self.deduplicate:
+            # 去重后的行数需先确定（只保存行引用，不复制数据）
+            rows = list(rows)
+            total_rows = len(rows)
+        else:
+            total_rows = sum(len(page_data.rows) for page_data in self.all_data)
         
-        # 转换为字典列表
-        data_list = []
-        headers = merged["headers"]
-        for row in merged["rows"]:
-            row_dict = {headers[i]: row[i] for i in range(len(headers))}
-            data_list.append(row_dict)
-        
-        output = {
-            "metadata": {
-                "total_pages": merged["total_pages"],
-                "total_rows": merged["total_rows"],
-                "headers": headers
-            },
-            "data": data_list
+        metadata = {
+            "total_pages": total_pages,
+            "total_rows": total_rows,
+            "headers": headers
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(output, f, ensure_ascii=False, indent=2)
+        # orjson 直接输出 UTF-8（等价于 ensure_ascii=False），比标准库 json 快得多
+        with open(filename, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(b'{\n  "metadata": ')
+            f.write(orjson.dumps(metadata))
+            f.write(b',\n  "data": [')
+            for i, row in enumerate(rows):
+                f.write(b',\n    ' if i else b'\n    ')
+                f.write(orjson.dumps(dict(zip(headers, row))))
+            f.write(b'\n  ]\n}\n' if total_rows else b']\n}\n')
         
         print(f"💾 数据已保存到: {filename}")
-        print(f"   总页数: {merged['total_pages']}")
-        print(f"   总行数: {merged['total_rows']}")
\ No newline at end of file
+        print(f"   总页数: {total_pages}")
+        print(f"   总行数: {total_rows}")
@@ -96,8 +96,7 @@ def get_table_scraping_tools(browser: Browser) -> List[StructuredTool]:
             await scraper.scrape_with_button_pagination(
                 table_selector=table_selector,
                 next_button_selector=next_button_selector,
-                max_pages=max_pages,
-                wait_time=2.0
+                max_pages=max_pages
             )
             
             # 保存数据
@@ -3,14 +3,188 @@
 支持自定义字段、分页抓取、灵活配置
 """
 
-import json
+import sys
+import queue
+import logging
+import logging.handlers
+import threading
+import orjson
 import asyncio
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
-from playwright.async_api import Page
+from functools import wraps
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from typing import Dict, List, Optional, Any, Callable, Awaitable, TypeVar
+from dataclasses import dataclass
+from playwright.async_api import Page, Route, TimeoutError as PlaywrightTimeout
 
 
-@dataclass
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    日志入队后立即返回，由后台线程的 QueueListener 写到目标 handler
+    
+    监听线程在第一条日志入队时才启动（导入模块没有副作用）；
+    flush 会等待已入队的日志全部输出并停止线程，下一条日志再重新启动。
+    logging.shutdown 退出时也会调用 flush，未输出的日志不会丢失。
+    """
+    
+    def __init__(self, target: logging.Handler):
+        super().__init__(queue.SimpleQueue())
+        self.listener = logging.handlers.QueueListener(self.queue, target)
+        self._listener_lock = threading.Lock()
+        self._listening = False
+    
+    def enqueue(self, record: logging.LogRecord):
+        with self._listener_lock:
+            if not self._listening:
+                self.listener.start()
+                self._listening = True
+            super().enqueue(record)
+    
+    def flush(self):
+        with self._listener_lock:
+            if self._listening:
+                self.listener.stop()
+                self._listening = False
+
+
+def _create_logger() -> logging.Logger:
+    """
+    创建模块日志器
+    
+    日志经 _LazyQueueHandler 入队，抓取协程不会阻塞在终端 I/O 上。
+    输出格式与原先的 print 相同（只输出消息本身）；宿主程序已为本模块日志器
+    配置 handler 时保持原样。
+    """
+    log = logging.getLogger(__name__)
+    if log.handlers:
+        return log
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    
+    log.addHandler(_LazyQueueHandler(stream_handler))
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    return log
+
+
+logger = _create_logger()
+
+
+def _flush_log():
+    """等待本模块已入队的日志全部输出"""
+    for handler in logger.handlers:
+        handler.flush()
+
+
+def _flushes_log(func):
+    """
+    公开的抓取方法（最外层调用）返回前等待已入队的日志输出完，
+    调用方随后的 print 不会排到抓取日志前面
+    """
+    @wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        self._call_depth += 1
+        try:
+            return await func(self, *args, **kwargs)
+        finally:
+            self._call_depth -= 1
+            if self._call_depth == 0:
+                await asyncio.to_thread(_flush_log)
+    return wrapper
+
+_T = TypeVar("_T")
+
+# 在浏览器端一次性提取所有容器的所有字段（单次往返，替代逐容器逐字段 await）
+# 取值规则与 _extract_field 一致：无匹配元素为 null，空值为 null，其余去除首尾空白
+_EXTRACT_ALL_JS = """
+(containers, fields) => containers.map(container => {
+    const item = {};
+    for (const field of fields) {
+        const elements = container.querySelectorAll(field.selector);
+        if (!elements.length) {
+            item[field.name] = null;
+            continue;
+        }
+        const value = el => {
+            const raw = field.attribute ? el.getAttribute(field.attribute) : el.textContent;
+            return raw ? raw.trim() : null;
+        };
+        item[field.name] = field.multiple ? Array.from(elements, value) : value(elements[0]);
+    }
+    return item;
+})
+"""
+
+# 逐字段提取（字段选择器非标准 CSS 时）：先为容器建立 元素 -> 序号 映射，
+# 再对每个字段一次性取出所有匹配元素，按最近的容器祖先归属到对应数据项
+_INDEX_CONTAINERS_JS = """
+containers => {
+    window.__scraperContainers = new Map(containers.map((el, i) => [el, i]));
+    return containers.length;
+}
+"""
+
+_FIELD_MATCHES_JS = """
+(elements, attribute) => {
+    const containers = window.__scraperContainers;
+    return elements.map(el => {
+        let node = el;
+        while (node && !containers.has(node)) {
+            node = node.parentElement || node.getRootNode().host;
+        }
+        const raw = attribute ? el.getAttribute(attribute) : el.textContent;
+        return [node ? containers.get(node) : -1, raw ? raw.trim() : null];
+    });
+}
+"""
+
+# 结果文件写入缓冲区大小
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# 翻页前的第一个数据项被移除或内容改变，说明新一页数据已渲染
+_ITEM_REPLACED_JS = "([item, text]) => !item.isConnected || item.textContent !== text"
+
+# 读取下一页链接的绝对地址（非链接元素返回 null）
+_NEXT_HREF_JS = "els => els.length && els[0].href ? els[0].href : null"
+
+
+def _find_page_param(current_url: str, next_url: str) -> Optional[str]:
+    """
+    对比当前页与下一页链接，找出表示页码的查询参数名
+    
+    下一页的参数值须为当前页值 + 1（当前页缺少该参数时视为第 1 页）。
+    """
+    current, following = urlsplit(current_url), urlsplit(next_url)
+    if (current.netloc, current.path) != (following.netloc, following.path):
+        return None
+    
+    current_query = dict(parse_qsl(current.query))
+    for key, value in parse_qsl(following.query):
+        if not value.isdigit():
+            continue
+        current_value = current_query.get(key, "1")
+        if current_value.isdigit() and int(value) == int(current_value) + 1:
+            return key
+    return None
+
+
+def _with_query_param(url: str, key: str, value: int) -> str:
+    """替换（或添加）URL 中的查询参数"""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query[key] = str(value)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _default_json_records(payload: Any) -> List[Dict[str, Any]]:
+    """默认的接口数据提取：记录数组本身，或对象中第一个数组字段（如 {"data": [...]}）"""
+    if isinstance(payload, dict):
+        return next((value for value in payload.values() if isinstance(value, list)), [])
+    return payload if isinstance(payload, list) else []
+
+
+@dataclass(frozen=True, slots=True)
 class FieldConfig:
     """字段配置"""
     name: str  # 字段名
@@ -19,7 +193,7 @@ class FieldConfig:
     multiple: bool = False  # 是否提取多个值
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ScraperConfig:
     """抓取器配置"""
     url: str  # 目标网址
@@ -29,175 +203,382 @@ class ScraperConfig:
     page_range: Optional[tuple] = None  # 页码范围 (start, end)
     delay: float = 3.0  # 页面延迟时间（秒）
     max_pages: int = 0  # 最大页数（0表示无限制）
+    # 抓取时直接中止的资源类型（只需 DOM 文本/属性）；
+    # 默认不屏蔽 stylesheet，可见性判断依赖 CSS，确认目标站点无影响时可加入
+    block_resources: frozenset = frozenset({"image", "font", "media"})
+    # 数据接口 URL 片段；设置后直接请求 JSON 接口翻页，不再渲染和解析后续页面
+    json_endpoint_pattern: Optional[str] = None
+    # 接口页码参数名
+    json_page_param: str = "page"
+    # 从接口 JSON 中取出记录列表（默认取数组本身或对象中第一个数组字段）
+    json_extractor: Optional[Callable[[Any], List[Dict[str, Any]]]] = None
+    # 同时进行的 Playwright 调用上限（并发提取/多页面时避免协议通道排队阻塞）
+    rpc_concurrency: int = 32
 
 
 class UniversalScraper:
     """通用网页数据抓取器"""
     
-    def __init__(self, page: Page, config: ScraperConfig):
+    def __init__(
+        self,
+        page: Page,
+        config: ScraperConfig,
+        stream_to: Optional[str] = None,
+        keep_data: bool = True
+    ):
         """
         初始化抓取器
         
         Args:
             page: Playwright页面对象
             config: 抓取器配置
+            stream_to: JSONL 文件路径；设置后每页抓取完成即逐行写入（每行一条记录）
+            keep_data: 是否在内存中保留全部数据（流式写入大规模抓取时可设为 False）
         """
         self.page = page
         self.config = config
         self.all_data: List[Dict[str, Any]] = []
+        self.stream_to = stream_to
+        self.keep_data = keep_data
+        self.total_items = 0
+        self._stream = None
+        self._rpc_semaphore = asyncio.Semaphore(config.rpc_concurrency)
+        # 公开抓取方法的嵌套深度（只在最外层返回时刷新日志）
+        self._call_depth = 0
+        
+        # 字段配置在抓取过程中不变，预先序列化，每页直接复用
+        # （手动构造字典，避免 asdict 的递归深拷贝）
+        self._fields_payload = [
+            {
+                "name": field.name,
+                "selector": field.selector,
+                "attribute": field.attribute,
+                "multiple": field.multiple
+            }
+            for field in config.fields
+        ]
     
-    async def scrape_current_page(self) -> List[Dict[str, Any]]:
+    @_flushes_log
+    async def scrape_current_page(
+        self,
+        page: Optional[Page] = None,
+        wait_for_containers: bool = True
+    ) -> List[Dict[str, Any]]:
         """
         抓取当前页面数据
         
+        Args:
+            page: 要抓取的页面，默认为 self.page
+            wait_for_containers: 是否先等待容器出现（调用方刚确认过容器存在时可跳过，省一次往返）
+        
         Returns:
             当前页的数据列表
         """
+        page = page or self.page
         page_data = []
         
         # 等待容器加载
+        if wait_for_containers:
+            try:
+                await page.wait_for_selector(
+                    self.config.container_selector,
+                    timeout=10000
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ 容器未找到: {self.config.container_selector}")
+                return page_data
+        
         try:
-            await self.page.wait_for_selector(
-                self.config.container_selector,
-                timeout=10000
-            )
-        except Exception as e:
-            print(f"⚠️ 容器未找到: {self.config.container_selector}")
+            page_data = await self._extract_all_js(page)
+            logger.info(f"   找到 {len(page_data)} 个数据项")
             return page_data
+        except Exception as e:
+            # 字段选择器不是标准 CSS（如 Playwright 的 text= 语法）时逐字段提取
+            logger.warning(f"   ⚠️ 批量提取失败，改为逐字段提取: {e}")
         
-        # 获取所有容器
-        containers = await self.page.locator(self.config.container_selector).all()
-        print(f"   找到 {len(containers)} 个数据项")
+        return await self._extract_by_field(page)
+    
+    async def _limited(self, call: Awaitable[_T]) -> _T:
+        """在 RPC 并发上限内执行一次 Playwright 调用"""
+        async with self._rpc_semaphore:
+            return await call
+    
+    async def _extract_all_js(self, page: Page) -> List[Dict[str, Any]]:
+        """
+        在浏览器内一次性提取当前页所有容器的全部字段
         
-        # 遍历每个容器
-        for container in containers:
-            item_data = {}
-            
-            # 提取每个字段
-            for field in self.config.fields:
-                try:
-                    value = await self._extract_field(container, field)
-                    item_data[field.name] = value
-                except Exception as e:
-                    print(f"   ⚠️ 提取字段失败 [{field.name}]: {e}")
-                    item_data[field.name] = None
+        Args:
+            page: 要抓取的页面
+        
+        Returns:
+            当前页的数据列表
+        """
+        return await self._limited(
+            page.locator(self.config.container_selector).evaluate_all(
+                _EXTRACT_ALL_JS,
+                self._fields_payload
+            )
+        )
+    
+    async def _extract_by_field(self, page: Page) -> List[Dict[str, Any]]:
+        """
+        逐字段提取当前页数据（字段选择器由 Playwright 解析，支持 text= 等语法）
+        
+        每个字段只需一次往返（各字段并发），与容器数量无关；
+        取值规则与 _EXTRACT_ALL_JS 一致。
+        
+        Args:
+            page: 要抓取的页面
+        
+        Returns:
+            当前页的数据列表
+        """
+        containers = page.locator(self.config.container_selector)
+        count = await self._limited(containers.evaluate_all(_INDEX_CONTAINERS_JS))
+        logger.info(f"   找到 {count} 个数据项")
+        if not count:
+            return []
+        
+        fields = self.config.fields
+        page_data = [dict.fromkeys(field.name for field in fields) for _ in range(count)]
+        
+        results = await asyncio.gather(
+            *(self._limited(
+                containers.locator(field.selector).evaluate_all(_FIELD_MATCHES_JS, field.attribute)
+            ) for field in fields),
+            return_exceptions=True
+        )
+        
+        for field, matches in zip(fields, results):
+            name = field.name
+            if isinstance(matches, Exception):
+                logger.warning(f"   ⚠️ 提取字段失败 [{name}]: {matches}")
+                continue
             
-            page_data.append(item_data)
+            # 单值字段只取每个容器内的第一个匹配
+            filled = set()
+            for index, value in matches:
+                if index < 0:
+                    continue
+                item = page_data[index]
+                if field.multiple:
+                    if index in filled:
+                        item[name].append(value)
+                    else:
+                        item[name] = [value]
+                elif index not in filled:
+                    item[name] = value
+                filled.add(index)
         
         return page_data
     
-    async def _extract_field(self, container, field: FieldConfig) -> Any:
+    @_flushes_log
+    async def scrape_page_urls_concurrent(
+        self,
+        urls: List[str],
+        concurrency: int = 4
+    ) -> List[Dict[str, Any]]:
         """
-        提取单个字段的值
+        并发抓取多个页面 URL
+        
+        在当前浏览器上下文中开多个标签页（共享 Cookie/登录态），
+        最多 concurrency 个页面同时加载和提取，结果按 URL 顺序合并。
         
         Args:
-            container: 容器元素
-            field: 字段配置
+            urls: 页面 URL 列表
+            concurrency: 最大并发页面数
             
         Returns:
-            字段值
+            所有页面的数据
         """
-        locator = container.locator(field.selector)
+        semaphore = asyncio.Semaphore(concurrency)
+        context = self.page.context
+        
+        async def worker(url: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                page = await context.new_page()
+                try:
+                    async with self._routed(page):
+                        await page.goto(url)
+                        return await self.scrape_current_page(page)
+                finally:
+                    await page.close()
+        
+        results = await asyncio.gather(*(worker(url) for url in urls), return_exceptions=True)
+        
+        for url, page_data in zip(urls, results):
+            if isinstance(page_data, Exception):
+                logger.warning(f"   ⚠️ 页面抓取失败 [{url}]: {page_data}")
+            elif page_data:
+                self._add_page_data(page_data)
+            else:
+                logger.warning(f"   ⚠️ 页面无数据 [{url}]")
         
-        # 检查元素是否存在
-        count = await locator.count()
-        if count == 0:
+        logger.info(f"✅ 并发抓取完成: {len(urls)} 页, {self.total_items} 条数据")
+        return self.all_data
+    
+    async def _pagination_urls(self) -> Optional[List[str]]:
+        """
+        根据下一页链接推断分页 URL 列表
+        
+        仅在页数有上限（page_range 或 max_pages）且下一页链接带页码参数时可用，
+        否则返回 None，由调用方走逐页点击的流程。
+        """
+        config = self.config
+        if not config.next_button_selector or not (config.page_range or config.max_pages > 0):
             return None
         
-        # 提取多个值
-        if field.multiple:
-            elements = await locator.all()
-            values = []
-            for elem in elements:
-                if field.attribute:
-                    val = await elem.get_attribute(field.attribute)
-                else:
-                    val = await elem.text_content()
-                values.append(val.strip() if val else None)
-            return values
+        next_url = await self.page.locator(config.next_button_selector).evaluate_all(_NEXT_HREF_JS)
+        if not next_url:
+            return None
         
-        # 提取单个值
-        if field.attribute:
-            value = await locator.first.get_attribute(field.attribute)
-        else:
-            value = await locator.first.text_content()
+        current_url = self.page.url
+        key = _find_page_param(current_url, next_url)
+        if not key:
+            return None
         
-        return value.strip() if value else None
+        # 与逐页点击一致：当前页记为第 1 页
+        start, end = config.page_range or (1, config.max_pages)
+        if config.max_pages > 0:
+            end = min(end, config.max_pages)
+        offset = int(dict(parse_qsl(urlsplit(current_url).query)).get(key, "1")) - 1
+        
+        return [_with_query_param(next_url, key, number + offset) for number in range(start, end + 1)]
     
-    async def scrape_with_pagination(self) -> List[Dict[str, Any]]:
+    @_flushes_log
+    async def scrape_with_pagination(self, click_only: bool = False) -> List[Dict[str, Any]]:
         """
         抓取分页数据
         
+        Args:
+            click_only: 只在 self.page 上点击翻页，不切换为新标签页并发抓取页码 URL
+                （保留当前页面的筛选条件、表单提交结果等页内状态）
+        
         Returns:
             所有页面的数据
         """
+        urls = None if click_only else await self._pagination_urls()
+        if urls:
+            logger.info(f"🔗 检测到分页 URL 参数，并发抓取 {len(urls)} 页")
+            return await self.scrape_page_urls_concurrent(urls)
+        
         current_page = 1
+        # 翻页成功时 _go_to_next_page 已等待到容器出现，抓取时无需再等待
+        navigated = False
         
         while True:
-            # 检查是否达到最大页数
-            if self.config.max_pages > 0 and current_page > self.config.max_pages:
-                print(f"✅ 达到最大页数: {self.config.max_pages}")
+            # 检查最大页数和页码范围上限
+            limit_message = self._page_limit_message(current_page)
+            if limit_message:
+                logger.info(limit_message)
                 break
             
-            # 检查页码范围
-            if self.config.page_range:
-                start, end = self.config.page_range
-                if current_page < start:
-                    current_page += 1
-                    continue
-                if current_page > end:
-                    print(f"✅ 达到页码范围上限: {end}")
-                    break
+            # 跳过页码范围下限之前的页
+            if self.config.page_range and current_page < self.config.page_range[0]:
+                current_page += 1
+                continue
             
             # 抓取当前页
-            print(f"\n📄 抓取第 {current_page} 页...")
-            page_data = await self.scrape_current_page()
+            logger.info(f"\n📄 抓取第 {current_page} 页...")
+            page_data = await self.scrape_current_page(wait_for_containers=not navigated)
             
             if page_data:
-                self.all_data.extend(page_data)
-                print(f"   ✓ 成功提取 {len(page_data)} 条数据")
+                self._add_page_data(page_data)
+                logger.info(f"   ✓ 成功提取 {len(page_data)} 条数据")
             else:
-                print(f"   ⚠️ 当前页无数据")
+                logger.warning(f"   ⚠️ 当前页无数据")
             
             # 检查是否有下一页
             if not self.config.next_button_selector:
-                print("✅ 无分页配置，抓取完成")
+                logger.info("✅ 无分页配置，抓取完成")
                 break
             
-            # 查找下一页按钮
-            next_button = self.page.locator(self.config.next_button_selector)
+            # 已到最后一页时不再点击下一页
+            limit_message = self._page_limit_message(current_page + 1)
+            if limit_message:
+                logger.info(limit_message)
+                break
             
-            try:
-                # 检查按钮是否存在
-                count = await next_button.count()
-                if count == 0:
-                    print("✅ 未找到下一页按钮")
-                    break
-                
-                # 检查按钮是否可点击
-                is_visible = await next_button.first.is_visible()
-                is_enabled = await next_button.first.is_enabled()
-                
-                if not is_visible or not is_enabled:
-                    print("✅ 下一页按钮不可用")
-                    break
-                
-                # 点击下一页
-                print(f"   🔄 点击下一页，等待 {self.config.delay} 秒...")
-                await next_button.first.click()
-                
-                # 等待页面加载
-                await asyncio.sleep(self.config.delay)
-                await self.page.wait_for_load_state("networkidle", timeout=15000)
-                
-                current_page += 1
-                
-            except Exception as e:
-                print(f"✅ 分页结束: {str(e)}")
+            if not await self._go_to_next_page():
                 break
+            
+            navigated = True
+            current_page += 1
         
         return self.all_data
     
+    def _page_limit_message(self, page_number: int) -> Optional[str]:
+        """页码超出最大页数或页码范围时返回提示信息，否则返回 None"""
+        if self.config.max_pages > 0 and page_number > self.config.max_pages:
+            return f"✅ 达到最大页数: {self.config.max_pages}"
+        if self.config.page_range and page_number > self.config.page_range[1]:
+            return f"✅ 达到页码范围上限: {self.config.page_range[1]}"
+        return None
+    
+    async def _go_to_next_page(self) -> bool:
+        """
+        点击下一页并等待加载
+        
+        Returns:
+            是否成功翻页
+        """
+        # 查找下一页按钮
+        next_button = self.page.locator(self.config.next_button_selector)
+        old_item = None
+        
+        try:
+            # 检查按钮是否存在
+            count = await next_button.count()
+            if count == 0:
+                logger.info("✅ 未找到下一页按钮")
+                return False
+            
+            # 检查按钮是否可点击
+            is_visible = await next_button.first.is_visible()
+            is_enabled = await next_button.first.is_enabled()
+            
+            if not is_visible or not is_enabled:
+                logger.info("✅ 下一页按钮不可用")
+                return False
+            
+            # 记录翻页前的第一个数据项（不等待）
+            container_selector = self.config.container_selector
+            old_item = await self.page.query_selector(container_selector)
+            old_text = await old_item.text_content() if old_item else None
+            
+            # 点击下一页
+            logger.info(f"   🔄 点击下一页...")
+            await next_button.first.click()
+            
+            # 只等待数据项更新，而不是整页网络空闲
+            if old_item:
+                try:
+                    await self.page.wait_for_function(
+                        _ITEM_REPLACED_JS, arg=[old_item, old_text], timeout=15000
+                    )
+                except PlaywrightTimeout:
+                    # 无法判断数据是否更新时，退回固定等待
+                    logger.info(f"   ⏳ 未检测到数据更新，等待 {self.config.delay} 秒...")
+                    await asyncio.sleep(self.config.delay)
+                except Exception:
+                    # 整页跳转会销毁旧文档（执行上下文失效），说明已开始加载下一页
+                    pass
+            
+            await self.page.wait_for_selector(container_selector, timeout=15000)
+            return True
+            
+        except Exception as e:
+            logger.info(f"✅ 分页结束: {str(e)}")
+            return False
+        finally:
+            # 释放翻页前数据项的 ElementHandle（整页跳转后可能已失效）
+            if old_item:
+                try:
+                    await old_item.dispose()
+                except Exception:
+                    pass
+    
+    @_flushes_log
     async def scrape(self) -> List[Dict[str, Any]]:
         """
         执行抓取（自动判断是否分页）
@@ -205,42 +586,219 @@ class UniversalScraper:
         Returns:
             抓取的所有数据
         """
-        # 导航到目标页面
-        print(f"🌐 访问: {self.config.url}")
-        await self.page.goto(self.config.url)
-        await asyncio.sleep(self.config.delay)
-        
-        # 判断是否需要分页
-        if self.config.next_button_selector or self.config.page_range:
-            return await self.scrape_with_pagination()
-        else:
-            data = await self.scrape_current_page()
-            self.all_data = data
-            return data
+        async with self._routed(self.page):
+            if self.config.json_endpoint_pattern:
+                return await self._scrape_json_endpoint()
+            
+            # 导航到目标页面
+            logger.info(f"🌐 访问: {self.config.url}")
+            await self.page.goto(self.config.url)
+            await self._wait_until_ready()
+            
+            return await self._scrape_pages()
     
+    @_flushes_log
     async def scrape_from_current_page(self, skip_navigation: bool = True) -> List[Dict[str, Any]]:
         """
         从当前页面开始抓取（不导航）
         适用于已经打开的页面
         
+        全程只在这一个页面上点击翻页（复用其 Cookie/登录态和页内状态），
+        即使下一页链接带页码参数也不新开标签页按 URL 并发抓取
+        
         Args:
             skip_navigation: 是否跳过导航，默认True
         
         Returns:
             抓取的所有数据
         """
-        print(f"📍 从当前页面开始抓取: {self.page.url}")
+        if self.page.is_closed():
+            raise RuntimeError("页面已关闭，无法从当前页面抓取")
+        
+        logger.info(f"📍 从当前页面开始抓取: {self.page.url}")
         
-        # 等待页面稳定
-        await asyncio.sleep(self.config.delay)
+        async with self._routed(self.page):
+            await self._wait_until_ready()
+            
+            return await self._scrape_pages(click_only=True)
+    
+    async def _wait_until_ready(self):
+        """
+        等待数据项出现后立即开始抓取，代替固定等待 delay 秒
         
-        # 判断是否需要分页
-        if self.config.next_button_selector or self.config.page_range:
-            return await self.scrape_with_pagination()
+        delay 作为最长等待时间：超时后照常开始抓取；delay <= 0 时不等待
+        （Playwright 的 timeout=0 表示不限时，选择器不匹配时会一直挂起）
+        """
+        if self.config.delay <= 0:
+            return
+        try:
+            await self.page.wait_for_selector(
+                self.config.container_selector,
+                timeout=self.config.delay * 1000
+            )
+        except PlaywrightTimeout:
+            pass
+    
+    async def _block_resources(self, route: Route):
+        """拦截请求：屏蔽的资源类型直接中止，其余照常发出"""
+        if route.request.resource_type in self.config.block_resources:
+            await route.abort()
         else:
-            data = await self.scrape_current_page()
-            self.all_data = data
-            return data
+            await route.continue_()
+    
+    @asynccontextmanager
+    async def _routed(self, page: Page):
+        """在抓取期间为页面安装资源屏蔽，结束后移除"""
+        if not self.config.block_resources:
+            yield page
+            return
+        
+        await page.route("**/*", self._block_resources)
+        try:
+            yield page
+        finally:
+            if not page.is_closed():
+                await page.unroute("**/*", self._block_resources)
+    
+    async def _scrape_json_endpoint(self) -> List[Dict[str, Any]]:
+        """
+        通过数据接口抓取
+        
+        首次加载页面时捕获匹配 json_endpoint_pattern 的响应，确定接口地址；
+        之后的页直接用 context.request 请求接口（共享 Cookie），跳过页面渲染。
+        页码范围与最大页数按接口页码计算，首个响应的页码记为起始页。
+        """
+        config = self.config
+        pattern = config.json_endpoint_pattern
+        extract = config.json_extractor or _default_json_records
+        
+        logger.info(f"🌐 访问: {config.url}")
+        async with self.page.expect_response(lambda response: pattern in response.url, timeout=15000) as response_info:
+            await self.page.goto(config.url)
+        first_response = await response_info.value
+        endpoint = first_response.url
+        logger.info(f"🔗 发现数据接口: {endpoint}")
+        
+        first_value = dict(parse_qsl(urlsplit(endpoint).query)).get(config.json_page_param, "1")
+        first_page = int(first_value) if first_value.isdigit() else 1
+        
+        # 与 DOM 抓取一致：未配置分页时只抓取首页
+        paginated = bool(config.next_button_selector or config.page_range)
+        start, end = config.page_range or (first_page, None)
+        if config.max_pages > 0:
+            last = first_page + config.max_pages - 1
+            end = last if end is None else min(end, last)
+        
+        self._open_stream()
+        try:
+            page_number = start
+            while end is None or page_number <= end:
+                if page_number == first_page:
+                    payload = await first_response.json()
+                else:
+                    url = _with_query_param(endpoint, config.json_page_param, page_number)
+                    api_response = await self.page.context.request.get(url)
+                    if not api_response.ok:
+                        logger.info(f"✅ 接口返回 {api_response.status}，抓取结束")
+                        break
+                    payload = await api_response.json()
+                
+                records = extract(payload)
+                if not records:
+                    logger.info(f"✅ 第 {page_number} 页无数据，抓取结束")
+                    break
+                
+                self._add_page_data(records)
+                logger.info(f"   ✓ 第 {page_number} 页: {len(records)} 条数据")
+                
+                if not paginated:
+                    break
+                page_number += 1
+        finally:
+            self._close_stream()
+        
+        return self.all_data
+    
+    async def _scrape_pages(self, click_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        从当前页面开始抓取（自动判断是否分页），期间维护流式输出文件
+        
+        Args:
+            click_only: 分页时只在当前页面点击翻页（见 scrape_with_pagination）
+        """
+        self._open_stream()
+        try:
+            # 判断是否需要分页
+            if self.config.next_button_selector or self.config.page_range:
+                return await self.scrape_with_pagination(click_only=click_only)
+            
+            # 单页抓取的结果替换上一次的数据
+            self.all_data = []
+            self.total_items = 0
+            self._add_page_data(await self.scrape_current_page())
+            return self.all_data
+        finally:
+            self._close_stream()
+    
+    def _open_stream(self):
+        """
+        打开流式输出文件（未设置 stream_to 时不做任何事）
+        
+        文件会被重写，已收集的数据和条数一并清空，保证 total_items 与文件内容一致
+        """
+        if self.stream_to and self._stream is None:
+            self._stream = open(self.stream_to, 'wb', buffering=_WRITE_BUFFER_SIZE)
+            self.all_data = []
+            self.total_items = 0
+    
+    def _close_stream(self):
+        """关闭流式输出文件"""
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+            logger.info(f"\n💾 数据已流式写入: {self.stream_to}")
+    
+    def _add_page_data(self, page_data: List[Dict[str, Any]]):
+        """
+        收集一页数据
+        
+        流式输出时立即逐行写入文件并刷新，不保留数据时只累计条数。
+        """
+        self.total_items += len(page_data)
+        
+        if self._stream is not None:
+            # 每页一次批量写入预先序列化的行，再刷新到磁盘
+            self._stream.writelines([orjson.dumps(item) + b"\n" for item in page_data])
+            self._stream.flush()
+        
+        if self.keep_data:
+            self.all_data.extend(page_data)
+    
+    def save_metadata(self, filename: Optional[str] = None) -> str:
+        """
+        保存元数据（流式输出时使用，数据本身已写入 stream_to）
+        
+        Args:
+            filename: 文件名，默认为 "<stream_to>.meta.json"
+            
+        Returns:
+            保存的文件名
+        """
+        filename = filename or f"{self.stream_to or 'scraped_data'}.meta.json"
+        
+        metadata = {
+            "total_items": self.total_items,
+            "url": self.config.url,
+            "fields": [field.name for field in self.config.fields],
+            "data_file": self.stream_to
+        }
+        
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+        
+        logger.info(f"💾 元数据已保存到: {filename}")
+        _flush_log()
+        return filename
     
     def save_to_json(self, filename: str = "scraped_data.json") -> str:
         """
@@ -264,11 +822,13 @@ class UniversalScraper:
             "data": self.all_data
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(output, f, ensure_ascii=False, indent=2)
+        # orjson 直接输出 UTF-8 字节（等价于 ensure_ascii=False），比标准库 json 快得多
+        with open(filename, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
         
-        print(f"\n💾 数据已保存到: {filename}")
-        print(f"   总条目: {len(self.all_data)}")
+        logger.info(f"\n💾 数据已保存到: {filename}")
+        logger.info(f"   总条目: {len(self.all_data)}")
+        _flush_log()
         
         return filename
     
@@ -3,12 +3,29 @@
 让 Agent 能够使用通用抓取功能
 """
 
+import orjson
 from langchain_core.tools import StructuredTool
-from playwright.async_api import Browser
+from playwright.async_api import Browser, Page
 from typing import List, Dict, Optional
 from .scraper import UniversalScraper, create_scraper_config
 
 
+def _parse_fields(raw: str) -> Dict[str, str]:
+    """
+    解析并校验字段配置 JSON（一次完成解码和结构检查）
+    
+    Raises:
+        ValueError: 不是合法 JSON，或不是 {"字段名": "CSS选择器"} 形式的非空对象
+    """
+    fields = orjson.loads(raw)  # orjson.JSONDecodeError 是 ValueError 的子类
+    if not isinstance(fields, dict) or not fields:
+        raise ValueError('字段配置必须是非空 JSON 对象，格式: {"字段名": "CSS选择器"}')
+    for name, selector in fields.items():
+        if not isinstance(selector, str) or not selector.strip():
+            raise ValueError(f"字段 [{name}] 的选择器必须是非空字符串")
+    return fields
+
+
 def get_universal_scraping_tools(browser: Browser) -> List[StructuredTool]:
     """
     创建通用抓取工具集
@@ -20,14 +37,32 @@ def get_universal_scraping_tools(browser: Browser) -> List[StructuredTool]:
         工具列表
     """
     
+    # 缓存当前活跃页面；页面关闭或上下文中打开新标签页后重新解析
+    cached_page: Optional[Page] = None
+    watched_contexts = set()
+    
+    def forget_page(_page=None):
+        nonlocal cached_page
+        cached_page = None
+    
     async def get_current_page():
         """获取当前活跃页面"""
+        nonlocal cached_page
+        if cached_page is not None and not cached_page.is_closed():
+            return cached_page
+        
         if not browser.contexts:
             raise RuntimeError("No browser context found")
         context = browser.contexts[0]
         if not context.pages:
             raise RuntimeError("No pages open")
-        return context.pages[-1]
+        
+        if id(context) not in watched_contexts:
+            watched_contexts.add(id(context))
+            context.on("page", forget_page)
+        
+        cached_page = context.pages[-1]
+        return cached_page
     
     # ==========================================
     # 工具 1: 通用数据抓取（简化版）
@@ -62,13 +97,11 @@ def get_universal_scraping_tools(browser: Browser) -> List[StructuredTool]:
             container_selector = ".list-group-item"
         """
         try:
-            import json
-            
             # 解析字段配置
             try:
-                fields_dict = json.loads(fields)
-            except:
-                return "❌ 字段配置解析失败，请确保是有效的JSON格式"
+                fields_dict = _parse_fields(fields)
+            except ValueError as e:
+                return f"❌ 字段配置解析失败，请确保是有效的JSON格式: {e}"
             
             page = await get_current_page()
             
@@ -125,10 +158,8 @@ def get_universal_scraping_tools(browser: Browser) -> List[StructuredTool]:
             抓取结果
         """
         try:
-            import json
-            
             # 解析字段
-            fields_dict = json.loads(fields_json)
+            fields_dict = _parse_fields(fields_json)
             
             page = await get_current_page()
             
@@ -181,9 +212,7 @@ def get_universal_scraping_tools(browser: Browser) -> List[StructuredTool]:
             预览数据
         """
         try:
-            import json
-            
-            fields_dict = json.loads(fields)
+            fields_dict = _parse_fields(fields)
             page = await get_current_page()
             
             # 创建配置（不分页）
@@ -205,7 +234,7 @@ def get_universal_scraping_tools(browser: Browser) -> List[StructuredTool]:
             preview_data = data[:limit]
             
             result = f"📊 预览抓取结果（前 {len(preview_data)} 条）:\n\n"
-            result += json.dumps(preview_data, ensure_ascii=False, indent=2)
+            result += orjson.dumps(preview_data, option=orjson.OPT_INDENT_2).decode()
             
             return result
             
@@ -12,7 +12,14 @@
     task_viz.generate_project_chart()
 """
 
-from .visualizer import Visualizer
-
 __version__ = '2.0.0'
 __all__ = ['Visualizer']
+
+
+def __getattr__(name):
+    # 首次访问 Visualizer 时才导入 matplotlib/numpy，
+    # 只导入本包而不画图的脚本不承担其导入开销
+    if name == 'Visualizer':
+        from .visualizer import Visualizer
+        return Visualizer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,10 +2,15 @@
 可视化配置文件
 """
 
-# 图表样式配置
-CHART_CONFIG = {
+import copy
+from collections.abc import Mapping
+from types import MappingProxyType
+
+# 图表样式配置（只读，各层均为 MappingProxyType，防止被调用方意外修改；
+# 需要自定义时用 copy_chart_config() 取得可修改的副本，改完传给 Visualizer(config=...)）
+CHART_CONFIG = MappingProxyType({
     # 图表尺寸
-    'figsize': {
+    'figsize': MappingProxyType({
         'bar': (12, 6),
         'line': (14, 6),
         'pie': (10, 8),
@@ -13,25 +18,46 @@ CHART_CONFIG = {
         'horizontal_bar': (12, 10),
         'heatmap': (16, 8),
         'dashboard': (16, 10),
-    },
+    }),
     
     # 颜色方案
-    'colors': {
-        'primary': ['#E74C3C', '#3498DB', '#2ECC71', '#F39C12', '#9B59B6', 
-                    '#1ABC9C', '#E67E22', '#95A5A6'],
+    'colors': MappingProxyType({
+        'primary': ('#E74C3C', '#3498DB', '#2ECC71', '#F39C12', '#9B59B6', 
+                    '#1ABC9C', '#E67E22', '#95A5A6'),
         'bar': '#4A90E2',
         'line': '#E74C3C',
-    },
+    }),
     
     # 字体大小
-    'fontsize': {
+    'fontsize': MappingProxyType({
         'title': 14,
         'label': 12,
         'tick': 9,
         'legend': 10,
-    },
+    }),
     
-    # DPI设置
+    # DPI设置（preview_dpi 用于预览模式，见 Visualizer 的 preview 参数）
     'dpi': 300,
-}
+    'preview_dpi': 90,
+    
+    # PNG 压缩级别（0-9）：程序化生成的图表更看重速度，默认用低压缩级别
+    'png_compress_level': 1,
+})
 
+
+def copy_chart_config(config=None):
+    """
+    复制图表配置为可修改的普通字典（各层映射都转为 dict，可序列化）
+    
+    Args:
+        config (Mapping, optional): 要复制的配置。 Defaults to CHART_CONFIG.
+        
+    Returns:
+        dict: 配置的深拷贝。
+    """
+    if config is None:
+        config = CHART_CONFIG
+    return {
+        key: copy_chart_config(value) if isinstance(value, Mapping) else copy.deepcopy(value)
+        for key, value in config.items()
+    }
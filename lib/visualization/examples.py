@@ -223,8 +223,9 @@ def example_custom_data():
     experiments = ['实验A', '实验B', '实验C', '实验D', '实验E']
     success_rates = [0.85, 0.92, 0.78, 0.88, 0.95]
     
-    # 转换为字典
-    data = dict(zip(experiments, [rate * 100 for rate in success_rates]))
+    # 向量化换算为百分比后转换为字典
+    rates = np.asarray(success_rates) * 100
+    data = dict(zip(experiments, rates.tolist()))
     
     viz.bar_chart(
         data=data,
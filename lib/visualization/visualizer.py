@@ -2,18 +2,131 @@
 通用数据可视化工具类
 提供各种图表的通用生成方法
 """
+import io
 import os
-import matplotlib.pyplot as plt
+import sys
+import pickle
+import logging
+import hashlib
+import inspect
+from pathlib import Path
+from functools import lru_cache, wraps
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import matplotlib
 import numpy as np
+from matplotlib import font_manager
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.colors import LinearSegmentedColormap
-from config import CHART_CONFIG
+from matplotlib.transforms import Bbox
+from PIL import Image
+from config import CHART_CONFIG, copy_chart_config
 
-# 解决中文显示问题
-matplotlib.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'SimHei', 'STHeiti']
+# 中文字体候选（按优先级）
+_CJK_FONT_CANDIDATES = ('Arial Unicode MS', 'SimHei', 'STHeiti')
+
+
+def _resolve_cjk_font():
+    """在已安装字体中找出第一个可用的中文字体族（只在导入时查找一次）"""
+    installed = {font.name for font in font_manager.fontManager.ttflist}
+    return next((family for family in _CJK_FONT_CANDIDATES if family in installed), None)
+
+
+# 解决中文显示问题：只把实际存在的字体放到首位，其余保留默认字体列表，
+# 避免每段文字渲染时都为缺失的字体族重复查找并告警
+_CJK_FONT = _resolve_cjk_font()
+if _CJK_FONT:
+    matplotlib.rcParams['font.sans-serif'] = [_CJK_FONT, *matplotlib.rcParams['font.sans-serif']]
 matplotlib.rcParams['axes.unicode_minus'] = False
 
 
+def _create_logger():
+    """
+    创建模块日志器
+    
+    输出格式与原先的 print 相同（只输出消息本身）。生产环境或批量出图时
+    可把本模块日志器的级别设为 WARNING，统一关闭生成信息。
+    """
+    log = logging.getLogger(__name__)
+    if log.handlers:
+        return log
+    
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    return log
+
+
+logger = _create_logger()
+
+# 预览模式的默认 DPI（配置中未指定 preview_dpi 时使用）
+_PREVIEW_DPI = 90
+
+# 默认 PNG 压缩级别（0-9，配置中未指定 png_compress_level 时使用）：
+# 1 的编码速度约为默认 6 的两倍，文件稍大
+_PNG_COMPRESS_LEVEL = 1
+
+
+@lru_cache(maxsize=8)
+def _colormap_from_list(colors, n=100):
+    """由颜色列表构造渐变色映射（相同颜色列表只构造一次）"""
+    return LinearSegmentedColormap.from_list('custom', colors, N=n)
+
+
+@lru_cache(maxsize=64)
+def _horizontal_bar_colors(n):
+    """横向柱状图的 n 个渐变颜色（相同数量只采样一次，返回只读数组）"""
+    colors = matplotlib.colormaps['RdYlGn_r'](np.linspace(0.3, 0.7, n))
+    colors.setflags(write=False)
+    return colors
+
+
+# 热力图默认色映射（白 -> 黄 -> 红）
+_DEFAULT_HEATMAP_CMAP = _colormap_from_list((
+    '#ffffff', '#ffffcc', '#ffeda0', '#fed976', '#feb24c',
+    '#fd8d3c', '#fc4e2a', '#e31a1c', '#bd0026'
+))
+
+
+def _skip_unchanged(method):
+    """
+    图表方法装饰器：输入未变化且输出文件仍存在时跳过渲染
+    
+    对 (方法名, 全部参数, DPI, 配置) 计算指纹，写入输出文件旁的 .fp 文件；
+    仅在 Visualizer 开启 skip_unchanged 时生效。
+    """
+    signature = inspect.signature(method)
+    
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.skip_unchanged:
+            return method(self, *args, **kwargs)
+        
+        filename = signature.bind(self, *args, **kwargs).arguments['filename']
+        filepath = str(self.output_dir / filename)
+        fp_path = Path(filepath + '.fp')
+        try:
+            payload = pickle.dumps((method.__name__, args, sorted(kwargs.items()),
+                                    self.dpi, repr(self.config)), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # 参数无法序列化时无法判断是否变化，直接渲染
+            return method(self, *args, **kwargs)
+        fingerprint = hashlib.blake2b(payload, digest_size=16).hexdigest()
+        
+        if os.path.exists(filepath) and fp_path.is_file() and fp_path.read_text() == fingerprint:
+            if self.verbose:
+                logger.info(f"✓ 数据未变化，跳过生成: {filepath}")
+            return filepath
+        
+        result = method(self, *args, **kwargs)
+        fp_path.write_text(fingerprint)
+        return result
+    
+    return wrapper
+
+
 class Visualizer:
     """
     通用可视化工具类
@@ -22,19 +135,212 @@ class Visualizer:
     它使用 Matplotlib 库进行绘图，并提供了灵活的配置选项。
     """
     
-    def __init__(self, output_dir, config=None):
+    def __init__(self, output_dir, config=None, verbose=True, preview=None,
+                 skip_unchanged=False, png_compress_level=None, async_write=False):
         """
         初始化可视化工具
         
         Args:
-            output_dir (str): 图表输出目录的路径。
+            output_dir (str or Path): 图表输出目录的路径。
             config (dict, optional): 自定义配置字典，如果未提供，则使用默认配置。 
                                      Defaults to None.
+            verbose (bool, optional): 是否通过模块日志器输出生成信息。 Defaults to True.
+            preview (bool, optional): 预览模式，以较低 DPI 直接渲染（像素数约为正式输出的 1/10，
+                                      适合开发时反复出图）。文件名不变，下游读取的始终是当前模式的输出。
+                                      为 None 时由环境变量 VIZ_PREVIEW 决定。 Defaults to None.
+            skip_unchanged (bool, optional): 输入数据与参数未变化且输出文件存在时跳过渲染，
+                                             指纹保存在输出文件旁的 .fp 文件中。 Defaults to False.
+            png_compress_level (int, optional): PNG 压缩级别（0-9），越大文件越小、编码越慢。
+                                                为 None 时使用配置中的 png_compress_level。
+                                                Defaults to None.
+            async_write (bool, optional): 由后台线程写文件，图表方法编码完即返回，
+                                          下一张图的绘制与上一张的磁盘写入重叠。
+                                          需要读取输出文件前调用 flush()。 Defaults to False.
         """
-        self.output_dir = output_dir
+        self.output_dir = Path(output_dir)
         self.config = config or CHART_CONFIG
-        os.makedirs(self.output_dir, exist_ok=True)
+        self.verbose = verbose
+        if preview is None:
+            preview = bool(os.environ.get('VIZ_PREVIEW'))
+        self.preview = preview
+        self.skip_unchanged = skip_unchanged
+        if png_compress_level is None:
+            png_compress_level = self.config.get('png_compress_level', _PNG_COMPRESS_LEVEL)
+        self.png_compress_level = png_compress_level
+        # 单线程写入保证同一文件的多次写入（如 update_panel）按顺序落盘
+        self._writer = ThreadPoolExecutor(max_workers=1) if async_write else None
+        self._pending_writes = []
+        # 只按目标 DPI 渲染一次（正式输出用配置 DPI，预览用低 DPI）
+        self.dpi = self.config.get('preview_dpi', _PREVIEW_DPI) if preview else self.config['dpi']
+        # 目录已存在时跳过创建（批量构造 Visualizer 时少一次系统调用）
+        if not self.output_dir.is_dir():
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # 按尺寸缓存的 Figure（直接绑定 Agg 画布，不经过 pyplot 全局状态）
+        self._figures = {}
+        # live_dashboard 的 Figure、面板和背景像素
+        self._live = None
+    
+    def _new_figure(self, figsize):
+        """
+        获取指定尺寸的空白 Figure
+        
+        同尺寸的 Figure 清空后复用，避免每张图重新创建 Figure 和画布。
+        
+        Args:
+            figsize (tuple): 图表尺寸。
+            
+        Returns:
+            matplotlib.figure.Figure: 已清空的 Figure 对象。
+        """
+        figsize = tuple(figsize)
+        fig = self._figures.get(figsize)
+        if fig is None:
+            fig = Figure(figsize=figsize)
+            FigureCanvasAgg(fig)
+            self._figures[figsize] = fig
+        else:
+            fig.clear()
+        return fig
+    
+    def batch_render(self, jobs, max_workers=None):
+        """
+        多进程并行生成一批图表。
+        
+        每张图表相互独立，Matplotlib 绘制过程大部分时间持有 GIL，
+        因此用进程池而不是线程池。每个工作进程只创建一次 Visualizer。
+        
+        Args:
+            jobs (list): 任务列表，每个元素为 (方法名, 位置参数元组, 关键字参数字典)，
+                         例如 ('bar_chart', (data, '标题', 'X', 'Y', 'a.png'), {})。
+            max_workers (int, optional): 最大进程数，默认为 CPU 核数。 Defaults to None.
+            
+        Returns:
+            list: 各任务生成的图表文件路径，顺序与 jobs 一致。
+        """
+        if not jobs:
+            return []
+        
+        # 默认配置在工作进程中直接使用；自定义配置可能含只读映射（MappingProxyType
+        # 不可序列化，spawn 启动方式下无法传给子进程），先转为普通字典
+        config = None if self.config is CHART_CONFIG else copy_chart_config(self.config)
+        max_workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+        options = {
+            'preview': self.preview,
+            'skip_unchanged': self.skip_unchanged,
+            'png_compress_level': self.png_compress_level,
+        }
+        
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(self.output_dir, config, options)) as executor:
+            filepaths = list(executor.map(_render_one, *zip(*jobs)))
+        
+        if self.verbose:
+            logger.info(f"✓ 批量生成 {len(filepaths)} 张图表: {self.output_dir}")
+        
+        return filepaths
+    
+    @staticmethod
+    def _split_items(data, sort_by=None, reverse=False):
+        """
+        把图表数据拆分为标签数组和数值数组
+        
+        数值用 np.fromiter 一次转换为 float64，排序用 NumPy 稳定排序，
+        相同值保持原有顺序（与 sorted 一致）。
+        
+        Args:
+            data (dict or list): {标签: 值} 的字典或 [(标签, 值)] 的列表。
+            sort_by (str, optional): 'value' 按值排序，'key' 按标签排序，None 保持原顺序。
+                                     Defaults to None.
+            reverse (bool, optional): 是否降序。 Defaults to False.
+            
+        Returns:
+            tuple: (标签字符串数组, 数值数组)，均为 np.ndarray。
+        """
+        if isinstance(data, dict):
+            keys, raw_values = list(data), data.values()
+        else:
+            keys = [item[0] for item in data]
+            raw_values = (item[1] for item in data)
+        
+        values = np.fromiter(raw_values, dtype=np.float64, count=len(keys))
+        # fromiter 保证得到一维对象数组（元组等标签不会被展开成多维）
+        keys = np.fromiter(keys, dtype=object, count=len(keys))
+        
+        if sort_by == 'value':
+            order = np.argsort(-values if reverse else values, kind='stable')
+        elif sort_by == 'key':
+            order = np.argsort(keys, kind='stable')
+            if reverse:
+                order = order[::-1]
+        else:
+            order = None
+        
+        if order is not None:
+            keys, values = keys[order], values[order]
+        
+        return keys.astype(str), values
+    
+    def _save(self, fig, filename):
+        """
+        调整布局并保存图表
+        
+        tight_layout 已把图例、刻度标签和总标题计入布局，
+        因此不再使用 bbox_inches='tight'（它会额外完整绘制一遍来测量边界）。
+        PNG 直接从 Agg 画布的像素缓冲编码，使用低压缩级别换取编码速度
+        （文件略大）；其他格式仍交给 savefig。两者都先编码到内存，
+        再一次性写入文件。
+        
+        Args:
+            fig (matplotlib.figure.Figure): 要保存的 Figure。
+            filename (str): 保存图表的文件名。
+            
+        Returns:
+            str: 生成图表的文件路径。
+        """
+        dpi = self.dpi
+        filepath = str(self.output_dir / filename)
+        
+        if not filename.lower().endswith('.png'):
+            fig.tight_layout()
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format=Path(filename).suffix[1:].lower() or None, dpi=dpi)
+            self._write_file(filepath, buffer.getbuffer())
+            return filepath
+        
+        fig.set_dpi(dpi)
+        fig.tight_layout()
+        fig.canvas.draw()
+        self._write_png(fig, filepath)
+        return filepath
     
+    def _write_png(self, fig, filepath):
+        """把 Agg 画布当前的像素缓冲编码为 PNG（不重新绘制）"""
+        buffer = io.BytesIO()
+        Image.fromarray(np.asarray(fig.canvas.buffer_rgba())).save(
+            buffer, format='PNG', optimize=False, compress_level=self.png_compress_level,
+            dpi=(self.dpi, self.dpi)
+        )
+        self._write_file(filepath, buffer.getbuffer())
+    
+    def _write_file(self, filepath, data):
+        """把编码好的图表字节一次写入文件（开启 async_write 时交给后台线程）"""
+        if self._writer is None:
+            _write_bytes(filepath, data)
+        else:
+            self._pending_writes.append(self._writer.submit(_write_bytes, filepath, data))
+    
+    def flush(self):
+        """
+        等待所有后台写入完成。
+        
+        未开启 async_write 时直接返回。写入失败的异常在这里抛出。
+        """
+        pending, self._pending_writes = self._pending_writes, []
+        for future in pending:
+            future.result()
+    
+    @_skip_unchanged
     def bar_chart(self, data, title, xlabel, ylabel, filename, 
                   figsize=None, color=None, show_values=True, sort=False):
         """
@@ -55,46 +361,38 @@ class Visualizer:
             str: 生成图表的文件路径。
         """
         # 数据处理
-        if isinstance(data, dict):
-            items = list(data.items())
-        else:
-            items = data
-        
-        if sort:
-            items = sorted(items, key=lambda x: x[1], reverse=True)
-        
-        labels = [str(item[0]) for item in items]
-        values = [float(item[1]) for item in items]
+        labels, values = self._split_items(data, sort_by='value' if sort else None, reverse=True)
         
         # 配置
         figsize = figsize or self.config['figsize']['bar']
         color = color or self.config['colors']['bar']
+        label_fs = self.config['fontsize']['label']
+        title_fs = self.config['fontsize']['title']
         
         # 绘图
-        plt.figure(figsize=figsize)
-        bars = plt.bar(range(len(labels)), values, color=color)
-        plt.xlabel(xlabel, fontsize=self.config['fontsize']['label'])
-        plt.ylabel(ylabel, fontsize=self.config['fontsize']['label'])
-        plt.title(title, fontsize=self.config['fontsize']['title'], fontweight='bold')
-        plt.xticks(range(len(labels)), labels, rotation=45, ha='right')
-        plt.grid(axis='y', alpha=0.3, linestyle='--')
+        fig = self._new_figure(figsize)
+        ax = fig.add_subplot()
+        x = np.arange(len(labels))
+        bars = ax.bar(x, values, color=color)
+        ax.set_xlabel(xlabel, fontsize=label_fs)
+        ax.set_ylabel(ylabel, fontsize=label_fs)
+        ax.set_title(title, fontsize=title_fs, fontweight='bold')
+        ax.set_xticks(x, labels, rotation=45, ha='right')
+        ax.grid(axis='y', alpha=0.3, linestyle='--')
         
         # 添加数值标签
         if show_values:
-            for bar, value in zip(bars, values):
-                plt.text(bar.get_x() + bar.get_width()/2, value, 
-                        f'{value:.1f}', ha='center', va='bottom', fontsize=9)
+            ax.bar_label(bars, fmt='%.1f', fontsize=9)
         
-        plt.tight_layout()
-        filepath = os.path.join(self.output_dir, filename)
-        plt.savefig(filepath, dpi=self.config['dpi'], bbox_inches='tight')
-        print(f"✓ 柱状图已生成: {filepath}")
-        plt.close()
+        filepath = self._save(fig, filename)
+        if self.verbose:
+            logger.info(f"✓ 柱状图已生成: {filepath}")
         
         return filepath
     
+    @_skip_unchanged
     def line_chart(self, data, title, xlabel, ylabel, filename,
-                   figsize=None, color=None, fill=True, show_values=True):
+                   figsize=None, color=None, fill=True, show_values=True, sort=True):
         """
         生成并保存一个折线图。
         
@@ -108,54 +406,54 @@ class Visualizer:
             color (str, optional): 线条颜色。 Defaults to None.
             fill (bool, optional): 是否填充线下方的区域。 Defaults to True.
             show_values (bool, optional): 是否在线条上显示数据点的值。 Defaults to True.
+            sort (bool, optional): 是否按标签排序；数据已按顺序排列时传 False 跳过排序。
+                                   Defaults to True.
             
         Returns:
             str: 生成图表的文件路径。
         """
         # 数据处理
-        if isinstance(data, dict):
-            items = sorted(data.items())
-        else:
-            items = sorted(data)
-        
-        labels = [str(item[0]) for item in items]
-        values = [float(item[1]) for item in items]
+        labels, values = self._split_items(data, sort_by='key' if sort else None)
         
         # 配置
         figsize = figsize or self.config['figsize']['line']
         color = color or self.config['colors']['line']
+        label_fs = self.config['fontsize']['label']
+        title_fs = self.config['fontsize']['title']
         
         # 绘图
-        plt.figure(figsize=figsize)
-        plt.plot(range(len(labels)), values, marker='o', linewidth=2,
+        fig = self._new_figure(figsize)
+        ax = fig.add_subplot()
+        x = np.arange(len(labels))
+        ax.plot(x, values, marker='o', linewidth=2,
                 markersize=6, color=color, label=ylabel)
         
         if fill:
-            plt.fill_between(range(len(labels)), values, alpha=0.3, color=color)
+            ax.fill_between(x, values, alpha=0.3, color=color)
         
-        plt.xlabel(xlabel, fontsize=self.config['fontsize']['label'])
-        plt.ylabel(ylabel, fontsize=self.config['fontsize']['label'])
-        plt.title(title, fontsize=self.config['fontsize']['title'], fontweight='bold')
-        plt.xticks(range(len(labels)), labels, rotation=45, ha='right')
-        plt.grid(True, alpha=0.3, linestyle='--')
-        plt.legend(loc='upper left')
+        ax.set_xlabel(xlabel, fontsize=label_fs)
+        ax.set_ylabel(ylabel, fontsize=label_fs)
+        ax.set_title(title, fontsize=title_fs, fontweight='bold')
+        ax.set_xticks(x, labels, rotation=45, ha='right')
+        ax.grid(True, alpha=0.3, linestyle='--')
+        ax.legend(loc='upper left')
         
         # 添加数值标签
         if show_values:
-            for x, y in zip(range(len(labels)), values):
-                if y > 0:
-                    plt.text(x, y, f'{y:.1f}', ha='center', va='bottom', fontsize=8)
+            # 只标注正值点，掩码一次筛选
+            positive = values > 0
+            for xi, y in zip(x[positive].tolist(), values[positive].tolist()):
+                ax.text(xi, y, f'{y:.1f}', ha='center', va='bottom', fontsize=8)
         
-        plt.tight_layout()
-        filepath = os.path.join(self.output_dir, filename)
-        plt.savefig(filepath, dpi=self.config['dpi'], bbox_inches='tight')
-        print(f"✓ 折线图已生成: {filepath}")
-        plt.close()
+        filepath = self._save(fig, filename)
+        if self.verbose:
+            logger.info(f"✓ 折线图已生成: {filepath}")
         
         return filepath
     
+    @_skip_unchanged
     def pie_chart(self, data, title, filename, figsize=None, 
-                  colors=None, show_legend=True):
+                  colors=None, show_legend=True, sort=True):
         """
         生成并保存一个饼图。
         
@@ -166,29 +464,28 @@ class Visualizer:
             figsize (tuple, optional): 图表尺寸。 Defaults to None.
             colors (list, optional): 颜色列表。 Defaults to None.
             show_legend (bool, optional): 是否显示图例。 Defaults to True.
+            sort (bool, optional): 是否按值降序排序；数据已排好序时传 False 跳过排序。
+                                   Defaults to True.
             
         Returns:
             str: 生成图表的文件路径。
         """
         # 数据处理
-        if isinstance(data, dict):
-            items = sorted(data.items(), key=lambda x: x[1], reverse=True)
-        else:
-            items = sorted(data, key=lambda x: x[1], reverse=True)
+        labels, sizes = self._split_items(data, sort_by='value' if sort else None, reverse=True)
         
         # 过滤掉0值
-        items = [(k, v) for k, v in items if v > 0]
-        
-        labels = [str(item[0]) for item in items]
-        sizes = [float(item[1]) for item in items]
+        positive = sizes > 0
+        labels, sizes = labels[positive], sizes[positive]
         
         # 配置
         figsize = figsize or self.config['figsize']['pie']
         colors = colors or self.config['colors']['primary']
+        title_fs = self.config['fontsize']['title']
         
         # 绘图
-        plt.figure(figsize=figsize)
-        wedges, texts, autotexts = plt.pie(
+        fig = self._new_figure(figsize)
+        ax = fig.add_subplot()
+        wedges, texts, autotexts = ax.pie(
             sizes, labels=labels, autopct='%1.1f%%',
             colors=colors[:len(labels)], startangle=90,
             textprops={'fontsize': 10}
@@ -200,22 +497,21 @@ class Visualizer:
             autotext.set_fontweight('bold')
             autotext.set_fontsize(9)
         
-        plt.title(title, fontsize=self.config['fontsize']['title'], 
-                 fontweight='bold', pad=20)
+        ax.set_title(title, fontsize=title_fs, 
+                     fontweight='bold', pad=20)
         
         # 添加图例
         if show_legend:
             legend_labels = [f'{label}: {size:.1f}' for label, size in zip(labels, sizes)]
-            plt.legend(legend_labels, loc='center left', bbox_to_anchor=(1, 0, 0.5, 1))
+            ax.legend(legend_labels, loc='center left', bbox_to_anchor=(1, 0, 0.5, 1))
         
-        plt.tight_layout()
-        filepath = os.path.join(self.output_dir, filename)
-        plt.savefig(filepath, dpi=self.config['dpi'], bbox_inches='tight')
-        print(f"✓ 饼图已生成: {filepath}")
-        plt.close()
+        filepath = self._save(fig, filename)
+        if self.verbose:
+            logger.info(f"✓ 饼图已生成: {filepath}")
         
         return filepath
     
+    @_skip_unchanged
     def stacked_bar_chart(self, data, title, xlabel, ylabel, filename,
                          figsize=None, colors=None):
         """
@@ -239,45 +535,49 @@ class Visualizer:
             subcat for subdata in data.values() for subcat in subdata.keys()
         ))
         
-        # 构建数据矩阵
-        data_matrix = []
-        for subcat in subcategories:
-            row = [data[cat].get(subcat, 0) for cat in categories]
-            data_matrix.append(row)
+        # 构建数据矩阵（行: 子类别，列: 主类别），只遍历一次实际存在的数据
+        sub_index = {subcat: i for i, subcat in enumerate(subcategories)}
+        data_matrix = np.zeros((len(subcategories), len(categories)))
+        for j, subdata in enumerate(data.values()):
+            for subcat, value in subdata.items():
+                data_matrix[sub_index[subcat], j] = value
+        
+        # 每层的起始高度为之前各层的累计和
+        bottoms = np.cumsum(data_matrix, axis=0) - data_matrix
         
         # 配置
         figsize = figsize or self.config['figsize']['stacked_bar']
         colors = colors or self.config['colors']['primary']
+        label_fs = self.config['fontsize']['label']
+        title_fs = self.config['fontsize']['title']
         
         # 绘图
-        fig, ax = plt.subplots(figsize=figsize)
+        fig = self._new_figure(figsize)
+        ax = fig.add_subplot()
         x = np.arange(len(categories))
         width = 0.6
         
-        bottom = np.zeros(len(categories))
-        for i, (subcat, values) in enumerate(zip(subcategories, data_matrix)):
-            ax.bar(x, values, width, label=subcat, bottom=bottom,
+        for i, subcat in enumerate(subcategories):
+            ax.bar(x, data_matrix[i], width, label=subcat, bottom=bottoms[i],
                   color=colors[i % len(colors)])
-            bottom += values
         
-        ax.set_xlabel(xlabel, fontsize=self.config['fontsize']['label'])
-        ax.set_ylabel(ylabel, fontsize=self.config['fontsize']['label'])
-        ax.set_title(title, fontsize=self.config['fontsize']['title'], fontweight='bold')
+        ax.set_xlabel(xlabel, fontsize=label_fs)
+        ax.set_ylabel(ylabel, fontsize=label_fs)
+        ax.set_title(title, fontsize=title_fs, fontweight='bold')
         ax.set_xticks(x)
         ax.set_xticklabels(categories, rotation=45, ha='right')
         ax.legend(loc='upper left', bbox_to_anchor=(1, 1))
         ax.grid(axis='y', alpha=0.3, linestyle='--')
         
-        plt.tight_layout()
-        filepath = os.path.join(self.output_dir, filename)
-        plt.savefig(filepath, dpi=self.config['dpi'], bbox_inches='tight')
-        print(f"✓ 堆积柱状图已生成: {filepath}")
-        plt.close()
+        filepath = self._save(fig, filename)
+        if self.verbose:
+            logger.info(f"✓ 堆积柱状图已生成: {filepath}")
         
         return filepath
     
+    @_skip_unchanged
     def horizontal_bar_chart(self, data, title, xlabel, filename,
-                            figsize=None, top_n=None, show_values=True):
+                            figsize=None, top_n=None, show_values=True, sort=True):
         """
         生成并保存一个横向柱状图。
         
@@ -289,65 +589,63 @@ class Visualizer:
             figsize (tuple, optional): 图表尺寸。 Defaults to None.
             top_n (int, optional): 只显示前N个。 Defaults to None.
             show_values (bool, optional): 是否显示数值标签。 Defaults to True.
+            sort (bool, optional): 是否按值降序排序；数据已排好序时传 False 跳过排序。
+                                   Defaults to True.
             
         Returns:
             str: 生成图表的文件路径。
         """
         # 数据处理
-        if isinstance(data, dict):
-            items = sorted(data.items(), key=lambda x: x[1], reverse=True)
-        else:
-            items = sorted(data, key=lambda x: x[1], reverse=True)
+        labels, values = self._split_items(data, sort_by='value' if sort else None, reverse=True)
         
         if top_n:
-            items = items[:top_n]
+            labels, values = labels[:top_n], values[:top_n]
         
-        # 截断过长的标签
-        labels = [str(item[0])[:40] + '...' if len(str(item[0])) > 40 
-                 else str(item[0]) for item in items]
-        values = [float(item[1]) for item in items]
+        # 截断过长的标签（转为 <U40 即截取前 40 个字符）
+        labels = np.where(np.char.str_len(labels) > 40,
+                          np.char.add(labels.astype('<U40'), '...'), labels)
         
         # 配置
         figsize = figsize or self.config['figsize']['horizontal_bar']
+        label_fs = self.config['fontsize']['label']
+        title_fs = self.config['fontsize']['title']
         
         # 绘图
-        plt.figure(figsize=figsize)
+        fig = self._new_figure(figsize)
+        ax = fig.add_subplot()
         y_pos = np.arange(len(labels))
-        colors = plt.cm.RdYlGn_r(np.linspace(0.3, 0.7, len(labels)))
-        bars = plt.barh(y_pos, values, color=colors)
+        colors = _horizontal_bar_colors(len(labels))
+        bars = ax.barh(y_pos, values, color=colors)
         
-        plt.xlabel(xlabel, fontsize=self.config['fontsize']['label'])
-        plt.title(title, fontsize=self.config['fontsize']['title'], fontweight='bold')
-        plt.yticks(y_pos, labels, fontsize=9)
-        plt.grid(axis='x', alpha=0.3, linestyle='--')
+        ax.set_xlabel(xlabel, fontsize=label_fs)
+        ax.set_title(title, fontsize=title_fs, fontweight='bold')
+        ax.set_yticks(y_pos, labels, fontsize=9)
+        ax.grid(axis='x', alpha=0.3, linestyle='--')
         
         # 添加数值标签
         if show_values:
-            for bar, value in zip(bars, values):
-                plt.text(value, bar.get_y() + bar.get_height()/2, f' {value:.1f}',
-                        va='center', fontsize=9, fontweight='bold')
+            ax.bar_label(bars, fmt=' %.1f', fontsize=9, fontweight='bold')
         
-        plt.tight_layout()
-        filepath = os.path.join(self.output_dir, filename)
-        plt.savefig(filepath, dpi=self.config['dpi'], bbox_inches='tight')
-        print(f"✓ 横向柱状图已生成: {filepath}")
-        plt.close()
+        filepath = self._save(fig, filename)
+        if self.verbose:
+            logger.info(f"✓ 横向柱状图已生成: {filepath}")
         
         return filepath
     
+    @_skip_unchanged
     def heatmap(self, data, row_labels, col_labels, title, filename,
                 figsize=None, cmap=None, show_values=True):
         """
         生成并保存一个热力图。
         
         Args:
-            data (list or np.ndarray): 二维数组或矩阵。
+            data (list or np.ndarray): 二维数组或矩阵（大矩阵可直接传入 np.memmap）。
             row_labels (list): 行标签列表。
             col_labels (list): 列标签列表。
             title (str): 图表标题。
             filename (str): 保存图表的文件名。
             figsize (tuple, optional): 图表尺寸。 Defaults to None.
-            cmap (str or Colormap, optional): 颜色映射。 Defaults to None.
+            cmap (str, Colormap or list, optional): 颜色映射，也可以是颜色列表。 Defaults to None.
             show_values (bool, optional): 是否在热力图单元格中显示数值。 Defaults to True.
             
         Returns:
@@ -355,17 +653,23 @@ class Visualizer:
         """
         # 配置
         figsize = figsize or self.config['figsize']['heatmap']
+        title_fs = self.config['fontsize']['title']
         
         if cmap is None:
-            colors_list = ['#ffffff', '#ffffcc', '#ffeda0', '#fed976', '#feb24c',
-                          '#fd8d3c', '#fc4e2a', '#e31a1c', '#bd0026']
-            cmap = LinearSegmentedColormap.from_list('custom', colors_list, N=100)
-        
-        # 确保数据是numpy数组
-        matrix = np.array(data)
+            cmap = _DEFAULT_HEATMAP_CMAP
+        elif isinstance(cmap, (list, tuple)):
+            cmap = _colormap_from_list(tuple(cmap))
+        
+        # 浮点 ndarray（包括 np.memmap）按原精度直接使用，不复制；
+        # 其他输入转为 float64（数值标签由它格式化，float32 会改变舍入结果和大整数）
+        if isinstance(data, np.ndarray) and data.dtype.kind == 'f':
+            matrix = np.ascontiguousarray(data)
+        else:
+            matrix = np.asarray(data, dtype=np.float64)
         
         # 绘图
-        fig, ax = plt.subplots(figsize=figsize)
+        fig = self._new_figure(figsize)
+        ax = fig.add_subplot()
         im = ax.imshow(matrix, cmap=cmap, aspect='auto')
         
         # 设置坐标轴
@@ -376,29 +680,33 @@ class Visualizer:
         
         # 添加数值标签
         if show_values:
-            for i in range(len(row_labels)):
-                for j in range(len(col_labels)):
-                    if matrix[i, j] > 0:
-                        text_color = "white" if matrix[i, j] > matrix.max()/2 else "black"
-                        ax.text(j, i, f'{matrix[i, j]:.1f}',
-                               ha="center", va="center", color=text_color,
-                               fontsize=8, fontweight='bold')
-        
-        ax.set_title(title, fontsize=self.config['fontsize']['title'],
+            # 只为正值单元格添加文字；颜色和文本一次性向量化计算
+            positive = matrix > 0
+            rows, cols = np.nonzero(positive)
+            cell_values = matrix[positive]
+            texts = np.char.mod('%.1f', cell_values)
+            half_max = matrix.max() / 2
+            text_colors = np.where(cell_values > half_max, "white", "black")
+            # tolist 一次转为 Python 原生类型，避免逐个 NumPy 标量传给 ax.text
+            for i, j, text, text_color in zip(rows.tolist(), cols.tolist(),
+                                              texts.tolist(), text_colors.tolist()):
+                ax.text(j, i, text, ha="center", va="center", color=text_color,
+                        fontsize=8, fontweight='bold')
+        
+        ax.set_title(title, fontsize=title_fs,
                     fontweight='bold', pad=20)
         
         # 添加颜色条
-        cbar = plt.colorbar(im, ax=ax)
+        cbar = fig.colorbar(im, ax=ax)
         cbar.set_label('值', rotation=270, labelpad=20)
         
-        plt.tight_layout()
-        filepath = os.path.join(self.output_dir, filename)
-        plt.savefig(filepath, dpi=self.config['dpi'], bbox_inches='tight')
-        print(f"✓ 热力图已生成: {filepath}")
-        plt.close()
+        filepath = self._save(fig, filename)
+        if self.verbose:
+            logger.info(f"✓ 热力图已生成: {filepath}")
         
         return filepath
     
+    @_skip_unchanged
     def multi_chart_dashboard(self, charts_config, title, filename, figsize=None):
         """
         生成并保存一个多图表仪表盘。
@@ -415,45 +723,138 @@ class Visualizer:
         """
         figsize = figsize or self.config['figsize']['dashboard']
         
-        fig = plt.figure(figsize=figsize)
+        fig = self._new_figure(figsize)
         
         # 根据配置绘制每个子图
         for position, chart_type, data, config in charts_config:
-            ax = fig.add_subplot(position)
+            self._draw_subplot(fig.add_subplot(position), chart_type, data, config)
+        
+        fig.suptitle(title, fontsize=16, fontweight='bold', y=0.98)
+        
+        filepath = self._save(fig, filename)
+        if self.verbose:
+            logger.info(f"✓ 仪表盘已生成: {filepath}")
+        
+        return filepath
+    
+    def live_dashboard(self, charts_config, title, filename, figsize=None):
+        """
+        生成一个可按面板增量更新的仪表盘。
+        
+        首次完整绘制并保存；之后用 update_panel 只重绘变化的子图，
+        其余面板的像素直接保留（Agg 画布的 blit 方式），
+        单次更新的开销约等于绘制一个子图。
+        
+        Args:
+            charts_config (list): 图表配置列表，格式同 multi_chart_dashboard。
+            title (str): 总标题。
+            filename (str): 保存文件名（每次更新都覆盖该文件，需为 PNG）。
+            figsize (tuple, optional): 图表尺寸。 Defaults to None.
             
-            if chart_type == 'bar':
-                self._draw_bar_subplot(ax, data, config)
-            elif chart_type == 'pie':
-                self._draw_pie_subplot(ax, data, config)
-            elif chart_type == 'line':
-                self._draw_line_subplot(ax, data, config)
-            elif chart_type == 'text':
-                self._draw_text_subplot(ax, data, config)
+        Returns:
+            str: 生成图表的文件路径。
+        """
+        figsize = figsize or self.config['figsize']['dashboard']
+        
+        # 独立的 Figure，不进入 _figures 缓存（否则其他同尺寸图表会把它清空）
+        fig = Figure(figsize=figsize, dpi=self.dpi)
+        canvas = FigureCanvasAgg(fig)
+        
+        panels = []
+        for position, chart_type, data, config in charts_config:
+            ax = fig.add_subplot(position)
+            self._draw_subplot(ax, chart_type, data, config)
+            panels.append((ax, chart_type, config))
         
         fig.suptitle(title, fontsize=16, fontweight='bold', y=0.98)
+        fig.tight_layout()
+        
+        # 先画出不含子图的背景，用于之后擦除单个面板
+        for ax, _, _ in panels:
+            ax.set_visible(False)
+        canvas.draw()
+        background = canvas.copy_from_bbox(fig.bbox)
+        for ax, _, _ in panels:
+            ax.set_visible(True)
+        canvas.draw()
         
-        plt.tight_layout()
-        filepath = os.path.join(self.output_dir, filename)
-        plt.savefig(filepath, dpi=self.config['dpi'], bbox_inches='tight')
-        print(f"✓ 仪表盘已生成: {filepath}")
-        plt.close()
+        filepath = str(self.output_dir / filename)
+        self._write_png(fig, filepath)
+        self._live = {'fig': fig, 'panels': panels, 'background': background, 'filepath': filepath}
+        
+        if self.verbose:
+            logger.info(f"✓ 仪表盘已生成: {filepath}")
         
         return filepath
     
+    def update_panel(self, index, data):
+        """
+        更新 live_dashboard 中的一个面板并重新保存。
+        
+        Args:
+            index (int): 面板序号（charts_config 中的位置）。
+            data (dict or str): 新的图表数据（文本面板为字符串）。
+            
+        Returns:
+            str: 生成图表的文件路径。
+        """
+        live = self._live
+        if live is None:
+            raise RuntimeError("请先调用 live_dashboard 创建仪表盘")
+        
+        fig, panels = live['fig'], live['panels']
+        canvas = fig.canvas
+        renderer = canvas.get_renderer()
+        ax, chart_type, config = panels[index]
+        
+        # 需要擦除的区域：旧内容与新内容（含刻度标签、标题）的并集
+        old_box = ax.get_tightbbox(renderer)
+        ax.cla()
+        self._draw_subplot(ax, chart_type, data, config)
+        region = Bbox.union([old_box, ax.get_tightbbox(renderer)])
+        
+        # 恢复该区域的背景后只重绘与之相交的面板
+        # restore_region 的 bbox 以画布左上角为原点（需要翻转 y），
+        # xy 为保存区域本身的原点；四周各多留 2 像素覆盖抗锯齿边缘
+        height = fig.bbox.height
+        x0, y0, x1, y1 = region.padded(2).extents
+        canvas.restore_region(live['background'], bbox=(x0, height - y1, x1, height - y0),
+                              xy=(0, 0))
+        for other, _, _ in panels:
+            if other is ax or other.get_tightbbox(renderer).overlaps(region):
+                fig.draw_artist(other)
+        
+        self._write_png(fig, live['filepath'])
+        if self.verbose:
+            logger.info(f"✓ 仪表盘面板 {index} 已更新: {live['filepath']}")
+        
+        return live['filepath']
+    
+    def _draw_subplot(self, ax, chart_type, data, config):
+        """按类型在 `Axes` 上绘制一个仪表盘子图"""
+        if chart_type == 'bar':
+            self._draw_bar_subplot(ax, data, config)
+        elif chart_type == 'pie':
+            self._draw_pie_subplot(ax, data, config)
+        elif chart_type == 'line':
+            self._draw_line_subplot(ax, data, config)
+        elif chart_type == 'text':
+            self._draw_text_subplot(ax, data, config)
+    
     def _draw_bar_subplot(self, ax, data, config):
         """
         在给定的 `Axes` 对象上绘制一个柱状图子图。
 
         Args:
             ax (matplotlib.axes.Axes): 用于绘图的 `Axes` 对象。
-            data (dict): 图表数据，格式为 {标签: 值}。
+            data (dict or list): 图表数据，{标签: 值} 的字典或 [(标签, 值)] 的列表。
             config (dict): 图表配置。
         """
-        labels = list(data.keys())
-        values = list(data.values())
-        ax.bar(range(len(labels)), values, color=config.get('color', '#3498DB'))
+        labels, values = self._split_items(data)
+        x = np.arange(len(labels))
+        ax.bar(x, values, color=config.get('color', '#3498DB'))
         ax.set_title(config.get('title', ''), fontweight='bold')
-        ax.set_xticks(range(len(labels)))
+        ax.set_xticks(x)
         ax.set_xticklabels(labels, rotation=45, ha='right', fontsize=9)
         ax.grid(axis='y', alpha=0.3)
     
@@ -463,11 +864,10 @@ class Visualizer:
 
         Args:
             ax (matplotlib.axes.Axes): 用于绘图的 `Axes` 对象。
-            data (dict): 图表数据，格式为 {标签: 值}。
+            data (dict or list): 图表数据，{标签: 值} 的字典或 [(标签, 值)] 的列表。
             config (dict): 图表配置。
         """
-        labels = list(data.keys())
-        sizes = list(data.values())
+        labels, sizes = self._split_items(data)
         colors = config.get('colors', self.config['colors']['primary'])
         ax.pie(sizes, labels=labels, autopct='%1.1f%%', colors=colors, startangle=90)
         ax.set_title(config.get('title', ''), fontweight='bold')
@@ -478,16 +878,16 @@ class Visualizer:
 
         Args:
             ax (matplotlib.axes.Axes): 用于绘图的 `Axes` 对象。
-            data (dict): 图表数据，格式为 {标签: 值}。
+            data (dict or list): 图表数据，{标签: 值} 的字典或 [(标签, 值)] 的列表。
             config (dict): 图表配置。
         """
-        labels = list(data.keys())
-        values = list(data.values())
+        labels, values = self._split_items(data)
         color = config.get('color', '#E74C3C')
-        ax.plot(range(len(labels)), values, marker='o', color=color, linewidth=2)
-        ax.fill_between(range(len(labels)), values, alpha=0.3, color=color)
+        x = np.arange(len(labels))
+        ax.plot(x, values, marker='o', color=color, linewidth=2)
+        ax.fill_between(x, values, alpha=0.3, color=color)
         ax.set_title(config.get('title', ''), fontweight='bold')
-        ax.set_xticks(range(len(labels)))
+        ax.set_xticks(x)
         ax.set_xticklabels(labels, rotation=45, ha='right', fontsize=8)
         ax.grid(True, alpha=0.3)
     
@@ -504,3 +904,24 @@ class Visualizer:
         ax.text(0.1, 0.5, text, fontsize=config.get('fontsize', 11),
                verticalalignment='center', fontfamily='monospace',
                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.3))
+
+
+def _write_bytes(filepath, data):
+    """写入整个文件（缓冲写入会循环到全部字节写完，原始 FileIO.write 可能只写入一部分）"""
+    with open(filepath, 'wb') as f:
+        f.write(data)
+
+
+# 批量渲染工作进程中的 Visualizer（每个进程由 initializer 创建一次）
+_worker_visualizer = None
+
+
+def _init_worker(output_dir, config, options):
+    """进程池初始化：创建本进程复用的 Visualizer（不打印，避免争用标准输出）"""
+    global _worker_visualizer
+    _worker_visualizer = Visualizer(output_dir, config, verbose=False, **options)
+
+
+def _render_one(method_name, args, kwargs):
+    """在工作进程中生成一张图表"""
+    return getattr(_worker_visualizer, method_name)(*args, **kwargs)
@@ -1,10 +1,16 @@
 import mammoth
 from markdownify import markdownify as md
+import io
 import os
 import sys
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 
 # docx to md: https://github.com/microsoft/markitdown
 
+# 输出文件写缓冲大小
+_WRITE_BUFFER_SIZE = 1 << 20
+
 def convert_docx_to_markdown(docx_path, output_path=None):
     """
     将 docx 文件转换为 markdown，并处理标题风格
@@ -21,23 +27,37 @@ def convert_docx_to_markdown(docx_path, output_path=None):
         output_path = os.path.splitext(docx_path)[0] + ".md"
 
     try:
+        # 3. 计算内容哈希：输出文件存在且 .hash 记录的哈希一致时跳过转换
+        # 一次性读入整个文件（无缓冲，直接一次 read）
+        with open(docx_path, "rb", buffering=0) as docx_file:
+            blob = docx_file.read()
+        digest = hashlib.blake2b(blob, digest_size=16).hexdigest()
+        hash_path = output_path + ".hash"
+        if os.path.exists(output_path) and os.path.exists(hash_path):
+            with open(hash_path, encoding="utf-8") as hash_file:
+                if hash_file.read().strip() == digest:
+                    print(f"⏭️ 内容未变化，跳过: {docx_path}")
+                    return
+
         print(f"正在转换: {docx_path} ...")
 
-        # 3. 使用 mammoth 将 docx 转换为 HTML
+        # 4. 使用 mammoth 将 docx 转换为 HTML（直接使用已读入的内容，不再重复读文件）
         # mammoth 会尽量保留语义（如将 Word 的标题样式转为 <h1> 等）
-        with open(docx_path, "rb") as docx_file:
-            result = mammoth.convert_to_html(docx_file)
-            html_content = result.value
-            messages = result.messages # 警告信息
+        result = mammoth.convert_to_html(io.BytesIO(blob))
+        html_content = result.value
+        messages = result.messages # 警告信息
 
-        # 4. 使用 markdownify 将 HTML 转换为 Markdown
+        # 5. 使用 markdownify 将 HTML 转换为 Markdown
         # heading_style="ATX" 强制使用 # 符号作为标题，而不是下划线
         # strip=['a'] 如果你想去除链接，可以加上这个参数
         markdown_content = md(html_content, heading_style="ATX")
 
-        # 5. 写入 Markdown 文件
-        with open(output_path, "w", encoding="utf-8") as md_file:
+        # 6. 写入 Markdown 文件，成功后再记录哈希
+        # 缓冲区足够大，整篇内容一次写出（保留文本模式的换行转换）
+        with open(output_path, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as md_file:
             md_file.write(markdown_content)
+        with open(hash_path, "w", encoding="utf-8") as hash_file:
+            hash_file.write(digest)
         
         print(f"✅ 转换成功: {output_path}")
 
@@ -57,10 +77,18 @@ if __name__ == "__main__":
 
     # 或者支持命令行拖拽文件运行
     if len(sys.argv) > 1:
+        docx_files = []
         for file_path in sys.argv[1:]:
             if file_path.endswith(".docx"):
-                convert_docx_to_markdown(file_path)
+                docx_files.append(file_path)
             else:
                 print(f"跳过非 docx 文件: {file_path}")
+
+        # 各文档相互独立，多个文件时用进程池并行转换（解析均为 CPU 密集的纯 Python）
+        if len(docx_files) == 1:
+            convert_docx_to_markdown(docx_files[0])
+        elif docx_files:
+            with ProcessPoolExecutor(max_workers=min(len(docx_files), os.cpu_count() or 1)) as executor:
+                list(executor.map(convert_docx_to_markdown, docx_files))
     else:
         print("请将 .docx 文件拖放到此脚本上，或在代码中指定文件路径。")
\ No newline at end of file
@@ -10,8 +10,90 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
-from browser import BrowserManager
-from puppeteer import TableScraper
+# browser / puppeteer 会加载 Playwright、LangChain 等重量级依赖，在 quick_scrape 中按需导入，
+# --help / --version 无需等待
+
+
+def make_autoscale(args):
+    """--autoscale 时创建自适应并发控制（--concurrency 大于 1 时作为并发上限）"""
+    if not args.autoscale:
+        return None
+    from puppeteer import AutoscaledConcurrency
+    return AutoscaledConcurrency(max_concurrency=args.concurrency if args.concurrency > 1 else 20)
+
+
+async def scrape_pages(scraper, page, args) -> bool:
+    """导航到目标页面并按分页类型抓取，参数错误时返回 False"""
+    # 1. 导航到页面
+    print(f"🌐 访问: {args.url}")
+    # 只需要表格的 DOM：DOM 就绪后直接等待表格出现，不等待 networkidle
+    await page.goto(args.url, wait_until="domcontentloaded")
+    await page.wait_for_selector(args.table, state="attached", timeout=10000)
+    print("   ✓ 页面加载完成\n")
+    
+    # 2. 根据分页类型抓取
+    if args.pagination_type == "button":
+        print(f"📄 使用按钮分页抓取...")
+        if not args.next_button:
+            print("❌ 错误: 按钮分页需要 --next-button 参数")
+            return False
+        
+        await scraper.scrape_with_button_pagination(
+            table_selector=args.table,
+            next_button_selector=args.next_button,
+            max_pages=args.max_pages,
+            wait_time=args.wait
+        )
+    
+    elif args.pagination_type == "url":
+        print(f"📄 使用 URL 参数分页抓取...")
+        await scraper.scrape_with_url_params(
+            base_url=args.url,
+            table_selector=args.table,
+            page_param=args.page_param,
+            start_page=1,
+            max_pages=args.max_pages,
+            wait_time=args.wait,
+            concurrency=args.concurrency,
+            autoscale=make_autoscale(args)
+        )
+    
+    elif args.pagination_type == "none":
+        print(f"📄 提取单页表格...")
+        data = await scraper.extract_table(table_selector=args.table)
+        scraper.add_page(data)
+    
+    else:
+        print(f"❌ 不支持的分页类型: {args.pagination_type}")
+        return False
+    
+    return True
+
+
+async def scrape_pages_cdp(scraper, args) -> bool:
+    """使用原生 CDP 引擎抓取（仅支持单页和 URL 参数分页），参数错误时返回 False"""
+    if args.pagination_type == "url":
+        print(f"📄 使用 URL 参数分页抓取 (CDP)...")
+        await scraper.scrape_with_url_params(
+            base_url=args.url,
+            table_selector=args.table,
+            page_param=args.page_param,
+            start_page=1,
+            max_pages=args.max_pages,
+            wait_time=args.wait,
+            concurrency=args.concurrency,
+            autoscale=make_autoscale(args)
+        )
+    
+    elif args.pagination_type == "none":
+        print(f"📄 提取单页表格 (CDP)...")
+        await scraper.scrape_page(args.url, table_selector=args.table, wait_time=args.wait)
+    
+    else:
+        print(f"❌ CDP 引擎不支持分页类型: {args.pagination_type}（请使用 --engine playwright）")
+        return False
+    
+    return True
 
 
 async def quick_scrape(args):
@@ -26,67 +108,45 @@ async def quick_scrape(args):
     print(f"   表格选择器: {args.table}")
     print(f"   分页类型: {args.pagination_type}")
     print(f"   最大页数: {args.max_pages}")
+    if args.pagination_type == "url":
+        print(f"   并发页数: {'自适应' if args.autoscale else args.concurrency}")
+    print(f"   抓取引擎: {args.engine}")
+    print(f"   拦截资源: {'是' if args.block_resources else '否'}")
     print(f"   输出文件: {args.output}\n")
     
+    from browser import BrowserManager
+    from puppeteer import TableScraper, CDPTableScraper, StreamingTableWriter
+    
     try:
-        async with BrowserManager(mode=args.mode) as bm:
-            page = await bm.get_or_create_page()
-            scraper = TableScraper(page)
-            
-            # 1. 导航到页面
-            print(f"🌐 访问: {args.url}")
-            await page.goto(args.url)
-            await page.wait_for_load_state("networkidle")
-            print("   ✓ 页面加载完成\n")
-            
-            # 2. 根据分页类型抓取
-            if args.pagination_type == "button":
-                print(f"📄 使用按钮分页抓取...")
-                if not args.next_button:
-                    print("❌ 错误: 按钮分页需要 --next-button 参数")
-                    return
-                
-                await scraper.scrape_with_button_pagination(
-                    table_selector=args.table,
-                    next_button_selector=args.next_button,
-                    max_pages=args.max_pages,
-                    wait_time=args.wait
-                )
-            
-            elif args.pagination_type == "url":
-                print(f"📄 使用 URL 参数分页抓取...")
-                await scraper.scrape_with_url_params(
-                    base_url=args.url,
-                    table_selector=args.table,
-                    page_param=args.page_param,
-                    start_page=1,
-                    max_pages=args.max_pages,
-                    wait_time=args.wait
-                )
-            
-            elif args.pagination_type == "none":
-                print(f"📄 提取单页表格...")
-                data = await scraper.extract_table(table_selector=args.table)
-                scraper.all_data.append(data)
-            
+        # 每页提取后立即写入输出文件（.json / .parquet / 其余为 CSV），不在内存中累积所有行
+        with StreamingTableWriter(args.output) as writer:
+            if args.engine == "cdp":
+                # 直接通过 CDP 连接已开启远程调试的 Chrome，不经过 Playwright
+                async with CDPTableScraper(block_assets=args.block_resources, writer=writer) as scraper:
+                    if not await scrape_pages_cdp(scraper, args):
+                        return
             else:
-                print(f"❌ 不支持的分页类型: {args.pagination_type}")
-                return
+                async with BrowserManager(
+                    mode=args.mode,
+                    headless=args.headless,
+                    user_data_dir=args.user_data_dir
+                ) as bm:
+                    page = await bm.get_or_create_page()
+                    scraper = TableScraper(page, block_assets=args.block_resources, writer=writer)
+                    
+                    # 整个抓取过程（包括首次导航）都拦截图片/字体/音视频请求
+                    async with scraper.intercept_requests():
+                        if not await scrape_pages(scraper, page, args):
+                            return
             
-            # 3. 保存数据
             print()
-            if args.output.endswith('.json'):
-                scraper.save_to_json(args.output)
-            else:
-                scraper.save_to_csv(args.output)
-            
-            # 4. 显示摘要
-            merged = scraper.merge_all_data()
-            print(f"\n✅ 抓取完成!")
-            print(f"   总页数: {merged['total_pages']}")
-            print(f"   总行数: {merged['total_rows']}")
-            print(f"   列数: {len(merged['headers'])}")
-            print(f"   文件: {args.output}")
+        
+        # 显示摘要
+        print(f"\n✅ 抓取完成!")
+        print(f"   总页数: {writer.total_pages}")
+        print(f"   总行数: {writer.total_rows}")
+        print(f"   列数: {len(writer.headers or [])}")
+        print(f"   文件: {args.output}")
     
     except Exception as e:
         print(f"\n❌ 错误: {e}")
@@ -121,6 +181,43 @@ def main():
       --max-pages 10 \\
       -o results.json
 
+  # URL 参数分页，同时加载 4 个页面
+  python scrape_table.py "https://example.com/search?q=python" \\
+      --table "table.results" \\
+      --pagination url \\
+      --concurrency 4 \\
+      -o results.csv
+
+  # 页面依赖图片/字体渲染表格时，关闭资源拦截
+  python scrape_table.py https://example.com/data --table "table" --no-block-resources
+
+  # 复用用户数据目录（后续运行免登录、命中缓存）
+  python scrape_table.py https://example.com/data --table "table" \\
+      --user-data-dir ~/.cache/scrape_table_profile
+
+  # URL 参数分页，根据限流和本机负载自动调整并发
+  python scrape_table.py "https://example.com/search?q=python" \\
+      --table "table.results" \\
+      --pagination url \\
+      --autoscale \\
+      --max-pages 500 \\
+      -o results.csv
+
+  # 大表格输出为 Parquet（需 pip install pyarrow）
+  python scrape_table.py "https://example.com/search?q=python" \\
+      --table "table.results" \\
+      --pagination url \\
+      --max-pages 1000 \\
+      -o results.parquet
+
+  # 大批量 URL 分页：原生 CDP 引擎（需 Chrome 以 --remote-debugging-port=9222 启动）
+  python scrape_table.py "https://example.com/search?q=python" \\
+      --table "table.results" \\
+      --pagination url \\
+      --engine cdp \\
+      --concurrency 4 \\
+      -o results.csv
+
   # 使用已打开的 Chrome
   python scrape_table.py https://example.com/data \\
       --mode connect \\
@@ -145,7 +242,7 @@ def main():
     parser.add_argument(
         "--output", "-o",
         default="output.csv",
-        help="输出文件名 (支持 .csv 和 .json)"
+        help="输出文件名 (支持 .csv、.json 和 .parquet，Parquet 需安装 pyarrow)"
     )
     
     # 分页配置
@@ -174,14 +271,35 @@ def main():
         help="最大抓取页数 (默认: 10)"
     )
     
+    parser.add_argument(
+        "--concurrency", "-c",
+        type=int,
+        default=1,
+        help="URL 参数分页时同时加载的页数 (默认: 1)"
+    )
+    
+    parser.add_argument(
+        "--autoscale",
+        action="store_true",
+        help="URL 参数分页时自适应调整并发页数：遇到 429/503 减半，本机负载允许时逐步增加 "
+             "(--concurrency 作为上限，默认上限 20)"
+    )
+    
     parser.add_argument(
         "--wait",
         type=float,
-        default=2.0,
-        help="每页等待时间(秒) (默认: 2.0)"
+        default=0.0,
+        help="每页表格出现后的额外等待时间(秒) (默认: 0)"
     )
     
     # 浏览器配置
+    parser.add_argument(
+        "--engine",
+        choices=["playwright", "cdp"],
+        default="playwright",
+        help="抓取引擎 (cdp=直接通过 CDP 连接已开启远程调试的 Chrome，仅支持 none/url 分页; 默认: playwright)"
+    )
+    
     parser.add_argument(
         "--mode",
         choices=["launch", "connect"],
@@ -195,6 +313,18 @@ def main():
         help="无头模式运行"
     )
     
+    parser.add_argument(
+        "--user-data-dir",
+        help="Chromium 用户数据目录 (launch 模式; 多次运行复用配置、缓存和登录 cookies)"
+    )
+    
+    parser.add_argument(
+        "--block-resources",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="拦截图片/字体/音视频请求以加快加载 (默认开启，--no-block-resources 关闭)"
+    )
+    
     # 辅助功能
     parser.add_argument(
         "--version", "-v",
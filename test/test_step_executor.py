@@ -5,9 +5,23 @@
 
 import asyncio
 import sys
+import traceback
 from pathlib import Path
+from playwright.async_api import Page
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+from browser import BrowserManager, run_async
+from puppeteer import (
+    BrowserStepExecutor,
+    StepType,
+    StepConfig,
+    create_navigate_step,
+    create_input_step,
+    create_click_step,
+    create_extract_step,
+    create_press_key_step,
+    create_wait_step
+)
 
 
 async def test_import():
@@ -17,22 +31,17 @@ async def test_import():
     print("="*60 + "\n")
     
     try:
-        from puppeteer import (
-            BrowserStepExecutor,
-            StepType,
-            StepConfig,
-            create_navigate_step,
-            create_input_step,
-            create_click_step,
-            create_extract_step,
-            create_press_key_step,
-            create_wait_step
-        )
+        # 模块已在文件头导入，这里确认导出的名称都可用
+        exported = [
+            BrowserStepExecutor, StepType, StepConfig,
+            create_navigate_step, create_input_step, create_click_step,
+            create_extract_step, create_press_key_step, create_wait_step
+        ]
+        assert all(exported)
         print("✅ 所有模块导入成功")
         return True
     except Exception as e:
         print(f"❌ 导入失败: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -44,12 +53,6 @@ async def test_step_creation():
     print("="*60 + "\n")
     
     try:
-        from puppeteer import (
-            create_navigate_step,
-            create_input_step,
-            create_extract_step
-        )
-        
         # 创建各种步骤
         nav_step = create_navigate_step(url="https://example.com")
         input_step = create_input_step(selector="#search", value="test")
@@ -68,120 +71,98 @@ async def test_step_creation():
         return False
 
 
-async def test_executor_basic():
+async def test_executor_basic(page: Page):
     """测试基础执行器功能"""
     print("\n" + "="*60)
     print("🧪 测试 3: 执行器基础功能")
     print("="*60 + "\n")
     
     try:
-        from browser import BrowserManager
-        from puppeteer import (
-            BrowserStepExecutor,
-            create_navigate_step,
-            create_wait_step
-        )
+        # 创建执行器
+        executor = BrowserStepExecutor(page)
+        print("✅ 执行器创建成功")
+        
+        # 简单步骤
+        steps = [
+            create_navigate_step(
+                url="https://example.com",
+                wait_selector="h1",
+                description="访问 Example.com"
+            ),
+            create_wait_step(
+                wait_time=2.0,
+                description="等待2秒"
+            )
+        ]
+        
+        # 执行
+        print("\n开始执行步骤...\n")
+        result = await executor.execute_steps(steps)
+        
+        print(f"\n执行结果:")
+        print(f"  成功: {result['success']}")
+        print(f"  执行步骤数: {result['steps_executed']}")
+        print(f"  错误数: {len(result['errors'])}")
+        
+        if result['success']:
+            print("\n✅ 基础功能测试通过")
+            return True
+        else:
+            print("\n❌ 执行失败")
+            return False
         
-        async with BrowserManager(mode="launch", headless=False) as bm:
-            page = await bm.get_or_create_page()
-            
-            # 创建执行器
-            executor = BrowserStepExecutor(page)
-            print("✅ 执行器创建成功")
-            
-            # 简单步骤
-            steps = [
-                create_navigate_step(
-                    url="https://example.com",
-                    wait_time=2.0,
-                    description="访问 Example.com"
-                ),
-                create_wait_step(
-                    wait_time=2.0,
-                    description="等待2秒"
-                )
-            ]
-            
-            # 执行
-            print("\n开始执行步骤...\n")
-            result = await executor.execute_steps(steps)
-            
-            print(f"\n执行结果:")
-            print(f"  成功: {result['success']}")
-            print(f"  执行步骤数: {result['steps_executed']}")
-            print(f"  错误数: {len(result['errors'])}")
-            
-            if result['success']:
-                print("\n✅ 基础功能测试通过")
-                return True
-            else:
-                print("\n❌ 执行失败")
-                return False
-                
     except Exception as e:
         print(f"❌ 测试失败: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
 
-async def test_full_workflow():
+async def test_full_workflow(page: Page):
     """测试完整工作流（包括数据提取）"""
     print("\n" + "="*60)
     print("🧪 测试 4: 完整工作流（导航 + 提取）")
     print("="*60 + "\n")
     
     try:
-        from browser import BrowserManager
-        from puppeteer import (
-            BrowserStepExecutor,
-            create_navigate_step,
-            create_extract_step
-        )
+        executor = BrowserStepExecutor(page)
         
-        async with BrowserManager(mode="launch", headless=False) as bm:
-            page = await bm.get_or_create_page()
-            executor = BrowserStepExecutor(page)
+        steps = [
+            create_navigate_step(
+                url="https://github.com/trending",
+                wait_selector="article.Box-row",
+                description="访问 GitHub Trending"
+            ),
             
-            steps = [
-                create_navigate_step(
-                    url="https://github.com/trending",
-                    wait_time=3.0,
-                    description="访问 GitHub Trending"
-                ),
-                
-                create_extract_step(
-                    container_selector="article.Box-row",
-                    fields={
-                        "项目名": "h2 a",
-                        "描述": "p.col-9"
-                    },
-                    max_pages=1,
-                    wait_time=2.0,
-                    output_file="test_github_trending.json",
-                    description="提取热门项目"
-                )
-            ]
+            create_extract_step(
+                container_selector="article.Box-row",
+                fields={
+                    "项目名": "h2 a",
+                    "描述": "p.col-9"
+                },
+                max_pages=1,
+                output_file="test_github_trending.json",
+                description="提取热门项目"
+            )
+        ]
+        
+        result = await executor.execute_steps(steps)
+        
+        if result['success'] and result['extracted_data']:
+            data_count = len(result['extracted_data'])
+            print(f"\n✅ 完整工作流测试通过")
+            print(f"   提取了 {data_count} 条数据")
             
-            result = await executor.execute_steps(steps)
+            if data_count > 0:
+                print(f"\n示例数据:")
+                print(f"   {result['extracted_data'][0]}")
             
-            if result['success'] and result['extracted_data']:
-                data_count = len(result['extracted_data'])
-                print(f"\n✅ 完整工作流测试通过")
-                print(f"   提取了 {data_count} 条数据")
-                
-                if data_count > 0:
-                    print(f"\n示例数据:")
-                    print(f"   {result['extracted_data'][0]}")
-                
-                return True
-            else:
-                print("\n❌ 工作流执行失败")
-                return False
-                
+            return True
+        else:
+            print("\n❌ 工作流执行失败")
+            return False
+        
     except Exception as e:
         print(f"❌ 测试失败: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -192,16 +173,20 @@ async def run_all_tests():
     print("🧪 浏览器步骤执行器 - 功能测试")
     print("="*60)
     
-    tests = [
+    # 导入和创建步骤很快，先顺序执行
+    quick_tests = [
         ("导入模块", test_import),
         ("创建步骤", test_step_creation),
+    ]
+    # 浏览器测试共用一次启动的浏览器，各自在独立的新标签页中并发执行，网络等待相互重叠
+    browser_tests = [
         ("基础执行", test_executor_basic),
         ("完整工作流", test_full_workflow)
     ]
     
     results = []
     
-    for name, test_func in tests:
+    for name, test_func in quick_tests:
         try:
             result = await test_func()
             results.append((name, result))
@@ -209,6 +194,25 @@ async def run_all_tests():
             print(f"\n❌ 测试 '{name}' 异常: {e}")
             results.append((name, False))
     
+    try:
+        async with BrowserManager(mode="launch", headless=False) as bm:
+            context = await bm.get_context()
+            pages = await asyncio.gather(*(context.new_page() for _ in browser_tests))
+            outcomes = await asyncio.gather(
+                *(test_func(page) for (_, test_func), page in zip(browser_tests, pages)),
+                return_exceptions=True
+            )
+    except Exception as e:
+        print(f"\n❌ 浏览器启动失败: {e}")
+        outcomes = [e] * len(browser_tests)
+    
+    for (name, _), outcome in zip(browser_tests, outcomes):
+        if isinstance(outcome, BaseException):
+            print(f"\n❌ 测试 '{name}' 异常: {outcome}")
+            results.append((name, False))
+        else:
+            results.append((name, outcome))
+    
     # 汇总
     print("\n" + "="*60)
     print("📊 测试汇总")
@@ -257,4 +261,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
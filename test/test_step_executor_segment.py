@@ -5,10 +5,11 @@
 
 import asyncio
 import sys
+import traceback
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
-from browser import BrowserManager
+from browser import BrowserManager, run_async
 from puppeteer import (
     BrowserStepExecutor,
     create_navigate_step,
@@ -78,9 +79,8 @@ async def user_requirement():
                 },
                 next_button=".d-none .page-item:last-child .page-link",
                 max_pages=1,
-                wait_time=3.0,
                 output_file="segmentfault_result.json",
-                description="提取文章列表（抓取2页，每页停留3秒）"
+                description="提取文章列表"
             )
         ]
         
@@ -103,13 +103,13 @@ async def user_requirement():
                 
                 # 显示前3条数据
                 print(f"\n📄 数据预览（前3条）:")
-                for i, item in enumerate(result["extracted_data"][:3], 1):
-                    print(f"\n{i}.")
-                    print(f"   标题: {item.get('标题', 'N/A')}")
-                    print(f"   时间: {item.get('时间', 'N/A')}")
+                print("".join(
+                    f"\n{i}.\n   标题: {item.get('标题', 'N/A')}\n   时间: {item.get('时间', 'N/A')}\n"
+                    for i, item in enumerate(result["extracted_data"][:3], 1)
+                ), end="")
                 
                 # 保存执行日志
-                executor.save_log("execution_log.json")
+                await asyncio.to_thread(executor.save_log, "execution_log.json")
                 print(f"\n💾 执行日志已保存: execution_log.json")
             else:
                 print("\n⚠️ 未提取到数据")
@@ -126,10 +126,9 @@ if __name__ == "__main__":
     print("按 Ctrl+C 可随时中断\n")
     
     try:
-        asyncio.run(user_requirement())
+        run_async(user_requirement())
     except KeyboardInterrupt:
         print("\n\n⚠️ 用户中断执行")
     except Exception as e:
         print(f"\n❌ 执行失败: {e}")
-        import traceback
         traceback.print_exc()
@@ -7,108 +7,127 @@ import asyncio
 import sys
 import os
 from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
+from playwright.async_api import Page
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
-from browser import BrowserManager
+from browser import BrowserManager, run_async
 from puppeteer import UniversalScraper, create_scraper_config
 
 load_dotenv()
 cdp_url = os.getenv("CDP_URL")
 
-async def test_basic_scraping():
-    """测试基础抓取功能"""
+async def test_basic_scraping(page: Optional[Page] = None):
+    """测试基础抓取功能（未传入页面时自行连接浏览器）"""
+    if page is None:
+        async with BrowserManager(mode="connect", cdp_url=cdp_url, headless=False) as bm:
+            page = await bm.get_or_create_page(target_url="https://segmentfault.com/")
+            return await test_basic_scraping(page)
+    
     print("\n" + "="*60)
     print("🧪 测试通用抓取器 - 基础功能")
     print("="*60 + "\n")
     
-    async with BrowserManager(mode="connect", cdp_url=cdp_url, headless=False) as bm:
-        page = await bm.get_or_create_page(target_url="https://segmentfault.com/")
-        
-        # 测试配置
-        config = create_scraper_config(
-            url="https://segmentfault.com/",
-            fields={
-                "标题": "h3 a.text-body",
-                "投票数": ".num-card .font-size-16",
-                "阅读数": ".reads1 .font-size-16"
-            },
-            container_selector=".list-card-bg .list-group.list-group-flush .list-group-item",
-            delay=3.0
-        )
-        
-        print("📋 配置:")
-        print(f"   URL: {config.url}")
-        print(f"   容器: {config.container_selector}")
-        print(f"   字段: {[f.name for f in config.fields]}")
-        print(f"   延迟: {config.delay}s\n")
-        
-        # 执行抓取
-        print("🚀 开始抓取...\n")
-        scraper = UniversalScraper(page, config)
-        data = await scraper.scrape()
-        
-        # 验证结果
-        print("\n" + "="*60)
-        print("📊 测试结果")
-        print("="*60)
-        
-        if data:
-            print(f"✅ 成功抓取 {len(data)} 条数据")
-            print(f"\n📄 第一条数据:")
-            for key, value in data[0].items():
-                print(f"   {key}: {value}")
-            
-            # 保存测试数据
-            scraper.save_to_json("test_output.json")
-        else:
-            print("❌ 抓取失败，未获取到数据")
+    # 测试配置
+    config = create_scraper_config(
+        url="https://segmentfault.com/",
+        fields={
+            "标题": "h3 a.text-body",
+            "投票数": ".num-card .font-size-16",
+            "阅读数": ".reads1 .font-size-16"
+        },
+        container_selector=".list-card-bg .list-group.list-group-flush .list-group-item",
+        delay=3.0
+    )
+    
+    print("📋 配置:")
+    print(f"   URL: {config.url}")
+    print(f"   容器: {config.container_selector}")
+    print(f"   字段: {[f.name for f in config.fields]}")
+    print(f"   延迟: {config.delay}s\n")
+    
+    # 执行抓取
+    print("🚀 开始抓取...\n")
+    scraper = UniversalScraper(page, config)
+    data = await scraper.scrape()
+    
+    # 验证结果
+    print("\n" + "="*60)
+    print("📊 测试结果")
+    print("="*60)
+    
+    if data:
+        print(f"✅ 成功抓取 {len(data)} 条数据")
+        print(f"\n📄 第一条数据:")
+        print("\n".join(f"   {key}: {value}" for key, value in data[0].items()))
         
-        print("="*60 + "\n")
+        # 保存测试数据
+        await asyncio.to_thread(scraper.save_to_json, "test_output.json")
+    else:
+        print("❌ 抓取失败，未获取到数据")
+    
+    print("="*60 + "\n")
 
 
-"""测试分页功能"""
-async def test_pagination():
+async def test_pagination(page: Optional[Page] = None):
+    """测试分页功能（未传入页面时自行连接浏览器）"""
+    if page is None:
+        async with BrowserManager(mode="connect", headless=False) as bm:
+            page = await bm.get_or_create_page(target_url="https://segmentfault.com/")
+            return await test_pagination(page)
+    
     print("\n" + "="*60)
     print("🧪 测试通用抓取器 - 分页功能")
     print("="*60 + "\n")
     
-    async with BrowserManager(mode="connect", headless=False) as bm:
-        page = await bm.get_or_create_page(target_url="https://segmentfault.com/")
-        
-        config = create_scraper_config(
-            url="https://segmentfault.com/",
-            fields={
-                "标题": "h3 a.text-body",
-                "投票数": ".num-card .font-size-16",
-                "阅读数": ".reads1 .font-size-16"
-            },
-            container_selector=".list-card-bg .list-group.list-group-flush .list-group-item",
-            next_button_selector=".bg-white .page-item:last-child .page-link",
-            delay=4.0,
-            max_pages=2
-        )
-        
-        print("📋 分页配置:")
-        print(f"   下一页按钮: {config.next_button_selector}")
-        print(f"   最大页数: {config.max_pages}")
-        print(f"   延迟: {config.delay}s\n")
-        
-        print("🚀 开始分页抓取...\n")
-        scraper = UniversalScraper(page, config)
-        data = await scraper.scrape()
-        
-        print("\n" + "="*60)
-        print("📊 分页测试结果")
-        print("="*60)
-        
-        if data:
-            print(f"✅ 成功抓取 {len(data)} 条数据（跨 {config.max_pages} 页）")
-            scraper.save_to_json("test_pagination.json")
-        else:
-            print("❌ 分页抓取失败")
-        
-        print("="*60 + "\n")
+    config = create_scraper_config(
+        url="https://segmentfault.com/",
+        fields={
+            "标题": "h3 a.text-body",
+            "投票数": ".num-card .font-size-16",
+            "阅读数": ".reads1 .font-size-16"
+        },
+        container_selector=".list-card-bg .list-group.list-group-flush .list-group-item",
+        next_button_selector=".bg-white .page-item:last-child .page-link",
+        delay=4.0,
+        max_pages=2
+    )
+    
+    print("📋 分页配置:")
+    print(f"   下一页按钮: {config.next_button_selector}")
+    print(f"   最大页数: {config.max_pages}")
+    print(f"   延迟: {config.delay}s\n")
+    
+    print("🚀 开始分页抓取...\n")
+    scraper = UniversalScraper(page, config)
+    data = await scraper.scrape()
+    
+    print("\n" + "="*60)
+    print("📊 分页测试结果")
+    print("="*60)
+    
+    if data:
+        print(f"✅ 成功抓取 {len(data)} 条数据（跨 {config.max_pages} 页）")
+        await asyncio.to_thread(scraper.save_to_json, "test_pagination.json")
+    else:
+        print("❌ 分页抓取失败")
+    
+    print("="*60 + "\n")
+
+
+async def run_all_tests(test_funcs):
+    """
+    只连接一次浏览器，每个测试在同一上下文的独立新标签页中并发执行
+    （两个测试都会导航，不能共用同一个页面）
+    """
+    async with BrowserManager(mode="connect", cdp_url=cdp_url, headless=False) as bm:
+        context = await bm.get_context()
+        pages = await asyncio.gather(*(context.new_page() for _ in test_funcs))
+        try:
+            await asyncio.gather(*(func(page) for func, page in zip(test_funcs, pages)))
+        finally:
+            await asyncio.gather(*(page.close() for page in pages))
 
 
 async def main():
@@ -126,12 +145,11 @@ async def main():
     for key, (name, _) in tests.items():
         print(f"   {key}. {name}")
     
-    choice = input("\n选择测试 (1-3): ").strip()
+    # 设置 TEST_CHOICE 时直接运行对应测试，无人值守时不阻塞在输入上
+    choice = os.environ.get("TEST_CHOICE") or input("\n选择测试 (1-3): ").strip()
     
     if choice == "3":
-        for name, func in [(n, f) for n, f in tests.values() if f]:
-            await func()
-            await asyncio.sleep(2)
+        await run_all_tests([f for _, f in tests.values() if f])
     elif choice in tests and tests[choice][1]:
         name, func = tests[choice]
         await func()
@@ -140,4 +158,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
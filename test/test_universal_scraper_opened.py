@@ -3,11 +3,13 @@
 """
 
 import asyncio
+import os
 import sys
+import traceback
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
-from browser import BrowserManager
+from browser import BrowserManager, run_async
 
 
 async def test_find_page_by_url():
@@ -43,12 +45,16 @@ async def test_find_page_by_url():
             "google.com"
         ]
         
-        for url in test_urls:
+        # 查找只读取本地缓存的页面 URL，标题才需要 CDP 往返，两者都并发发出后再按顺序打印
+        found = await asyncio.gather(*(bm.find_page_by_url(url) for url in test_urls))
+        titles = await asyncio.gather(*(page.title() for page in found if page))
+        titles = iter(titles)
+        
+        for url, page in zip(test_urls, found):
             print(f"查找包含 '{url}' 的页面...")
-            page = await bm.find_page_by_url(url)
             if page:
                 print(f"✅ 找到: {page.url}")
-                print(f"   标题: {await page.title()}\n")
+                print(f"   标题: {next(titles)}\n")
             else:
                 print(f"❌ 未找到\n")
         
@@ -133,7 +139,7 @@ async def test_with_scraper():
         # 不需要导航，直接抓取当前页面
         print("🔍 抓取当前页面数据...")
         data = await scraper.scrape_from_current_page()
-        scraper.save_to_json("test_解析已经打开的页面.json")
+        await asyncio.to_thread(scraper.save_to_json, "test_解析已经打开的页面.json")
         
         
         print(f"\n✅ 成功抓取 {len(data)} 条数据")
@@ -208,7 +214,8 @@ async def main():
     print("   请先启动 Chrome: chrome.exe --remote-debugging-port=9222")
     print("   并打开一些网页（如 SegmentFault、GitHub 等）\n")
     
-    choice = input("选择测试 (1-4): ").strip()
+    # 设置 TEST_CHOICE 时直接运行对应测试，无人值守时不阻塞在输入上
+    choice = os.environ.get("TEST_CHOICE") or input("选择测试 (1-4): ").strip()
     
     if choice in tests:
         name, func = tests[choice]
@@ -222,11 +229,10 @@ async def main():
             print("   2. 重新运行测试")
         except Exception as e:
             print(f"\n❌ 错误: {e}")
-            import traceback
             traceback.print_exc()
     else:
         print("❌ 无效选择")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())